@@ -0,0 +1,4 @@
+"""Synthetic JUnit corpora and the benchmark suite run against them.
+
+Run the suite from the repository root with ``python -m benchmarks.suite``.
+"""
@@ -0,0 +1,77 @@
+import argparse
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+
+from benchmarks.corpus import CorpusSpec, write_corpus
+from testops_insight.analytics import analyze_suite
+from testops_insight.cli.discovery import discover_test_runs
+from testops_insight.domain.models import TestSuite
+
+
+class CountingList(list):
+    iterations = 0
+
+    def __iter__(self):
+        CountingList.iterations += 1
+        return super().__iter__()
+
+
+def build_suite(runs: int, tests: int, seed: int = 0) -> TestSuite:
+    with tempfile.TemporaryDirectory() as tmp:
+        write_corpus(tmp, CorpusSpec(runs=runs, tests_per_run=tests, seed=seed))
+        test_runs = [test_run for _, test_run in discover_test_runs(tmp)]
+    for test_run in test_runs:
+        test_run.test_cases = CountingList(test_run.test_cases)
+    return TestSuite(name="bench", test_runs=test_runs)
+
+
+def legacy_analyze(test_suite: TestSuite) -> None:
+    # The five independent scans generate_report performed before the fused engine.
+    for _ in range(2):
+        test_stats = defaultdict(lambda: {"passed": 0, "failed": 0, "total": 0})
+        for test_run in test_suite.test_runs:
+            test_names = {tc.full_name for tc in test_run.test_cases}
+            test_results = {tc.full_name: tc.status.name for tc in test_run.test_cases}
+            for test_name in test_names:
+                test_stats[test_name]["total"] += 1
+                if test_results.get(test_name) == "PASSED":
+                    test_stats[test_name]["passed"] += 1
+                elif test_results.get(test_name) in ("FAILED", "ERROR"):
+                    test_stats[test_name]["failed"] += 1
+
+    test_durations = defaultdict(lambda: {"durations": [], "total": 0})
+    for test_run in test_suite.test_runs:
+        for test_case in test_run.test_cases:
+            test_durations[test_case.full_name]["durations"].append(test_case.duration)
+            test_durations[test_case.full_name]["total"] += 1
+
+
+def measure(label: str, func, test_suite: TestSuite) -> None:
+    CountingList.iterations = 0
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(test_suite)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    passes = CountingList.iterations / len(test_suite.test_runs)
+    print(f"{label:>8} {passes:>8.0f} {elapsed:>10.3f} {peak / 1024 / 1024:>12.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the fused analytics engine with the legacy five-pass path")
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--tests", type=int, default=2000)
+    args = parser.parse_args()
+
+    test_suite = build_suite(args.runs, args.tests)
+    print(f"{args.runs} runs x {args.tests} tests")
+    print(f"{'path':>8} {'passes':>8} {'seconds':>10} {'peak MiB':>12}")
+    measure("legacy", legacy_analyze, test_suite)
+    measure("fused", analyze_suite, test_suite)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.corpus import CorpusSpec, write_corpus
+from testops_insight.cli.discovery import discover_test_runs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure discover_test_runs speedup with --jobs")
+    parser.add_argument("--runs", type=int, default=400)
+    parser.add_argument("--tests", type=int, default=500)
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        write_corpus(root, CorpusSpec(runs=args.runs, tests_per_run=args.tests))
+
+        baseline = None
+        print(f"{args.runs} runs x {args.tests} tests")
+        print(f"{'jobs':>6} {'seconds':>10} {'speedup':>9}")
+        for jobs in args.jobs:
+            start = time.perf_counter()
+            runs = discover_test_runs(root, jobs=jobs)
+            elapsed = time.perf_counter() - start
+            assert len(runs) == args.runs
+            if baseline is None:
+                baseline = elapsed
+            print(f"{jobs:>6} {elapsed:>10.3f} {baseline / elapsed:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import argparse
+import gc
+import os
+import tempfile
+import tracemalloc
+from dataclasses import dataclass
+from typing import Optional
+
+from benchmarks.corpus import CorpusSpec, run_documents
+from testops_insight.domain.models import TestCase, TestStatus
+from testops_insight.ingestion import parse_junit_xml
+
+
+@dataclass
+class LegacyTestCase:
+    # The dataclass layout TestCase used before slots and interned identities.
+    name: str
+    classname: str
+    status: TestStatus
+    duration: float
+    message: Optional[str] = None
+    failure_type: Optional[str] = None
+
+
+def build_cases(factory, runs: int, tests: int) -> list:
+    cases = []
+    for run_idx in range(runs):
+        for test_idx in range(tests):
+            # Fresh strings per case, as a parser produces them.
+            name = "".join(["test_", str(test_idx)])
+            classname = "".join(["pkg.module", str(test_idx % 50), ".Tests"])
+            failed = (run_idx + test_idx) % 20 == 0
+            cases.append(
+                factory(
+                    name=name,
+                    classname=classname,
+                    status=TestStatus.FAILED if failed else TestStatus.PASSED,
+                    duration=float(test_idx % 97) / 10,
+                    failure_type="AssertionError" if failed else None,
+                )
+            )
+    return cases
+
+
+def bytes_per_case(factory, runs: int, tests: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    cases = build_cases(factory, runs, tests)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    count = len(cases)
+    del cases
+    return current / count
+
+
+def parse_memory(path: str, lazy_messages: bool) -> tuple[int, int]:
+    gc.collect()
+    tracemalloc.start()
+    test_run = parse_junit_xml(path, streaming=True, lazy_messages=lazy_messages)
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del test_run
+    return current, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Report memory used per test case")
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--tests", type=int, default=2000)
+    parser.add_argument("--failures", type=int, default=5000, help="Failing tests in the message run")
+    parser.add_argument("--message-bytes", type=int, default=2048, help="Stack trace bytes per failure")
+    args = parser.parse_args()
+
+    before = bytes_per_case(LegacyTestCase, args.runs, args.tests)
+    after = bytes_per_case(TestCase, args.runs, args.tests)
+
+    print(f"{args.runs} runs x {args.tests} tests")
+    print(f"{'layout':>10} {'bytes/case':>12}")
+    print(f"{'dataclass':>10} {before:>12.1f}")
+    print(f"{'slotted':>10} {after:>12.1f}")
+    print(f"reduction: {(1 - after / before) * 100:.1f}%")
+
+    # A single run in which every test fails with a long stack trace.
+    spec = CorpusSpec(
+        runs=1, tests_per_run=args.failures, failure_rate=1.0, flake_rate=0.0, message_bytes=args.message_bytes
+    )
+    [(_, document)] = run_documents(spec, 0)
+    fd, path = tempfile.mkstemp(suffix=".xml")
+    with os.fdopen(fd, "wb") as f:
+        f.write(document)
+    try:
+        eager_current, eager_peak = parse_memory(path, lazy_messages=False)
+        lazy_current, lazy_peak = parse_memory(path, lazy_messages=True)
+    finally:
+        os.unlink(path)
+
+    print()
+    print(f"{args.failures} failures x {args.message_bytes} trace bytes")
+    print(f"{'messages':>10} {'retained MB':>12} {'peak MB':>10}")
+    print(f"{'eager':>10} {eager_current / 1e6:>12.1f} {eager_peak / 1e6:>10.1f}")
+    print(f"{'lazy':>10} {lazy_current / 1e6:>12.1f} {lazy_peak / 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
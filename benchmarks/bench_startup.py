@@ -0,0 +1,96 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.corpus import CorpusSpec, write_corpus
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+COMMANDS = {
+    "--version": ["--version"],
+    "--help": ["--help"],
+    "analyze (bad path)": ["analyze", "--runs-path", "does-not-exist"],
+    "gate (10 runs)": ["gate", "--runs-path", "{runs}", "--fail-under-health", "0"],
+}
+
+
+def run_cli(cli_args: list[str], cwd: Path) -> float:
+    code = "import sys; from testops_insight.cli.main import main; sys.argv[0] = 'testops-insights'; main()"
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", code, *cli_args],
+        cwd=cwd,
+        env={**os.environ, "PYTHONPATH": str(REPO_ROOT)},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - start
+
+
+def run_cli_baseline(cwd: Path) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], cwd=cwd)
+    return time.perf_counter() - start
+
+
+def import_times(module: str) -> dict[str, int]:
+    """Cumulative import time in microseconds per module, from -X importtime."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure CLI startup time per command")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, help="Fail if importing the CLI takes longer than this")
+    args = parser.parse_args()
+
+    times = import_times("testops_insight.cli.main")
+    cli_import_ms = times["testops_insight.cli.main"] / 1000
+    package_ms = sorted(
+        ((name, us / 1000) for name, us in times.items() if name.startswith("testops_insight")),
+        key=lambda item: -item[1],
+    )
+
+    print(f"import testops_insight.cli.main: {cli_import_ms:.1f} ms")
+    for name, ms in package_ms[:5]:
+        print(f"  {name:<40} {ms:>8.1f} ms")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        write_corpus(root / "runs", CorpusSpec(runs=10, tests_per_run=2, failure_rate=0.0, flake_rate=0.0))
+        baseline = statistics.median(run_cli_baseline(root) for _ in range(args.repeat))
+
+        print()
+        print(f"{'command':<22} {'median ms':>10} {'over python':>12}")
+        print(f"{'python -c pass':<22} {baseline * 1000:>10.1f} {'':>12}")
+        for label, cli_args in COMMANDS.items():
+            cli_args = [arg.replace("{runs}", str(root / "runs")) for arg in cli_args]
+            elapsed = statistics.median(run_cli(cli_args, root) for _ in range(args.repeat))
+            print(f"{label:<22} {elapsed * 1000:>10.1f} {(elapsed - baseline) * 1000:>11.1f}")
+
+    if args.budget_ms is not None and cli_import_ms > args.budget_ms:
+        print(f"CLI import {cli_import_ms:.1f} ms is over the {args.budget_ms:.1f} ms budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
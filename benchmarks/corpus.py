@@ -0,0 +1,126 @@
+import random
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Iterator
+from xml.sax.saxutils import escape
+
+_STABLE, _BROKEN, _FLAKY = 0, 1, 2
+# Chance that a flaky test fails in a given run.
+_FLAKE_FAIL_PROBABILITY = 0.3
+_FIRST_TIMESTAMP = datetime(2024, 1, 1)
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    """Shape of a synthetic corpus; the same spec always writes the same bytes.
+
+    ``failure_rate`` is the share of tests that fail in every run and
+    ``flake_rate`` the share that fail in a random 30% of runs. Failures carry
+    an ASCII assertion line and stack trace cut to ``message_bytes``. With
+    ``shards`` above one, each run is split into ``junit-<n>.xml`` files
+    instead of a single ``junit.xml``.
+    """
+
+    runs: int = 100
+    tests_per_run: int = 1000
+    failure_rate: float = 0.02
+    flake_rate: float = 0.05
+    message_bytes: int = 512
+    shards: int = 1
+    seed: int = 0
+
+    def __post_init__(self):
+        if self.runs < 1 or self.tests_per_run < 1 or self.shards < 1:
+            raise ValueError("runs, tests_per_run and shards must be at least 1")
+        if self.message_bytes < 0:
+            raise ValueError("message_bytes must not be negative")
+        if not 0 <= self.failure_rate + self.flake_rate <= 1:
+            raise ValueError("failure_rate and flake_rate must add up to a value in [0, 1]")
+
+    @property
+    def total_tests(self) -> int:
+        return self.runs * self.tests_per_run
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class _Plan:
+    """Per-test kind and base duration, drawn once so every run agrees on them."""
+
+    def __init__(self, spec: CorpusSpec):
+        rng = random.Random(spec.seed)
+        self.kinds = []
+        self.base_durations = []
+        for _ in range(spec.tests_per_run):
+            draw = rng.random()
+            if draw < spec.failure_rate:
+                self.kinds.append(_BROKEN)
+            elif draw < spec.failure_rate + spec.flake_rate:
+                self.kinds.append(_FLAKY)
+            else:
+                self.kinds.append(_STABLE)
+            self.base_durations.append(rng.lognormvariate(-3.0, 1.5))
+
+
+def write_corpus(root: str | Path, spec: CorpusSpec) -> Path:
+    """Write ``spec.runs`` run folders under ``root`` and return ``root``."""
+    root = Path(root)
+    plan = _Plan(spec)
+    for run_idx in range(spec.runs):
+        run_dir = root / f"run_{run_idx:05d}"
+        run_dir.mkdir(parents=True, exist_ok=True)
+        for name, document in _run_documents(spec, plan, run_idx):
+            (run_dir / name).write_bytes(document)
+    return root
+
+
+def run_documents(spec: CorpusSpec, run_idx: int) -> list[tuple[str, bytes]]:
+    """The file names and contents of one run, without touching the disk."""
+    return list(_run_documents(spec, _Plan(spec), run_idx))
+
+
+def _run_documents(spec: CorpusSpec, plan: _Plan, run_idx: int) -> Iterator[tuple[str, bytes]]:
+    # Each run has its own stream so that a run's contents do not depend on
+    # how many runs were generated before it.
+    rng = random.Random(f"{spec.seed}:{run_idx}")
+    timestamp = (_FIRST_TIMESTAMP + timedelta(hours=run_idx)).isoformat()
+
+    shard_cases: list[list[str]] = [[] for _ in range(spec.shards)]
+    for test_idx in range(spec.tests_per_run):
+        shard_cases[test_idx % spec.shards].append(_test_case(spec, plan, rng, test_idx))
+
+    for shard_idx, cases in enumerate(shard_cases):
+        name = "junit.xml" if spec.shards == 1 else f"junit-{shard_idx}.xml"
+        document = (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<testsuite name="bench" tests="{len(cases)}" timestamp="{timestamp}">\n'
+            + "".join(cases)
+            + "</testsuite>\n"
+        )
+        yield name, document.encode("utf-8")
+
+
+def _test_case(spec: CorpusSpec, plan: _Plan, rng: random.Random, test_idx: int) -> str:
+    kind = plan.kinds[test_idx]
+    duration = plan.base_durations[test_idx] * rng.uniform(0.8, 1.25)
+    failed = kind == _BROKEN or (kind == _FLAKY and rng.random() < _FLAKE_FAIL_PROBABILITY)
+
+    attributes = f'classname="pkg.module{test_idx % 50}.Tests" name="test_{test_idx}" time="{duration:.4f}"'
+    if not failed:
+        return f"  <testcase {attributes}/>\n"
+    # The text goes in the element body, not the message attribute, since the
+    # body is what lazy messages keep on disk.
+    text = _failure_text(spec.message_bytes, test_idx, rng.randrange(1000))
+    return f"  <testcase {attributes}><failure>{escape(text)}</failure></testcase>\n"
+
+
+def _failure_text(size: int, test_idx: int, actual: int) -> str:
+    frame = f'  File "pkg/module{test_idx % 50}.py", line {test_idx % 400 + 1}, in test_{test_idx}\n'
+    lines = [f"AssertionError: expected {test_idx} got {actual}\n", "Traceback (most recent call last):\n"]
+    length = sum(map(len, lines))
+    while length < size:
+        lines.append(frame)
+        length += len(frame)
+    return "".join(lines)[:size]
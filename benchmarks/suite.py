@@ -0,0 +1,232 @@
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable
+
+from benchmarks.corpus import CorpusSpec, write_corpus
+
+# Runs parsed one file at a time by the parse benchmarks; enough files to
+# average out file system noise without timing the whole corpus twice.
+PARSE_SAMPLE_RUNS = 10
+
+
+def _sample_files(corpus: Path) -> list[Path]:
+    run_dirs = sorted(path for path in corpus.iterdir() if path.is_dir())[:PARSE_SAMPLE_RUNS]
+    return [file for run_dir in run_dirs for file in sorted(run_dir.glob("*.xml"))]
+
+
+def _load_suite(corpus: Path):
+    from testops_insight.cli.discovery import discover_test_runs
+    from testops_insight.domain.models import TestSuite
+
+    return TestSuite(name="bench", test_runs=[run for _, run in discover_test_runs(corpus)])
+
+
+def _suite_items(suite) -> int:
+    return sum(len(run.test_cases) for run in suite.test_runs)
+
+
+def _setup_parse(corpus: Path, **options: bool) -> tuple[Callable[[], Any], int]:
+    from testops_insight.ingestion.junit_parser import parse_junit_xml
+
+    files = _sample_files(corpus)
+    items = sum(len(parse_junit_xml(file).test_cases) for file in files)
+
+    def run() -> None:
+        for file in files:
+            parse_junit_xml(file, **options)
+
+    return run, items
+
+
+def _setup_discover(corpus: Path) -> tuple[Callable[[], Any], int]:
+    from testops_insight.cli.discovery import discover_test_runs
+
+    runs = discover_test_runs(corpus)
+    return (lambda: discover_test_runs(corpus)), sum(len(run.test_cases) for _, run in runs)
+
+
+def _setup_analytic(corpus: Path, name: str) -> tuple[Callable[[], Any], int]:
+    from testops_insight import analytics
+
+    suite = _load_suite(corpus)
+    func = getattr(analytics, name)
+    return (lambda: func(suite)), _suite_items(suite)
+
+
+def _setup_report(corpus: Path) -> tuple[Callable[[], Any], int]:
+    from testops_insight.reporting import generate_report
+
+    suite = _load_suite(corpus)
+    output_dir = Path(tempfile.mkdtemp(prefix="bench-report-"))
+    return (lambda: generate_report(suite, output_dir)), _suite_items(suite)
+
+
+# Each benchmark sets up its inputs untimed and returns the timed callable and
+# the number of test results one call processes.
+BENCHMARKS: dict[str, Callable[[Path], tuple[Callable[[], Any], int]]] = {
+    "parse_junit_xml": lambda corpus: _setup_parse(corpus),
+    "parse_junit_xml[streaming]": lambda corpus: _setup_parse(corpus, streaming=True),
+    "parse_junit_xml[lazy_messages]": lambda corpus: _setup_parse(corpus, lazy_messages=True),
+    "discover_test_runs": _setup_discover,
+    "detect_flaky_tests": lambda corpus: _setup_analytic(corpus, "detect_flaky_tests"),
+    "get_frequent_failures": lambda corpus: _setup_analytic(corpus, "get_frequent_failures"),
+    "get_slowest_tests": lambda corpus: _setup_analytic(corpus, "get_slowest_tests"),
+    "get_pass_rate_trend": lambda corpus: _setup_analytic(corpus, "get_pass_rate_trend"),
+    "calculate_health_score": lambda corpus: _setup_analytic(corpus, "calculate_health_score"),
+    "generate_report": _setup_report,
+}
+
+
+def _max_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def run_benchmark(name: str, corpus: Path, repeat: int) -> dict[str, Any]:
+    """Run one benchmark in this process; the best of ``repeat`` calls is kept."""
+    func, items = BENCHMARKS[name](corpus)
+    setup_rss_mb = _max_rss_mb()
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    best = min(times)
+    return {
+        "seconds": best,
+        "items": items,
+        "items_per_s": items / best if best > 0 else None,
+        "setup_rss_mb": setup_rss_mb,
+        "peak_rss_mb": _max_rss_mb(),
+    }
+
+
+def run_isolated(name: str, corpus: Path, repeat: int) -> dict[str, Any]:
+    """Run one benchmark in a fresh interpreter so its peak RSS is its own."""
+    repo_root = Path(__file__).resolve().parent.parent
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.suite", "--child", name, "--corpus", str(corpus), "--repeat", str(repeat)],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=repo_root,
+    )
+    return json.loads(completed.stdout)
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    """Print current versus baseline per benchmark and return the regressed names.
+
+    A benchmark regresses when its throughput drops, or its peak RSS grows, by
+    more than ``tolerance`` (a fraction) relative to the baseline.
+    """
+    if baseline.get("corpus") != results["corpus"]:
+        print("warning: baseline was recorded on a different corpus spec")
+
+    regressions = []
+    print(f"{'benchmark':<32} {'items/s':>12} {'baseline':>12} {'ratio':>7} {'rss MB':>8} {'baseline':>9}")
+    for name, current in results["benchmarks"].items():
+        previous = baseline.get("benchmarks", {}).get(name)
+        if previous is None:
+            print(f"{name:<32} {current['items_per_s']:>12,.0f} {'-':>12}")
+            continue
+        ratio = current["items_per_s"] / previous["items_per_s"]
+        regressed = ratio < 1 - tolerance or current["peak_rss_mb"] > previous["peak_rss_mb"] * (1 + tolerance)
+        if regressed:
+            regressions.append(name)
+        print(
+            f"{name:<32} {current['items_per_s']:>12,.0f} {previous['items_per_s']:>12,.0f} {ratio:>6.2f}x"
+            f" {current['peak_rss_mb']:>8.1f} {previous['peak_rss_mb']:>9.1f}"
+            + ("  REGRESSION" if regressed else "")
+        )
+    return regressions
+
+
+def run_suite(spec: CorpusSpec, names: list[str], repeat: int) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = write_corpus(Path(tmp) / "corpus", spec)
+
+        benchmarks = {}
+        for name in names:
+            benchmarks[name] = run_isolated(name, corpus, repeat)
+            result = benchmarks[name]
+            print(
+                f"{name:<32} {result['seconds']:>9.3f}s {result['items_per_s']:>12,.0f} items/s"
+                f" {result['peak_rss_mb']:>8.1f} MB",
+                flush=True,
+            )
+
+    return {
+        "recorded_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "corpus": spec.to_dict(),
+        "repeat": repeat,
+        "benchmarks": benchmarks,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark parsing, discovery, analytics and reporting on a synthetic JUnit corpus"
+    )
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--tests", type=int, default=1000, help="Tests per run")
+    parser.add_argument("--failure-rate", type=float, default=0.02)
+    parser.add_argument("--flake-rate", type=float, default=0.05)
+    parser.add_argument("--message-bytes", type=int, default=512)
+    parser.add_argument("--shards", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed calls per benchmark; the best is kept")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Run only these benchmarks")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON")
+    parser.add_argument("--baseline", type=Path, help="Compare against results saved with --output")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.15, help="Allowed throughput drop or RSS growth (default: 0.15)"
+    )
+    parser.add_argument("--corpus", type=Path, help=argparse.SUPPRESS)
+    parser.add_argument("--child", choices=sorted(BENCHMARKS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_benchmark(args.child, args.corpus, args.repeat)))
+        return
+
+    spec = CorpusSpec(
+        runs=args.runs,
+        tests_per_run=args.tests,
+        failure_rate=args.failure_rate,
+        flake_rate=args.flake_rate,
+        message_bytes=args.message_bytes,
+        shards=args.shards,
+        seed=args.seed,
+    )
+    print(f"{spec.runs} runs x {spec.tests_per_run} tests, {spec.shards} shard(s) per run")
+    results = run_suite(spec, args.only or list(BENCHMARKS), args.repeat)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        print()
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) regressed beyond {args.tolerance:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,8 @@ from setuptools import find_packages, setup
 setup(
     name="testops-insight",
     version="0.1.0",
-    packages=find_packages(),
-    python_requires=">=3.8",
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
+    python_requires=">=3.10",
     entry_points={
         "console_scripts": [
             "testops-insight=testops_insight.cli.main:main",
@@ -1,16 +1,39 @@
-from .flaky_detection import detect_flaky_tests
-from .frequent_failures import get_frequent_failures
-from .health_score import calculate_health_score
-from .slow_tests import get_slowest_tests
-from .trends import get_last_failed_timestamp, get_last_test_status, get_pass_rate_trend
+import importlib
 
-__all__ = [
-    "detect_flaky_tests",
-    "get_frequent_failures",
-    "calculate_health_score",
-    "get_slowest_tests",
-    "get_pass_rate_trend",
-    "get_last_test_status",
-    "get_last_failed_timestamp",
-]
+# Names are imported on first access so that light entry points, such as the
+# gate command, do not pay for numpy or modules they never use.
+_EXPORTS = {
+    "AnalyticsResult": ".engine",
+    "LastSeen": ".engine",
+    "SuiteAggregator": ".engine",
+    "SuiteAnalytics": ".engine",
+    "WindowedAggregator": ".window",
+    "analyze_suite": ".engine",
+    "detect_flaky_tests": ".flaky_detection",
+    "get_frequent_failures": ".frequent_failures",
+    "calculate_health_score": ".health_score",
+    "get_slowest_tests": ".slow_tests",
+    "get_pass_rate_trend": ".trends",
+    "get_last_test_status": ".trends",
+    "get_last_failed_timestamp": ".trends",
+    "build_last_seen_index": ".trends",
+    "vectorized": None,
+}
 
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name = _EXPORTS[name]
+    if module_name is None:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,527 @@
+import heapq
+import math
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, NamedTuple, Optional, Sequence
+
+from testops_insight.analytics.exact_sum import ExactSum
+from testops_insight.analytics.quantiles import (
+    LOG_GAMMA,
+    MIN_DURATION,
+    NON_FINITE_BUCKET,
+    ZERO_BUCKET,
+    duration_quantiles,
+    merge_buckets,
+)
+from testops_insight.analytics.status_history import history_pattern
+from testops_insight.domain.models import (
+    STATUS_BY_CODE,
+    STATUS_CODES,
+    TestRun,
+    TestStatus,
+    TestSuite,
+)
+
+_PASSED = STATUS_CODES[TestStatus.PASSED]
+_FAILED = STATUS_CODES[TestStatus.FAILED]
+_ERROR = STATUS_CODES[TestStatus.ERROR]
+
+
+class FlakyTest(NamedTuple):
+    test_name: str
+    pass_count: int
+    fail_count: int
+    total_runs: int
+    flakiness_rate: float
+    flip_rate: float
+    longest_fail_streak: int
+    recently_flaky: bool
+
+
+class FrequentFailure(NamedTuple):
+    test_name: str
+    failure_count: int
+    total_runs: int
+    failure_rate: float
+
+
+class SlowTest(NamedTuple):
+    test_name: str
+    avg_duration: float
+    max_duration: float
+    total_runs: int
+    p50_duration: float
+    p95_duration: float
+    p99_duration: float
+
+
+class TrendPoint(NamedTuple):
+    run_index: int
+    pass_rate: float
+    avg_duration: float
+
+
+class LastSeen(NamedTuple):
+    status: str
+    run_index: int
+    last_failed: Optional[datetime]
+
+
+class AnalyticsResult(NamedTuple):
+    health_score: float
+    flaky_tests: list[FlakyTest]
+    frequent_failures: list[FrequentFailure]
+    slow_tests: list[SlowTest]
+    trends: list[TrendPoint]
+
+
+class TestStats:
+    __slots__ = (
+        "passed",
+        "failed",
+        "outcomes",
+        "total",
+        "duration_sum",
+        "duration_max",
+        "duration_count",
+        "duration_buckets",
+        "last_run",
+        "run_status",
+        "last_status",
+        "last_failed_run",
+    )
+
+    def __init__(self):
+        self.passed = 0
+        self.failed = 0
+        # Pass/fail history as a bitset, see analytics.status_history.
+        self.outcomes = 0
+        self.total = 0
+        # Exact, so totals merge and evict without rounding drift.
+        self.duration_sum = ExactSum()
+        self.duration_max = None
+        self.duration_count = 0
+        self.duration_buckets: dict[int, int] = {}
+        self.last_run = -1
+        self.run_status = None
+        self.last_status = None
+        self.last_failed_run = -1
+
+    def to_list(self) -> list[Any]:
+        return [
+            self.passed,
+            self.failed,
+            self.outcomes,
+            self.total,
+            self.duration_sum.to_list(),
+            self.duration_max,
+            self.duration_count,
+            self.last_run,
+            _status_name(self.run_status),
+            _status_name(self.last_status),
+            self.last_failed_run,
+            sorted(self.duration_buckets.items()),
+        ]
+
+    @classmethod
+    def from_list(cls, values: list[Any]) -> "TestStats":
+        stats = cls()
+        (
+            stats.passed,
+            stats.failed,
+            stats.outcomes,
+            stats.total,
+            duration_sum,
+            stats.duration_max,
+            stats.duration_count,
+            stats.last_run,
+            run_status,
+            last_status,
+            stats.last_failed_run,
+            duration_buckets,
+        ) = values
+        stats.duration_sum = ExactSum.from_list(duration_sum)
+        stats.duration_buckets = {index: count for index, count in duration_buckets}
+        stats.run_status = _status_from_name(run_status)
+        stats.last_status = _status_from_name(last_status)
+        return stats
+
+
+class RunSummary(NamedTuple):
+    timestamp: Optional[datetime]
+    total_tests: int
+    passed: int
+    failed: int
+    skipped: int
+    errors: int
+    duration: float
+    shard_count: int = 0
+    shard_spread: float = 0.0
+    slowest_shard: Optional[str] = None
+
+    @classmethod
+    def from_test_run(cls, test_run: TestRun) -> "RunSummary":
+        slowest_shard = test_run.slowest_shard
+        return cls(
+            timestamp=test_run.timestamp,
+            total_tests=test_run.total_tests,
+            passed=test_run.passed,
+            failed=test_run.failed,
+            skipped=test_run.skipped,
+            errors=test_run.errors,
+            duration=test_run.duration,
+            shard_count=len(test_run.shards),
+            shard_spread=test_run.shard_spread,
+            slowest_shard=slowest_shard.file if slowest_shard is not None else None,
+        )
+
+    def to_list(self) -> list[Any]:
+        return [_timestamp_str(self.timestamp), *self[1:]]
+
+    @classmethod
+    def from_list(cls, values: list[Any]) -> "RunSummary":
+        return cls(_timestamp_from_str(values[0]), *values[1:])
+
+
+class SuiteAnalytics(ABC):
+    """Read-only analytics over a sequence of runs: what reports are built from.
+
+    ``runs`` holds a RunSummary per run, oldest first. Implementations answer
+    the per-test queries from wherever their results live; SuiteAggregator
+    folds TestRuns into memory, others query a database or columns.
+    """
+
+    runs: Sequence[RunSummary]
+
+    @property
+    def total_runs(self) -> int:
+        return len(self.runs)
+
+    @abstractmethod
+    def flaky_tests(self, min_runs: int = 2) -> list[FlakyTest]: ...
+
+    @abstractmethod
+    def frequent_failures(self, min_runs: int = 1) -> list[FrequentFailure]: ...
+
+    @abstractmethod
+    def slowest_tests(self, limit: int = 10) -> list[SlowTest]: ...
+
+    @abstractmethod
+    def last_seen_index(self) -> dict[str, LastSeen]: ...
+
+    def last_seen(self, test_name: str) -> Optional[LastSeen]:
+        return self.last_seen_index().get(test_name)
+
+    def last_test_status(self, test_name: str) -> str:
+        if self.total_runs == 0:
+            return "UNKNOWN"
+
+        last_seen = self.last_seen(test_name)
+        return last_seen.status if last_seen is not None else "NOT_FOUND"
+
+    def last_failed_timestamp(self, test_name: str) -> Optional[datetime]:
+        last_seen = self.last_seen(test_name)
+        return last_seen.last_failed if last_seen is not None else None
+
+    def pass_rate_trend(self) -> list[TrendPoint]:
+        trends = []
+        for idx, run in enumerate(self.runs):
+            if run.total_tests == 0:
+                trends.append(TrendPoint(run_index=idx, pass_rate=0.0, avg_duration=0.0))
+            else:
+                trends.append(
+                    TrendPoint(
+                        run_index=idx,
+                        pass_rate=(run.passed / run.total_tests) * 100.0,
+                        avg_duration=run.duration / run.total_tests,
+                    )
+                )
+        return trends
+
+    def health_score(self) -> float:
+        return health_score_from_runs(self.runs)
+
+    def result(
+        self, flaky_min_runs: int = 2, failure_min_runs: int = 1, slow_limit: int = 10
+    ) -> AnalyticsResult:
+        return AnalyticsResult(
+            health_score=self.health_score(),
+            flaky_tests=self.flaky_tests(flaky_min_runs),
+            frequent_failures=self.frequent_failures(failure_min_runs),
+            slow_tests=self.slowest_tests(slow_limit),
+            trends=self.pass_rate_trend(),
+        )
+
+
+class SuiteAggregator(SuiteAnalytics):
+    def __init__(self):
+        self.test_stats: dict[str, TestStats] = {}
+        self.runs: list[RunSummary] = []
+        self.first_run = 0
+
+    @classmethod
+    def from_suite(cls, test_suite: TestSuite, include_tests: bool = True, **kwargs) -> "SuiteAggregator":
+        aggregator = cls(**kwargs)
+        for test_run in test_suite.test_runs:
+            aggregator.add_run(test_run, include_tests=include_tests)
+        return aggregator
+
+    def add_run(self, test_run: TestRun, include_tests: bool = True) -> None:
+        run_index = len(self.runs)
+        self.runs.append(RunSummary.from_test_run(test_run))
+
+        if not include_tests:
+            return
+
+        test_stats = self.test_stats
+        ceil, log, inf = math.ceil, math.log, math.inf
+        for test_case in test_run.test_cases:
+            test_name = test_case.identity.full_name
+            stats = test_stats.get(test_name)
+            if stats is None:
+                stats = test_stats[test_name] = TestStats()
+
+            duration = test_case.duration
+            stats.duration_sum.add(duration)
+            stats.duration_count += 1
+            # quantiles.bucket_index, inlined for the hot loop.
+            if MIN_DURATION < duration < inf:
+                bucket = ceil(log(duration) / LOG_GAMMA)
+            else:
+                bucket = ZERO_BUCKET if duration <= MIN_DURATION else NON_FINITE_BUCKET
+            buckets = stats.duration_buckets
+            buckets[bucket] = buckets.get(bucket, 0) + 1
+            if stats.duration_max is None or duration > stats.duration_max:
+                stats.duration_max = duration
+
+            status = test_case.status_code
+            if stats.last_run == run_index:
+                # A later result in the same run replaces the counted one.
+                if stats.run_status == _FAILED or stats.run_status == _ERROR:
+                    stats.outcomes ^= 1 << (stats.passed + stats.failed - 1)
+                _count_status(stats, stats.run_status, -1)
+            else:
+                stats.last_run = run_index
+                stats.last_status = status
+                stats.total += 1
+
+            stats.run_status = status
+            _count_status(stats, status, 1)
+
+            if status == _FAILED or status == _ERROR:
+                stats.outcomes |= 1 << (stats.passed + stats.failed - 1)
+                stats.last_failed_run = run_index
+
+    def merge(self, other: "SuiteAggregator") -> None:
+        """Append the runs aggregated by ``other``, which come after this aggregator's runs.
+
+        Counts, maxima and duration sums add up exactly, so aggregating slices
+        of the runs and merging them in run order gives the serial result bit
+        for bit.
+        """
+        run_offset = len(self.runs)
+        self.runs.extend(other.runs)
+
+        for test_name, other_stats in other.test_stats.items():
+            stats = self.test_stats.get(test_name)
+            if stats is None:
+                stats = self.test_stats[test_name] = TestStats()
+
+            stats.outcomes |= other_stats.outcomes << (stats.passed + stats.failed)
+            stats.passed += other_stats.passed
+            stats.failed += other_stats.failed
+            stats.total += other_stats.total
+            stats.duration_sum.merge(other_stats.duration_sum)
+            stats.duration_count += other_stats.duration_count
+            merge_buckets(stats.duration_buckets, other_stats.duration_buckets)
+            if other_stats.duration_max is not None and (
+                stats.duration_max is None or other_stats.duration_max > stats.duration_max
+            ):
+                stats.duration_max = other_stats.duration_max
+
+            if other_stats.last_run >= 0:
+                stats.last_run = other_stats.last_run + run_offset
+                stats.run_status = other_stats.run_status
+                stats.last_status = other_stats.last_status
+            if other_stats.last_failed_run >= 0:
+                stats.last_failed_run = other_stats.last_failed_run + run_offset
+
+    def last_seen(self, test_name: str) -> Optional[LastSeen]:
+        stats = self.test_stats.get(test_name)
+        if stats is None or stats.last_status is None:
+            return None
+        return self._last_seen(stats)
+
+    def last_seen_index(self) -> dict[str, LastSeen]:
+        return {
+            test_name: self._last_seen(stats)
+            for test_name, stats in self.test_stats.items()
+            if stats.last_status is not None
+        }
+
+    def _last_seen(self, stats: TestStats) -> LastSeen:
+        last_failed = None
+        if stats.last_failed_run >= 0:
+            last_failed = self.runs[stats.last_failed_run - self.first_run].timestamp
+        return LastSeen(
+            status=STATUS_BY_CODE[stats.last_status].name,
+            run_index=stats.last_run - self.first_run,
+            last_failed=last_failed,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "runs": [run.to_list() for run in self.runs],
+            "tests": {test_name: stats.to_list() for test_name, stats in self.test_stats.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "SuiteAggregator":
+        aggregator = cls()
+        aggregator.runs = [RunSummary.from_list(values) for values in data["runs"]]
+        aggregator.test_stats = {
+            test_name: TestStats.from_list(values) for test_name, values in data["tests"].items()
+        }
+        return aggregator
+
+    def flaky_tests(self, min_runs: int = 2) -> list[FlakyTest]:
+        if self.total_runs < min_runs:
+            return []
+
+        flaky_tests = []
+        for test_name, stats in self.test_stats.items():
+            if stats.total < min_runs or stats.passed == 0 or stats.failed == 0:
+                continue
+
+            flaky_tests.append(flaky_test(test_name, stats.passed, stats.failed, stats.total, stats.outcomes))
+
+        flaky_tests.sort(key=lambda x: x.flakiness_rate, reverse=True)
+        return flaky_tests
+
+    def frequent_failures(self, min_runs: int = 1) -> list[FrequentFailure]:
+        if self.total_runs == 0:
+            return []
+
+        failures = []
+        for test_name, stats in self.test_stats.items():
+            if stats.total < min_runs or stats.failed == 0:
+                continue
+
+            failures.append(
+                FrequentFailure(
+                    test_name=test_name,
+                    failure_count=stats.failed,
+                    total_runs=stats.total,
+                    failure_rate=stats.failed / stats.total,
+                )
+            )
+
+        failures.sort(key=lambda x: (x.failure_rate, x.failure_count), reverse=True)
+        return failures
+
+    def slowest_tests(self, limit: int = 10) -> list[SlowTest]:
+        if self.total_runs == 0:
+            return []
+
+        # nlargest keeps first-seen order among equal averages, like a stable sort.
+        slowest = heapq.nlargest(
+            limit,
+            (
+                (stats.duration_sum.value(), test_name, stats)
+                for test_name, stats in self.test_stats.items()
+                if stats.duration_count
+            ),
+            key=lambda item: item[0] / item[2].duration_count,
+        )
+        return [
+            slow_test(test_name, duration_sum, stats.duration_count, stats.duration_max, stats.duration_buckets)
+            for duration_sum, test_name, stats in slowest
+        ]
+
+
+def flaky_test(test_name: str, passed: int, failed: int, total: int, outcomes: int) -> FlakyTest:
+    pattern = history_pattern(outcomes, passed + failed)
+    return FlakyTest(
+        test_name=test_name,
+        pass_count=passed,
+        fail_count=failed,
+        total_runs=total,
+        flakiness_rate=min(passed, failed) / total,
+        flip_rate=pattern.flip_rate,
+        longest_fail_streak=pattern.longest_fail_streak,
+        recently_flaky=pattern.recently_flaky,
+    )
+
+
+def slow_test(
+    test_name: str, duration_sum: float, duration_count: int, duration_max: float, duration_buckets: dict[int, int]
+) -> SlowTest:
+    p50, p95, p99 = duration_quantiles(duration_buckets, (0.5, 0.95, 0.99), duration_max)
+    return SlowTest(
+        test_name=test_name,
+        avg_duration=duration_sum / duration_count,
+        max_duration=duration_max,
+        total_runs=duration_count,
+        p50_duration=p50,
+        p95_duration=p95,
+        p99_duration=p99,
+    )
+
+
+def health_score_from_runs(runs: Sequence[Any]) -> float:
+    """Health score from per-run ``total_tests`` and ``passed`` counts, oldest run first."""
+    total_runs = len(runs)
+    if total_runs == 0:
+        return 0.0
+
+    total_tests = sum(run.total_tests for run in runs)
+    total_passed = sum(run.passed for run in runs)
+
+    if total_tests == 0:
+        return 0.0
+
+    base_score = (total_passed / total_tests) * 100.0
+    if total_runs == 1:
+        return base_score
+
+    recent_runs = runs[-min(5, total_runs) :]
+    recent_total = sum(run.total_tests for run in recent_runs)
+    recent_passed = sum(run.passed for run in recent_runs)
+
+    if recent_total > 0:
+        recent_score = (recent_passed / recent_total) * 100.0
+        return base_score * 0.6 + recent_score * 0.4
+    else:
+        return base_score
+
+
+def analyze_suite(
+    test_suite: TestSuite,
+    flaky_min_runs: int = 2,
+    failure_min_runs: int = 1,
+    slow_limit: int = 10,
+) -> AnalyticsResult:
+    return SuiteAggregator.from_suite(test_suite).result(flaky_min_runs, failure_min_runs, slow_limit)
+
+
+def _status_name(status_code: Optional[int]) -> Optional[str]:
+    return STATUS_BY_CODE[status_code].name if status_code is not None else None
+
+
+def _status_from_name(name: Optional[str]) -> Optional[int]:
+    return STATUS_CODES[TestStatus[name]] if name is not None else None
+
+
+def _timestamp_str(timestamp: Optional[datetime]) -> Optional[str]:
+    return timestamp.isoformat() if timestamp is not None else None
+
+
+def _timestamp_from_str(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+def _count_status(stats: TestStats, status_code: Optional[int], delta: int) -> None:
+    if status_code == _PASSED:
+        stats.passed += delta
+    elif status_code == _FAILED or status_code == _ERROR:
+        stats.failed += delta
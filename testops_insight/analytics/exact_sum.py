@@ -0,0 +1,95 @@
+import math
+from typing import Any, Iterable, Optional
+
+# Duration totals are kept exactly, as non-overlapping floats whose sum is the
+# exact total (Shewchuk's partials, the method behind math.fsum). Adding a
+# duration, merging two totals and taking durations away again are all exact,
+# so a total does not depend on the order its terms were added, merged or
+# evicted in, and ``value()`` is the correctly rounded result. A total holds
+# one or two partials in practice.
+
+_INF = math.inf
+
+
+def exact_total(values: Iterable[float]) -> float:
+    """The correctly rounded sum of ``values``, equal to ExactSum's ``value()`` over them."""
+    try:
+        return math.fsum(values)
+    except ValueError:  # inf + -inf
+        return math.nan
+
+
+class ExactSum:
+    __slots__ = ("partials", "special")
+
+    def __init__(self, partials: Optional[list[float]] = None, special: Optional[list[int]] = None):
+        self.partials = partials if partials is not None else []
+        # Counts of +inf, -inf and NaN terms, which partials cannot hold.
+        self.special = special
+
+    def add(self, x: float) -> None:
+        if not -_INF < x < _INF:
+            self._count_special(x, 1)
+            return
+        partials = self.partials
+        i = 0
+        for y in partials:
+            # Knuth's TwoSum: hi + lo == x + y exactly, whatever their magnitudes.
+            hi = x + y
+            t = hi - x
+            lo = (x - (hi - t)) + (y - t)
+            if lo:
+                partials[i] = lo
+                i += 1
+            x = hi
+        if i == len(partials):
+            partials.append(x)
+        else:
+            partials[i] = x
+            del partials[i + 1 :]
+
+    def remove(self, x: float) -> None:
+        if not -_INF < x < _INF:
+            self._count_special(x, -1)
+        else:
+            self.add(-x)
+
+    def merge(self, other: "ExactSum") -> None:
+        for partial in other.partials:
+            self.add(partial)
+        if other.special is not None:
+            for x, count in zip((_INF, -_INF, math.nan), other.special):
+                self._count_special(x, count)
+
+    def subtract(self, other: "ExactSum") -> None:
+        for partial in other.partials:
+            self.add(-partial)
+        if other.special is not None:
+            for x, count in zip((_INF, -_INF, math.nan), other.special):
+                self._count_special(x, -count)
+
+    def value(self) -> float:
+        special = self.special
+        if special is not None and any(special):
+            positive, negative, nan = special
+            if nan or (positive and negative):
+                return math.nan
+            return _INF if positive else -_INF
+        return math.fsum(self.partials)
+
+    def to_list(self) -> list[Any]:
+        special = self.special
+        return [list(self.partials), list(special) if special is not None else None]
+
+    @classmethod
+    def from_list(cls, values: list[Any]) -> "ExactSum":
+        partials, special = values
+        return cls(partials, special)
+
+    def _count_special(self, x: float, count: int) -> None:
+        if self.special is None:
+            self.special = [0, 0, 0]
+        self.special[0 if x == _INF else 1 if x == -_INF else 2] += count
+
+    def __repr__(self) -> str:
+        return f"ExactSum({self.value()!r})"
@@ -0,0 +1,74 @@
+import math
+import sys
+from typing import Iterable
+
+# Durations are counted in logarithmic buckets: bucket i holds durations in
+# (GAMMA ** (i - 1), GAMMA ** i], and is reported as the value within
+# RELATIVE_ACCURACY of both ends. A test needs one bucket per 2% step between
+# its fastest and slowest duration, however many runs it has.
+RELATIVE_ACCURACY = 0.01
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+LOG_GAMMA = math.log(GAMMA)
+
+# Durations at or below a microsecond, including 0, share a bucket reported as 0.
+MIN_DURATION = 1e-6
+ZERO_BUCKET = math.ceil(math.log(MIN_DURATION) / LOG_GAMMA) - 1
+
+# Infinite and NaN durations (a report saying time="inf") share a bucket above
+# every finite one, reported as the test's maximum duration.
+NON_FINITE_BUCKET = math.ceil(math.log(sys.float_info.max) / LOG_GAMMA) + 1
+
+
+def bucket_index(duration: float) -> int:
+    if MIN_DURATION < duration < math.inf:
+        return math.ceil(math.log(duration) / LOG_GAMMA)
+    if duration <= MIN_DURATION:
+        return ZERO_BUCKET
+    return NON_FINITE_BUCKET
+
+
+def add_duration(buckets: dict[int, int], duration: float) -> None:
+    index = bucket_index(duration)
+    buckets[index] = buckets.get(index, 0) + 1
+
+
+def merge_buckets(buckets: dict[int, int], other: dict[int, int]) -> None:
+    for index, count in other.items():
+        buckets[index] = buckets.get(index, 0) + count
+
+
+def remove_buckets(buckets: dict[int, int], indexes: Iterable[int]) -> None:
+    for index in indexes:
+        count = buckets[index] - 1
+        if count:
+            buckets[index] = count
+        else:
+            del buckets[index]
+
+
+def duration_quantiles(buckets: dict[int, int], quantiles: Iterable[float], max_duration: float) -> list[float]:
+    """Nearest-rank ``quantiles`` (in increasing order) of the counted durations.
+
+    Values are capped at ``max_duration``; each is within RELATIVE_ACCURACY of
+    the exact nearest-rank duration.
+    """
+    total = sum(buckets.values())
+    indexes = sorted(buckets)
+    values = []
+    position = 0
+    seen = 0
+    for quantile in quantiles:
+        rank = max(1, math.ceil(quantile * total))
+        while seen < rank:
+            seen += buckets[indexes[position]]
+            position += 1
+        values.append(min(_bucket_value(indexes[position - 1]), max_duration))
+    return values
+
+
+def _bucket_value(index: int) -> float:
+    if index == ZERO_BUCKET:
+        return 0.0
+    if index == NON_FINITE_BUCKET:
+        return math.inf
+    return 2 * GAMMA**index / (GAMMA + 1)
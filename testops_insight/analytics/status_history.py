@@ -0,0 +1,43 @@
+from typing import NamedTuple
+
+# A test's pass/fail history is an int used as a bitset: bit i is set when the
+# test failed in the i-th run it passed or failed in, oldest run in bit 0.
+# Runs where it was skipped or missing are left out. Comparing the history
+# with itself shifted by one marks every change of outcome, so flips and
+# streaks over thousands of runs cost a few big-int operations.
+
+# A test "recently became flaky" when it flipped within its last RECENT_RUNS
+# outcomes after at least RECENT_RUNS outcomes without a flip.
+RECENT_RUNS = 10
+
+
+class HistoryPattern(NamedTuple):
+    flip_rate: float
+    longest_fail_streak: int
+    recently_flaky: bool
+
+
+def flip_count(history: int, length: int) -> int:
+    """Changes of outcome between consecutive entries of the first ``length`` entries."""
+    if length < 2:
+        return 0
+    return ((history ^ (history >> 1)) & ((1 << (length - 1)) - 1)).bit_count()
+
+
+def longest_streak(history: int) -> int:
+    """Longest run of consecutive set bits."""
+    streak = 0
+    while history:
+        history &= history >> 1
+        streak += 1
+    return streak
+
+
+def history_pattern(history: int, length: int) -> HistoryPattern:
+    flips = flip_count(history, length)
+    stable_length = length - RECENT_RUNS
+    return HistoryPattern(
+        flip_rate=flips / (length - 1) if length > 1 else 0.0,
+        longest_fail_streak=longest_streak(history),
+        recently_flaky=flips > 0 and stable_length >= RECENT_RUNS and flip_count(history, stable_length) == 0,
+    )
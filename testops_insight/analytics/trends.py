@@ -1,56 +1,51 @@
-from collections import defaultdict
-from typing import NamedTuple
+from bisect import bisect_left
+from datetime import datetime
+from typing import Optional
 
-from testops_insight.domain.models import TestSuite
-
-
-class TrendPoint(NamedTuple):
-    run_index: int
-    pass_rate: float
-    avg_duration: float
+from testops_insight.analytics.engine import LastSeen, SuiteAggregator, TrendPoint
+from testops_insight.domain.models import TestStatus, TestSuite
 
 
 def get_pass_rate_trend(test_suite: TestSuite) -> list[TrendPoint]:
-    if len(test_suite.test_runs) == 0:
-        return []
-
-    trends = []
-    for idx, test_run in enumerate(test_suite.test_runs):
-        if test_run.total_tests == 0:
-            pass_rate = 0.0
-        else:
-            pass_rate = (test_run.passed / test_run.total_tests) * 100.0
+    return SuiteAggregator.from_suite(test_suite, include_tests=False).pass_rate_trend()
 
-        if test_run.total_tests == 0:
-            avg_duration = 0.0
-        else:
-            avg_duration = test_run.duration / test_run.total_tests
 
-        trends.append(TrendPoint(run_index=idx, pass_rate=pass_rate, avg_duration=avg_duration))
+def build_last_seen_index(test_suite: TestSuite) -> dict[str, LastSeen]:
+    return SuiteAggregator.from_suite(test_suite).last_seen_index()
 
-    return trends
 
-
-def get_last_test_status(test_suite: TestSuite, test_name: str) -> str:
+def get_last_test_status(
+    test_suite: TestSuite, test_name: str, last_seen_index: Optional[dict[str, LastSeen]] = None
+) -> str:
     if len(test_suite.test_runs) == 0:
         return "UNKNOWN"
 
-    for test_run in reversed(test_suite.test_runs):
-        for test_case in test_run.test_cases:
-            if test_case.full_name == test_name:
-                return test_case.status.name
+    if last_seen_index is not None:
+        last_seen = last_seen_index.get(test_name)
+        return last_seen.status if last_seen is not None else "NOT_FOUND"
+
+    history = test_suite.history(test_name)
+    if len(history) == 0:
+        return "NOT_FOUND"
 
-    return "NOT_FOUND"
+    # The first result in the latest run the test appeared in.
+    run_indices = history.run_indices
+    return history[bisect_left(run_indices, run_indices[-1])].status.name
 
 
-def get_last_failed_timestamp(test_suite: TestSuite, test_name: str):
+def get_last_failed_timestamp(
+    test_suite: TestSuite, test_name: str, last_seen_index: Optional[dict[str, LastSeen]] = None
+) -> Optional[datetime]:
     if len(test_suite.test_runs) == 0:
         return None
 
-    for test_run in reversed(test_suite.test_runs):
-        for test_case in test_run.test_cases:
-            if test_case.full_name == test_name and test_case.status.name in ("FAILED", "ERROR"):
-                return test_run.timestamp
+    if last_seen_index is not None:
+        last_seen = last_seen_index.get(test_name)
+        return last_seen.last_failed if last_seen is not None else None
+
+    for entry in reversed(test_suite.history(test_name)):
+        if entry.status in (TestStatus.FAILED, TestStatus.ERROR):
+            return test_suite.test_runs[entry.run_index].timestamp
 
     return None
 
@@ -0,0 +1,318 @@
+import heapq
+
+from testops_insight.analytics.engine import LastSeen, RunSummary, SuiteAnalytics, flaky_test, slow_test
+from testops_insight.analytics.exact_sum import exact_total
+from testops_insight.analytics.flaky_detection import FlakyTest
+from testops_insight.analytics.frequent_failures import FrequentFailure
+from testops_insight.analytics.quantiles import add_duration
+from testops_insight.analytics.slow_tests import SlowTest
+from testops_insight.analytics.trends import TrendPoint
+from testops_insight.domain.columnar import (
+    STATUS_ERROR,
+    STATUS_FAILED,
+    STATUS_PASSED,
+    ColumnarSuite,
+    np,
+)
+from testops_insight.domain.models import STATUS_BY_CODE
+
+
+def detect_flaky_tests(suite: ColumnarSuite, min_runs: int = 2) -> list[FlakyTest]:
+    if suite.total_runs < min_runs:
+        return []
+
+    total, passed, failed = _outcome_counts(suite)
+
+    if np is not None:
+        ids = np.nonzero((total >= min_runs) & (passed > 0) & (failed > 0))[0]
+        rates = np.minimum(passed[ids], failed[ids]) / total[ids]
+        order = ids[np.argsort(-rates, kind="stable")].tolist()
+    else:
+        ids = [i for i in range(len(total)) if total[i] >= min_runs and passed[i] > 0 and failed[i] > 0]
+        order = sorted(ids, key=lambda i: min(passed[i], failed[i]) / total[i], reverse=True)
+
+    outcomes = _outcome_histories(suite, order)
+    return [
+        flaky_test(suite.test_names[i], int(passed[i]), int(failed[i]), int(total[i]), outcomes[i])
+        for i in order
+    ]
+
+
+def get_frequent_failures(suite: ColumnarSuite, min_runs: int = 1) -> list[FrequentFailure]:
+    if suite.total_runs == 0:
+        return []
+
+    total, _, failed = _outcome_counts(suite)
+
+    if np is not None:
+        ids = np.nonzero((total >= min_runs) & (failed > 0))[0]
+        rates = failed[ids] / total[ids]
+        order = ids[np.lexsort((-failed[ids], -rates))].tolist()
+    else:
+        ids = [i for i in range(len(total)) if total[i] >= min_runs and failed[i] > 0]
+        order = sorted(ids, key=lambda i: (failed[i] / total[i], failed[i]), reverse=True)
+
+    return [
+        FrequentFailure(
+            test_name=suite.test_names[i],
+            failure_count=int(failed[i]),
+            total_runs=int(total[i]),
+            failure_rate=int(failed[i]) / int(total[i]),
+        )
+        for i in order
+    ]
+
+
+def get_slowest_tests(suite: ColumnarSuite, limit: int = 10) -> list[SlowTest]:
+    if suite.total_runs == 0:
+        return []
+
+    n_tests = len(suite.test_names)
+
+    if np is not None:
+        counts = np.bincount(suite.test_ids, minlength=n_tests)
+        # Exact per-test totals, as SuiteAggregator keeps them: group the
+        # durations by test and fsum each group.
+        grouped = suite.durations[np.argsort(suite.test_ids, kind="stable")].tolist()
+        ends = np.cumsum(counts).tolist()
+        sums = np.array([exact_total(grouped[end - count : end]) for end, count in zip(ends, counts.tolist())])
+        maxes = np.full(n_tests, -np.inf)
+        np.maximum.at(maxes, suite.test_ids, suite.durations)
+        ids = np.nonzero(counts)[0]
+        averages = sums[ids] / counts[ids]
+        order = ids[np.argsort(-averages, kind="stable")[:limit]].tolist()
+    else:
+        counts = [0] * n_tests
+        grouped = [[] for _ in range(n_tests)]
+        maxes = [float("-inf")] * n_tests
+        for test_id, duration in zip(suite.test_ids, suite.durations):
+            counts[test_id] += 1
+            grouped[test_id].append(duration)
+            if duration > maxes[test_id]:
+                maxes[test_id] = duration
+        sums = [exact_total(durations) for durations in grouped]
+        ids = [i for i in range(n_tests) if counts[i]]
+        order = heapq.nlargest(limit, ids, key=lambda i: sums[i] / counts[i])
+
+    # Percentiles need each duration again, but only those of the selected tests.
+    buckets = {i: {} for i in order}
+    if np is not None:
+        rows = np.isin(suite.test_ids, order)
+        selected = zip(suite.test_ids[rows].tolist(), suite.durations[rows].tolist())
+    else:
+        selected = zip(suite.test_ids, suite.durations)
+    for test_id, duration in selected:
+        test_buckets = buckets.get(test_id)
+        if test_buckets is not None:
+            add_duration(test_buckets, duration)
+
+    return [
+        slow_test(suite.test_names[i], float(sums[i]), int(counts[i]), float(maxes[i]), buckets[i])
+        for i in order
+    ]
+
+
+def get_pass_rate_trend(suite: ColumnarSuite) -> list[TrendPoint]:
+    if suite.total_runs == 0:
+        return []
+
+    if np is not None:
+        total = suite.run_total_tests
+        has_tests = total > 0
+        safe_total = np.where(has_tests, total, 1)
+        pass_rates = np.where(has_tests, (suite.run_passed / safe_total) * 100.0, 0.0).tolist()
+        avg_durations = np.where(has_tests, suite.run_durations / safe_total, 0.0).tolist()
+    else:
+        pass_rates = [
+            (passed / total) * 100.0 if total else 0.0
+            for passed, total in zip(suite.run_passed, suite.run_total_tests)
+        ]
+        avg_durations = [
+            duration / total if total else 0.0
+            for duration, total in zip(suite.run_durations, suite.run_total_tests)
+        ]
+
+    return [
+        TrendPoint(run_index=idx, pass_rate=pass_rate, avg_duration=avg_duration)
+        for idx, (pass_rate, avg_duration) in enumerate(zip(pass_rates, avg_durations))
+    ]
+
+
+def calculate_health_score(suite: ColumnarSuite) -> float:
+    total_runs = suite.total_runs
+    if total_runs == 0:
+        return 0.0
+
+    total_tests = _sum(suite.run_total_tests)
+    total_passed = _sum(suite.run_passed)
+
+    if total_runs == 1:
+        if total_tests == 0:
+            return 0.0
+        return (total_passed / total_tests) * 100.0
+
+    if total_tests == 0:
+        return 0.0
+
+    base_score = (total_passed / total_tests) * 100.0
+
+    recent = slice(total_runs - min(5, total_runs), total_runs)
+    recent_total = _sum(suite.run_total_tests[recent])
+    recent_passed = _sum(suite.run_passed[recent])
+
+    if recent_total > 0:
+        recent_score = (recent_passed / recent_total) * 100.0
+        return base_score * 0.6 + recent_score * 0.4
+    else:
+        return base_score
+
+
+def build_last_seen_index(suite: ColumnarSuite) -> dict[str, LastSeen]:
+    """Same as ``SuiteAggregator.last_seen_index``: the status a test first had
+    in its last run, and the timestamp of the last run in which it failed."""
+    n_tests = len(suite.test_names)
+    n_rows = len(suite.test_ids)
+    if n_rows == 0:
+        return {}
+
+    if np is not None:
+        run_ids = suite.run_ids.astype(np.int64) - suite.first_run
+        test_ids = suite.test_ids
+        tests, reversed_rows = np.unique(test_ids[::-1], return_index=True)
+        last_runs = run_ids[n_rows - 1 - reversed_rows]
+        pair_keys, first_rows = np.unique(run_ids * n_tests + test_ids, return_index=True)
+        last_statuses = suite.statuses[first_rows[np.searchsorted(pair_keys, last_runs * n_tests + tests)]]
+        failed = (suite.statuses == STATUS_FAILED) | (suite.statuses == STATUS_ERROR)
+        last_failed = np.full(n_tests, -1, dtype=np.int64)
+        np.maximum.at(last_failed, test_ids[failed], run_ids[failed])
+        latest = zip(tests.tolist(), last_runs.tolist(), last_statuses.tolist(), last_failed[tests].tolist())
+    else:
+        by_test = {}
+        first_run = suite.first_run
+        for run_id, test_id, status in zip(suite.run_ids, suite.test_ids, suite.statuses):
+            run_index = run_id - first_run
+            entry = by_test.get(test_id)
+            if entry is None:
+                entry = by_test[test_id] = [run_index, status, -1]
+            elif entry[0] != run_index:
+                entry[0] = run_index
+                entry[1] = status
+            if status == STATUS_FAILED or status == STATUS_ERROR:
+                entry[2] = run_index
+        latest = ((test_id, *entry) for test_id, entry in by_test.items())
+
+    return {
+        suite.test_names[test_id]: LastSeen(
+            status=STATUS_BY_CODE[status].name,
+            run_index=run_index,
+            last_failed=suite.run_timestamps[failed_run] if failed_run >= 0 else None,
+        )
+        for test_id, run_index, status, failed_run in latest
+    }
+
+
+class ColumnarAggregator(SuiteAnalytics):
+    """The SuiteAnalytics queries over a ColumnarSuite, for ``generate_aggregate_report``.
+
+    Per-test results come from the functions above. Among tests with equal
+    scores, the order follows test ids rather than first appearance.
+    """
+
+    def __init__(self, suite: ColumnarSuite):
+        self.suite = suite
+        self.runs = [_run_summary(suite, idx) for idx in range(suite.total_runs)]
+
+    def flaky_tests(self, min_runs: int = 2) -> list[FlakyTest]:
+        return detect_flaky_tests(self.suite, min_runs)
+
+    def frequent_failures(self, min_runs: int = 1) -> list[FrequentFailure]:
+        return get_frequent_failures(self.suite, min_runs)
+
+    def slowest_tests(self, limit: int = 10) -> list[SlowTest]:
+        return get_slowest_tests(self.suite, limit)
+
+    def last_seen_index(self) -> dict[str, LastSeen]:
+        return build_last_seen_index(self.suite)
+
+
+def _run_summary(suite: ColumnarSuite, idx: int) -> RunSummary:
+    return RunSummary(
+        timestamp=suite.run_timestamps[idx],
+        total_tests=int(suite.run_total_tests[idx]),
+        passed=int(suite.run_passed[idx]),
+        failed=int(suite.run_failed[idx]),
+        skipped=int(suite.run_skipped[idx]),
+        errors=int(suite.run_errors[idx]),
+        duration=float(suite.run_durations[idx]),
+        shard_count=suite.run_shard_counts[idx] if suite.run_shard_counts is not None else 0,
+        shard_spread=suite.run_shard_spreads[idx] if suite.run_shard_spreads is not None else 0.0,
+        slowest_shard=suite.run_slowest_shards[idx] if suite.run_slowest_shards is not None else None,
+    )
+
+
+def _sum(values) -> int:
+    if np is not None:
+        return int(values.sum())
+    return sum(values)
+
+
+def _outcome_histories(suite: ColumnarSuite, ids: list[int]) -> dict[int, int]:
+    """Pass/fail history bitsets (see analytics.status_history) of the tests ``ids``."""
+    if np is not None:
+        rows = np.isin(suite.test_ids, ids)
+        selected = zip(suite.run_ids[rows].tolist(), suite.test_ids[rows].tolist(), suite.statuses[rows].tolist())
+    else:
+        selected = zip(suite.run_ids, suite.test_ids, suite.statuses)
+
+    # Rows come in run order; the last result of a test in a run is counted.
+    run_statuses = {i: {} for i in ids}
+    for run_id, test_id, status in selected:
+        statuses = run_statuses.get(test_id)
+        if statuses is not None:
+            statuses[run_id] = status
+
+    histories = {}
+    for test_id, statuses in run_statuses.items():
+        history = 0
+        length = 0
+        for status in statuses.values():
+            if status == STATUS_FAILED or status == STATUS_ERROR:
+                history |= 1 << length
+                length += 1
+            elif status == STATUS_PASSED:
+                length += 1
+        histories[test_id] = history
+    return histories
+
+
+def _outcome_counts(suite: ColumnarSuite):
+    n_tests = len(suite.test_names)
+
+    if np is not None:
+        keys = suite.run_ids.astype(np.int64) * n_tests + suite.test_ids
+        _, last_in_reversed = np.unique(keys[::-1], return_index=True)
+        latest = len(keys) - 1 - last_in_reversed
+        test_ids = suite.test_ids[latest]
+        statuses = suite.statuses[latest]
+        total = np.bincount(test_ids, minlength=n_tests)
+        passed = np.bincount(test_ids[statuses == STATUS_PASSED], minlength=n_tests)
+        failed = np.bincount(
+            test_ids[(statuses == STATUS_FAILED) | (statuses == STATUS_ERROR)], minlength=n_tests
+        )
+        return total, passed, failed
+
+    latest = {}
+    for run_id, test_id, status in zip(suite.run_ids, suite.test_ids, suite.statuses):
+        latest[(run_id, test_id)] = status
+
+    total = [0] * n_tests
+    passed = [0] * n_tests
+    failed = [0] * n_tests
+    for (_, test_id), status in latest.items():
+        total[test_id] += 1
+        if status == STATUS_PASSED:
+            passed[test_id] += 1
+        elif status == STATUS_FAILED or status == STATUS_ERROR:
+            failed[test_id] += 1
+
+    return total, passed, failed
@@ -0,0 +1,259 @@
+import math
+from collections import deque
+from typing import Any, Optional
+
+from testops_insight.analytics.engine import (
+    _ERROR,
+    _FAILED,
+    _PASSED,
+    FlakyTest,
+    FrequentFailure,
+    LastSeen,
+    RunSummary,
+    SlowTest,
+    SuiteAggregator,
+    SuiteAnalytics,
+    TestStats,
+    _count_status,
+    _status_from_name,
+    _status_name,
+)
+from testops_insight.analytics.exact_sum import ExactSum
+from testops_insight.analytics.quantiles import bucket_index, merge_buckets, remove_buckets
+from testops_insight.domain.models import TestRun
+
+
+class WindowedAggregator(SuiteAnalytics):
+    """Analytics over the last ``window`` runs, fed one run at a time.
+
+    Every run in the window is kept as a delta: per test, the counted status,
+    its duration total, count, maximum and buckets. Adding a run adds its
+    delta to the per-test counters and evicting the oldest run subtracts its
+    delta again. Duration totals are ExactSums and maxima come from a
+    monotonic queue per test, so the results are exactly those of aggregating
+    the same runs from scratch, ties included.
+    """
+
+    def __init__(self, window: int):
+        if window < 1:
+            raise ValueError(f"Window must be at least 1, got {window}")
+        self.window = window
+        self._runs: deque[RunSummary] = deque()
+        self.first_run = 0
+        self.test_stats: dict[str, TestStats] = {}
+        # Per run, test name -> (position, status, durations, count, max, buckets,
+        # first duration). A test with one result in the run keeps its duration
+        # and bucket, otherwise an ExactSum and a tuple of buckets. The max
+        # leaves out NaN durations, see _push_max.
+        self._deltas: deque[dict[str, tuple]] = deque()
+        # Per test, (run index, max) of the runs whose maximum no later run beats.
+        self._max_queues: dict[str, deque[tuple[int, float]]] = {}
+        # Per test, (run index, position) of its first result in the window,
+        # which decides the order of ties.
+        self._first_seen: dict[str, tuple[int, int]] = {}
+        self._view: Optional[SuiteAggregator] = None
+
+    def add_run(self, test_run: TestRun, include_tests: bool = True) -> None:
+        run_index = self.first_run + len(self._runs)
+        self._runs.append(RunSummary.from_test_run(test_run))
+
+        results: dict[str, list] = {}
+        if include_tests:
+            for test_case in test_run.test_cases:
+                test_name = test_case.identity.full_name
+                if test_name in results:
+                    results[test_name].append(test_case)
+                else:
+                    results[test_name] = [test_case]
+
+        delta = {}
+        for position, (test_name, test_cases) in enumerate(results.items()):
+            if len(test_cases) == 1:
+                duration = test_cases[0].duration
+                entry = (position, test_cases[0].status_code, duration, 1, duration, bucket_index(duration), duration)
+            else:
+                durations = ExactSum()
+                for test_case in test_cases:
+                    durations.add(test_case.duration)
+                entry = (
+                    position,
+                    test_cases[-1].status_code,
+                    durations,
+                    len(test_cases),
+                    max(
+                        (test_case.duration for test_case in test_cases if test_case.duration == test_case.duration),
+                        default=math.nan,
+                    ),
+                    tuple(bucket_index(test_case.duration) for test_case in test_cases),
+                    test_cases[0].duration,
+                )
+            delta[test_name] = entry
+            failed = any(test_case.status_code in (_FAILED, _ERROR) for test_case in test_cases)
+            self._add(test_name, run_index, entry, test_cases[0].status_code, failed)
+
+        self._deltas.append(delta)
+        while len(self._runs) > self.window:
+            self._evict()
+        self._view = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "runs": [run.to_list() for run in self._runs],
+            "tests": {test_name: stats.to_list() for test_name, stats in self.test_stats.items()},
+            "window": self.window,
+            "first_run": self.first_run,
+            "deltas": [
+                [
+                    [
+                        test_name,
+                        _status_name(status),
+                        durations if count == 1 else durations.to_list(),
+                        count,
+                        duration_max,
+                        buckets,
+                        first_duration,
+                    ]
+                    for test_name, (_, status, durations, count, duration_max, buckets, first_duration) in delta.items()
+                ]
+                for delta in self._deltas
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "WindowedAggregator":
+        aggregator = cls(data["window"])
+        aggregator._runs = deque(RunSummary.from_list(values) for values in data["runs"])
+        aggregator.first_run = data["first_run"]
+        aggregator.test_stats = {
+            test_name: TestStats.from_list(values) for test_name, values in data["tests"].items()
+        }
+        for run_index, entries in enumerate(data["deltas"], aggregator.first_run):
+            delta = {}
+            for position, (test_name, status, durations, count, duration_max, buckets, first) in enumerate(entries):
+                if count != 1:
+                    durations = ExactSum.from_list(durations)
+                    buckets = tuple(buckets)
+                delta[test_name] = (position, _status_from_name(status), durations, count, duration_max, buckets, first)
+                aggregator._push_max(test_name, run_index, duration_max)
+                aggregator._first_seen.setdefault(test_name, (run_index, position))
+            aggregator._deltas.append(delta)
+        return aggregator
+
+    @property
+    def runs(self) -> list[RunSummary]:
+        return self._ordered().runs
+
+    def flaky_tests(self, min_runs: int = 2) -> list[FlakyTest]:
+        return self._ordered().flaky_tests(min_runs)
+
+    def frequent_failures(self, min_runs: int = 1) -> list[FrequentFailure]:
+        return self._ordered().frequent_failures(min_runs)
+
+    def slowest_tests(self, limit: int = 10) -> list[SlowTest]:
+        return self._ordered().slowest_tests(limit)
+
+    def last_seen(self, test_name: str) -> Optional[LastSeen]:
+        return self._ordered().last_seen(test_name)
+
+    def last_seen_index(self) -> dict[str, LastSeen]:
+        return self._ordered().last_seen_index()
+
+    def _ordered(self) -> SuiteAggregator:
+        # The rankings break ties by test_stats order, so queries go through a
+        # SuiteAggregator sharing the counters with the tests in first-seen order.
+        if self._view is None:
+            first_seen = self._first_seen
+            view = SuiteAggregator()
+            view.runs = list(self._runs)
+            view.first_run = self.first_run
+            view.test_stats = dict(sorted(self.test_stats.items(), key=lambda item: first_seen[item[0]]))
+            self._view = view
+        return self._view
+
+    def _add(self, test_name: str, run_index: int, entry: tuple, first_status: int, failed: bool) -> None:
+        position, status, durations, count, duration_max, buckets, first_duration = entry
+        stats = self.test_stats.get(test_name)
+        if stats is None:
+            stats = self.test_stats[test_name] = TestStats()
+            self._first_seen[test_name] = (run_index, position)
+            stats.duration_max = first_duration
+
+        stats.total += 1
+        _count_status(stats, status, 1)
+        if status == _FAILED or status == _ERROR:
+            stats.outcomes |= 1 << (stats.passed + stats.failed - 1)
+
+        duration_buckets = stats.duration_buckets
+        if count == 1:
+            stats.duration_sum.add(durations)
+            duration_buckets[buckets] = duration_buckets.get(buckets, 0) + 1
+        else:
+            stats.duration_sum.merge(durations)
+            merge_buckets(duration_buckets, {index: buckets.count(index) for index in set(buckets)})
+        stats.duration_count += count
+        self._push_max(test_name, run_index, duration_max)
+        if stats.duration_max == stats.duration_max:
+            stats.duration_max = self._max_queues[test_name][0][1]
+
+        stats.last_run = run_index
+        stats.run_status = status
+        stats.last_status = first_status
+        if failed:
+            stats.last_failed_run = run_index
+
+    def _push_max(self, test_name: str, run_index: int, duration_max: float) -> None:
+        queue = self._max_queues.get(test_name)
+        if queue is None:
+            queue = self._max_queues[test_name] = deque()
+        # A NaN duration never beats the running maximum, it is the maximum
+        # only when it comes first; _add and _evict handle that case.
+        if duration_max != duration_max:
+            return
+        while queue and queue[-1][1] <= duration_max:
+            queue.pop()
+        queue.append((run_index, duration_max))
+
+    def _evict(self) -> None:
+        evicted_run = self.first_run
+        self._runs.popleft()
+        delta = self._deltas.popleft()
+        self.first_run += 1
+
+        for test_name, (_, status, durations, count, _, buckets, _) in delta.items():
+            stats = self.test_stats[test_name]
+            stats.total -= 1
+            if stats.total == 0:
+                del self.test_stats[test_name]
+                del self._max_queues[test_name]
+                del self._first_seen[test_name]
+                continue
+
+            # The evicted run holds the oldest bit of the pass/fail history.
+            if status == _PASSED or status == _FAILED or status == _ERROR:
+                stats.outcomes >>= 1
+            _count_status(stats, status, -1)
+
+            if count == 1:
+                stats.duration_sum.remove(durations)
+                remove_buckets(stats.duration_buckets, (buckets,))
+            else:
+                stats.duration_sum.subtract(durations)
+                remove_buckets(stats.duration_buckets, buckets)
+            stats.duration_count -= count
+
+            queue = self._max_queues[test_name]
+            if queue and queue[0][0] == evicted_run:
+                queue.popleft()
+            if stats.last_failed_run == evicted_run:
+                stats.last_failed_run = -1
+
+            # The test now first appears in the next run of the window that has
+            # it. Each scan skips runs that came between two runs of the test,
+            # so scans cost O(1) per test and run over time.
+            for run_index, later_delta in enumerate(self._deltas, self.first_run):
+                entry = later_delta.get(test_name)
+                if entry is not None:
+                    self._first_seen[test_name] = (run_index, entry[0])
+                    first_duration = entry[6]
+                    break
+            stats.duration_max = first_duration if first_duration != first_duration else queue[0][1]
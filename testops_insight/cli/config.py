@@ -2,17 +2,13 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
-try:
-    import yaml
-except ImportError:
-    yaml = None
-
 
 @dataclass
 class AnalysisConfig:
     flaky_threshold: float = 0.3
     slow_test_threshold_sec: float = 2.0
     last_n_runs: Optional[int] = None
+    jobs: int = 1
 
 
 @dataclass
@@ -21,23 +17,39 @@ class ReportConfig:
     suite_name: str = "Test Suite"
 
 
+@dataclass
+class CacheConfig:
+    enabled: bool = True
+    dir: str = "./.testops-cache"
+    max_size_mb: int = 512
+    verify_hash: bool = False
+
+
+@dataclass
+class HistoryConfig:
+    db_path: str = "./testops-history.db"
+
+
 @dataclass
 class Config:
     runs_path: str = "./test-results"
     analysis: AnalysisConfig = None
     report: ReportConfig = None
+    cache: CacheConfig = None
+    history: HistoryConfig = None
 
     def __post_init__(self):
         if self.analysis is None:
             self.analysis = AnalysisConfig()
         if self.report is None:
             self.report = ReportConfig()
+        if self.cache is None:
+            self.cache = CacheConfig()
+        if self.history is None:
+            self.history = HistoryConfig()
 
 
 def load_config(config_path: Optional[Path] = None) -> Optional[Config]:
-    if yaml is None:
-        return None
-
     if config_path is None:
         config_path = Path("testops.yaml")
         if not config_path.exists():
@@ -48,12 +60,20 @@ def load_config(config_path: Optional[Path] = None) -> Optional[Config]:
     if not config_path.exists():
         return None
 
+    # yaml is only needed, and only imported, when there is a file to read.
+    try:
+        import yaml
+    except ImportError:
+        return None
+
     try:
         with open(config_path, "r", encoding="utf-8") as f:
             data = yaml.safe_load(f) or {}
 
         analysis_data = data.get("analysis", {})
         report_data = data.get("report", {})
+        cache_data = data.get("cache", {})
+        history_data = data.get("history", {})
 
         return Config(
             runs_path=data.get("runs_path", "./test-results"),
@@ -61,11 +81,21 @@ def load_config(config_path: Optional[Path] = None) -> Optional[Config]:
                 flaky_threshold=analysis_data.get("flaky_threshold", 0.3),
                 slow_test_threshold_sec=analysis_data.get("slow_test_threshold_sec", 2.0),
                 last_n_runs=analysis_data.get("last_n_runs"),
+                jobs=analysis_data.get("jobs", 1),
             ),
             report=ReportConfig(
                 output_dir=report_data.get("output_dir", "./report"),
                 suite_name=report_data.get("suite_name", "Test Suite"),
             ),
+            cache=CacheConfig(
+                enabled=cache_data.get("enabled", True),
+                dir=cache_data.get("dir", "./.testops-cache"),
+                max_size_mb=cache_data.get("max_size_mb", 512),
+                verify_hash=cache_data.get("verify_hash", False),
+            ),
+            history=HistoryConfig(
+                db_path=history_data.get("db_path", "./testops-history.db"),
+            ),
         )
     except Exception:
         return None
@@ -1,35 +1,323 @@
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import repeat
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
-from testops_insight.ingestion import parse_junit_xml
+from testops_insight.analytics import SuiteAggregator
+from testops_insight.ingestion import ParseCache, parse_junit_xml, read_junit_timestamp
+from testops_insight.ingestion.sources import list_run_files
 from testops_insight.domain.models import TestRun
+from testops_insight.profiling import Profiler, Timing, measure_call, profile_stage
 
 
-def discover_test_runs(runs_path: Path, last_n: Optional[int] = None) -> list[tuple[Path, TestRun]]:
-    runs_path = Path(runs_path)
-    if not runs_path.exists():
-        return []
+def discover_test_runs(
+    runs_path: Path,
+    last_n: Optional[int] = None,
+    jobs: int = 1,
+    cache: Optional[ParseCache] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    profiler: Optional[Profiler] = None,
+) -> list[tuple[Path, TestRun]]:
+    with profile_stage(profiler, "discover"):
+        candidates = find_run_candidates(runs_path, cache=cache, since=since, until=until)
 
-    runs = []
+    with profile_stage(profiler, "parse"):
+        if last_n:
+            runs = []
+            end = len(candidates)
+            while end > 0 and len(runs) < last_n:
+                start = max(0, end - (last_n - len(runs)))
+                batch = parse_run_candidates(candidates[start:end], jobs, cache, profiler)
+                runs = [result for result in batch if result is not None] + runs
+                end = start
+        else:
+            runs = [
+                result
+                for result in parse_run_candidates(candidates, jobs, cache, profiler)
+                if result is not None
+            ]
 
-    for run_dir in sorted(runs_path.iterdir()):
-        if not run_dir.is_dir():
+        if cache is not None:
+            cache.flush()
+
+    return runs
+
+
+def find_run_candidates(
+    runs_path: Path,
+    cache: Optional[ParseCache] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> list[list[Path]]:
+    candidates = list_run_files(runs_path)
+
+    if since is not None or until is not None:
+        candidates = [
+            junit_files
+            for junit_files in candidates
+            if in_time_window(_read_run_timestamp(junit_files, cache), since, until)
+        ]
+
+    return candidates
+
+
+def parse_run_candidates(
+    candidates: list[list[Path]],
+    jobs: int = 1,
+    cache: Optional[ParseCache] = None,
+    profiler: Optional[Profiler] = None,
+) -> list[Optional[tuple[Path, TestRun]]]:
+    if jobs <= 1 or sum(len(junit_files) for junit_files in candidates) <= 1:
+        return [_parse_run_files(junit_files, cache, profiler) for junit_files in candidates]
+
+    results = [None] * len(candidates)
+    pending = []
+    for idx, junit_files in enumerate(candidates):
+        cached = _load_cached_run(junit_files, cache, profiler) if cache is not None else None
+        if cached is not None:
+            results[idx] = cached
+        else:
+            pending.append(idx)
+
+    # Shard files of all pending runs go to the pool as separate tasks, so a
+    # single run split into many shards is parsed concurrently as well.
+    pending_files = [xml_file for idx in pending for xml_file in candidates[idx]]
+    if pending_files:
+        chunksize = max(1, len(pending_files) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=min(jobs, len(pending_files))) as executor:
+            parsed = iter(
+                executor.map(
+                    _parse_file,
+                    pending_files,
+                    [cache] * len(pending_files),
+                    [profiler is not None] * len(pending_files),
+                    chunksize=chunksize,
+                )
+            )
+            for idx in pending:
+                junit_files = candidates[idx]
+                parsed_files = [next(parsed) for _ in junit_files]
+                _record_files(profiler, junit_files, parsed_files)
+                results[idx] = _merge_shards(junit_files, [test_run for test_run, _ in parsed_files])
+
+    return results
+
+
+def aggregate_run_candidates(
+    candidates: list[list[Path]],
+    jobs: int = 1,
+    cache: Optional[ParseCache] = None,
+    profiler: Optional[Profiler] = None,
+    describe: Optional[Callable[[TestRun], str]] = None,
+) -> tuple[SuiteAggregator, list[tuple[Path, Optional[str]]]]:
+    """Aggregate the runs of ``candidates`` that parse, one run at a time.
+
+    Returns the aggregator and, per aggregated run, its path and
+    ``describe(run)``. With ``jobs`` above 1 each worker process parses and
+    aggregates a contiguous slice of the candidates, and the partial
+    aggregates are merged in run order, which gives the same result as the
+    serial path. Only the partial aggregates travel back from the workers.
+    """
+    if jobs <= 1 or len(candidates) <= 1:
+        return _aggregate_candidates(candidates, cache, profiler, describe, SuiteAggregator())
+
+    # Several slices per worker keep the pool busy when runs differ in size.
+    slice_size = -(-len(candidates) // (jobs * 4))
+    slices = [candidates[start : start + slice_size] for start in range(0, len(candidates), slice_size)]
+
+    aggregator = SuiteAggregator()
+    parsed = []
+    with ProcessPoolExecutor(max_workers=min(jobs, len(slices))) as executor:
+        partials = executor.map(_aggregate_slice, slices, repeat(cache), repeat(profiler is not None), repeat(describe))
+        for partial, slice_parsed, files in partials:
+            aggregator.merge(partial)
+            parsed.extend(slice_parsed)
+            if profiler is not None:
+                profiler.files.extend(files)
+    return aggregator, parsed
+
+
+def _aggregate_slice(
+    candidates: list[list[Path]],
+    cache: Optional[ParseCache],
+    profile: bool,
+    describe: Optional[Callable[[TestRun], str]],
+) -> tuple[SuiteAggregator, list[tuple[Path, Optional[str]]], list[tuple[str, Timing, bool]]]:
+    # Runs in worker processes, so file timings travel back with the partial.
+    profiler = Profiler() if profile else None
+    partial, parsed = _aggregate_candidates(candidates, cache, profiler, describe, SuiteAggregator())
+    return partial, parsed, profiler.files if profiler is not None else []
+
+
+def _aggregate_candidates(
+    candidates: list[list[Path]],
+    cache: Optional[ParseCache],
+    profiler: Optional[Profiler],
+    describe: Optional[Callable[[TestRun], str]],
+    aggregator: SuiteAggregator,
+) -> tuple[SuiteAggregator, list[tuple[Path, Optional[str]]]]:
+    parsed = []
+    for junit_files in candidates:
+        result = _parse_run_files(junit_files, cache, profiler)
+        if result is None:
             continue
+        xml_path, test_run = result
+        aggregator.add_run(test_run)
+        parsed.append((xml_path, describe(test_run) if describe is not None else None))
+    return aggregator, parsed
 
-        junit_files = list(run_dir.glob("junit.xml"))
-        if not junit_files:
-            junit_files = list(run_dir.glob("*.xml"))
 
-        for xml_file in junit_files:
-            try:
-                test_run = parse_junit_xml(xml_file)
-                runs.append((xml_file, test_run))
+def stream_test_runs(
+    runs_path: Path,
+    last_n: Optional[int] = None,
+    jobs: int = 1,
+    cache: Optional[ParseCache] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    profiler: Optional[Profiler] = None,
+    describe: Optional[Callable[[TestRun], str]] = None,
+) -> tuple[SuiteAggregator, list[tuple[Path, Optional[str]]]]:
+    """Aggregate the runs ``discover_test_runs`` would return, one run at a time.
+
+    Each run is dropped once it has been added to the aggregator, so memory
+    grows with the number of distinct tests rather than with the history.
+    See ``aggregate_run_candidates`` for the result and for ``jobs``. With
+    ``last_n``, the newest ``last_n`` candidates are streamed; if some of them
+    cannot be parsed, the window is widened and streamed again.
+    """
+    with profile_stage(profiler, "discover"):
+        candidates = find_run_candidates(runs_path, cache=cache, since=since, until=until)
+
+    with profile_stage(profiler, "stream"):
+        start = max(0, len(candidates) - last_n) if last_n else 0
+        while True:
+            aggregator, parsed = aggregate_run_candidates(candidates[start:], jobs, cache, profiler, describe)
+            missing = last_n - aggregator.total_runs if last_n else 0
+            if missing <= 0 or start == 0:
                 break
-            except Exception:
-                continue
+            start = max(0, start - missing)
 
-    if last_n and len(runs) > last_n:
-        runs = runs[-last_n:]
+        if cache is not None:
+            cache.flush()
 
-    return runs
+    return aggregator, parsed
+
+
+def _read_run_timestamp(junit_files: list[Path], cache: Optional[ParseCache]) -> Optional[datetime]:
+    for xml_file in junit_files:
+        if cache is not None:
+            hit, timestamp = cache.load_timestamp(xml_file)
+            if hit:
+                return timestamp
+
+        try:
+            timestamp = read_junit_timestamp(xml_file)
+        except Exception:
+            continue
+
+        if cache is not None:
+            cache.store_timestamp(xml_file, timestamp)
+        return timestamp
+
+    return None
+
+
+def in_time_window(timestamp: Optional[datetime], since: Optional[datetime], until: Optional[datetime]) -> bool:
+    """Whether ``timestamp`` falls in ``[since, until)``; aware times are compared in local time."""
+    if timestamp is None:
+        return False
+
+    timestamp = _as_local_naive(timestamp)
+    if since is not None and timestamp < _as_local_naive(since):
+        return False
+    if until is not None and timestamp >= _as_local_naive(until):
+        return False
+    return True
+
+
+def _as_local_naive(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
+
+def _load_cached_run(
+    junit_files: list[Path], cache: ParseCache, profiler: Optional[Profiler] = None
+) -> Optional[tuple[Path, TestRun]]:
+    shard_runs = []
+    parsed_files = []
+    for xml_file in junit_files:
+        if profiler is None:
+            hit, test_run = cache.load(xml_file)
+        else:
+            (hit, test_run), timing = measure_call(cache.load, xml_file)
+            parsed_files.append((test_run, (timing, True)))
+        if not hit:
+            return None
+        shard_runs.append(test_run)
+
+    _record_files(profiler, junit_files, parsed_files)
+    return _merge_shards(junit_files, shard_runs)
+
+
+def _parse_run_files(
+    junit_files: list[Path], cache: Optional[ParseCache] = None, profiler: Optional[Profiler] = None
+) -> Optional[tuple[Path, TestRun]]:
+    parsed_files = [_parse_file(xml_file, cache, profiler is not None) for xml_file in junit_files]
+    _record_files(profiler, junit_files, parsed_files)
+    return _merge_shards(junit_files, [test_run for test_run, _ in parsed_files])
+
+
+def _parse_file(
+    xml_file: Path, cache: Optional[ParseCache] = None, profile: bool = False
+) -> tuple[Optional[TestRun], Optional[tuple[Timing, bool]]]:
+    # Runs in worker processes, so timings travel back with the result.
+    if not profile:
+        return _load_or_parse(xml_file, cache)[0], None
+
+    (test_run, cached), timing = measure_call(_load_or_parse, xml_file, cache)
+    return test_run, (timing, cached)
+
+
+def _load_or_parse(xml_file: Path, cache: Optional[ParseCache] = None) -> tuple[Optional[TestRun], bool]:
+    if cache is not None:
+        hit, test_run = cache.load(xml_file)
+        if hit:
+            return test_run, True
+
+    try:
+        test_run = parse_junit_xml(xml_file, streaming=True, lazy_messages=True)
+    except Exception:
+        test_run = None
+
+    if cache is not None:
+        cache.store(xml_file, test_run)
+
+    return test_run, False
+
+
+def _record_files(
+    profiler: Optional[Profiler],
+    junit_files: list[Path],
+    parsed_files: list[tuple[Optional[TestRun], Optional[tuple[Timing, bool]]]],
+) -> None:
+    if profiler is None:
+        return
+    for xml_file, (_, record) in zip(junit_files, parsed_files):
+        if record is not None:
+            timing, cached = record
+            profiler.add_file(str(xml_file), timing, cached)
+
+
+def _merge_shards(
+    junit_files: list[Path], shard_runs: list[Optional[TestRun]]
+) -> Optional[tuple[Path, TestRun]]:
+    parsed = [(xml_file, test_run) for xml_file, test_run in zip(junit_files, shard_runs) if test_run is not None]
+    if not parsed:
+        return None
+    if len(parsed) == 1:
+        return parsed[0]
 
+    return parsed[0][0], TestRun.from_shards([(xml_file.name, test_run) for xml_file, test_run in parsed])
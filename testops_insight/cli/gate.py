@@ -0,0 +1,62 @@
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from testops_insight.analytics.engine import health_score_from_runs
+from testops_insight.ingestion.junit_parser import read_junit_counts
+from testops_insight.ingestion.sources import list_run_files
+
+
+class GateRun(NamedTuple):
+    run_files: list
+    total_tests: int
+    passed: int
+    counted: bool
+
+
+class GateResult(NamedTuple):
+    health_score: float
+    runs: list[GateRun]
+
+    @property
+    def counted_runs(self) -> int:
+        return sum(1 for run in self.runs if run.counted)
+
+
+def compute_gate_health(runs_path: Path, last_n: Optional[int] = None) -> GateResult:
+    """Health score of the runs under ``runs_path`` from JUnit header counts only.
+
+    Runs are read from the newest backwards until ``last_n`` readable runs are
+    found. Shard files of a run are summed and unreadable files are skipped, as
+    in ``analyze``.
+    """
+    runs = []
+    for run_files in reversed(list_run_files(runs_path)):
+        if last_n and len(runs) >= last_n:
+            break
+        run = _read_run_counts(run_files)
+        if run is not None:
+            runs.append(run)
+    runs.reverse()
+
+    return GateResult(health_score=health_score_from_runs(runs), runs=runs)
+
+
+def _read_run_counts(run_files: list) -> Optional[GateRun]:
+    total_tests = 0
+    passed = 0
+    counted = False
+    readable = False
+
+    for junit_file in run_files:
+        try:
+            counts = read_junit_counts(junit_file)
+        except Exception:
+            continue
+        readable = True
+        total_tests += counts.total_tests
+        passed += counts.passed
+        counted = counted or counts.counted
+
+    if not readable:
+        return None
+    return GateRun(run_files=run_files, total_tests=total_tests, passed=passed, counted=counted)
@@ -0,0 +1,110 @@
+import hashlib
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+
+from testops_insight.cli.discovery import in_time_window, parse_run_candidates
+from testops_insight.domain.models import TestRun
+from testops_insight.ingestion import ParseCache
+from testops_insight.ingestion.sources import open_raw, source_key, source_stat
+from testops_insight.storage import ColumnarHistory, HistoryAggregator, HistoryDatabase
+
+# Runs parsed per batch before they are written, which bounds the memory held
+# by an ingest of a large folder.
+INGEST_BATCH_RUNS = 64
+
+
+def run_key(junit_files: list) -> str:
+    """Key of a run in the history database: a digest of its files' stored bytes.
+
+    Content rather than paths identifies a run, so the same results ingested
+    twice, from different checkouts or CI jobs, are stored once.
+    """
+    digest = hashlib.sha256()
+    for junit_file in junit_files:
+        with open_raw(junit_file) as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def source_fingerprint(junit_files: list) -> str:
+    """Digest of the paths, sizes and modification times of a run's files.
+
+    Recorded for every stored run, so a later ingest skips files it has seen
+    unchanged without reading them, like the parse cache does.
+    """
+    digest = hashlib.sha256()
+    for junit_file in junit_files:
+        stat = source_stat(junit_file)
+        digest.update(f"{source_key(junit_file)}\0{stat.st_size}\0{stat.st_mtime_ns}\0".encode())
+    return digest.hexdigest()
+
+
+def pending_ingest(
+    db: HistoryDatabase | ColumnarHistory, candidates: list[list[Path]]
+) -> list[tuple[list[Path], str, str]]:
+    """The candidates not stored yet, with their run keys and source fingerprints, in run order.
+
+    Only candidates whose fingerprint is not recorded are hashed. A candidate
+    whose content is stored under other paths gets its fingerprint recorded.
+    """
+    known = db.known_sources()
+    pending = []
+    seen = []
+    for junit_files in candidates:
+        try:
+            fingerprint = source_fingerprint(junit_files)
+            if fingerprint in known:
+                continue
+            key = run_key(junit_files)
+        except OSError:
+            continue
+        if db.has_run(key):
+            seen.append(fingerprint)
+        else:
+            pending.append((junit_files, key, fingerprint))
+    db.add_sources(seen)
+    return pending
+
+
+def ingest_runs(
+    db: HistoryDatabase | ColumnarHistory,
+    pending: list[tuple[list[Path], str, str]],
+    jobs: int = 1,
+    cache: Optional[ParseCache] = None,
+) -> Iterator[tuple[Path, TestRun]]:
+    """Parse and store ``pending`` runs, yielding each run that was added.
+
+    Every run is committed on its own, so an interrupted ingest keeps the runs
+    stored so far and a run another process stored meanwhile is skipped.
+    """
+    for start in range(0, len(pending), INGEST_BATCH_RUNS):
+        batch = pending[start : start + INGEST_BATCH_RUNS]
+        results = parse_run_candidates([junit_files for junit_files, _, _ in batch], jobs, cache)
+        stored = []
+        for (_, key, fingerprint), result in zip(batch, results):
+            if result is None:
+                continue
+            xml_path, test_run = result
+            added = db.add_run(key, str(xml_path), test_run)
+            stored.append(fingerprint)
+            if added:
+                yield xml_path, test_run
+        db.add_sources(stored)
+
+
+def load_history_aggregator(
+    db: HistoryDatabase,
+    last_n: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> HistoryAggregator:
+    """Aggregator over the stored runs, in ingest order, filtered as ``analyze`` filters folders."""
+    runs = db.runs()
+    if since is not None or until is not None:
+        runs = [(run_id, summary) for run_id, summary in runs if in_time_window(summary.timestamp, since, until)]
+    if last_n:
+        runs = runs[-last_n:]
+    return db.aggregator(runs)
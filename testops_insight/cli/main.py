@@ -1,11 +1,12 @@
 import argparse
+import re
 import sys
+from datetime import datetime, timedelta
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from testops_insight.cli.config import load_config
-from testops_insight.cli.discovery import discover_test_runs
-from testops_insight.domain.models import TestSuite
-from testops_insight.reporting import generate_report
+if TYPE_CHECKING:
+    from testops_insight.domain.models import TestRun
 
 
 def main() -> None:
@@ -48,8 +49,132 @@ def main() -> None:
         help="Analyze only the most recent N runs",
     )
     analyze_parser.add_argument(
+        "--since",
+        type=str,
+        help="Analyze only runs with a timestamp at or after this time (ISO date/time or age such as 7d, 12h)",
+    )
+    analyze_parser.add_argument(
+        "--until",
+        type=str,
+        help="Analyze only runs with a timestamp before this time (ISO date/time or age such as 1d)",
+    )
+    analyze_parser.add_argument(
+        "--jobs",
+        type=int,
+        help="Number of worker processes used to parse run files (default: 1 or from config)",
+    )
+    analyze_parser.add_argument(
+        "--cache-dir",
+        type=str,
+        help="Directory for the parsed run cache (default: ./.testops-cache or from config)",
+    )
+    analyze_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Parse every run file without reading or writing the parse cache",
+    )
+    analyze_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Fold only runs not seen before into the saved analytics state",
+    )
+    analyze_parser.add_argument(
+        "--state",
+        type=str,
+        help="Path to the incremental analytics state file (default: <out>/analytics-state.json)",
+    )
+    analyze_parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Record wall time, CPU time and peak memory per stage and per parsed file in metrics.json",
+    )
+    analyze_parser.add_argument(
+        "--profile-dir",
+        type=str,
+        help="Also write a cProfile dump per stage to this directory (implies --profile)",
+    )
+    analyze_parser.add_argument(
+        "--db",
+        type=str,
+        help="Analyze the runs stored by 'ingest' in this history database instead of --runs-path",
+    )
+    analyze_parser.add_argument(
+        "--columnar",
+        type=str,
+        help="Analyze the runs stored by 'ingest --columnar' in this columnar history instead of --runs-path",
+    )
+    analyze_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Aggregate each run as soon as it is parsed instead of loading every run first; "
+        "memory grows with the number of tests, not runs",
+    )
+    analyze_parser.add_argument(
+        "--fail-under-health",
+        type=float,
+        help="Exit with non-zero code if health score is below this threshold",
+    )
+
+    ingest_parser = subparsers.add_parser("ingest", help="Add new test runs to the SQLite history database")
+    ingest_parser.add_argument(
+        "--runs-path",
+        type=str,
+        help="Path to directory containing test run folders (default: ./test-results or from config)",
+    )
+    ingest_parser.add_argument(
+        "--db",
+        type=str,
+        help="History database to append to (default: ./testops-history.db or from config)",
+    )
+    ingest_parser.add_argument(
+        "--columnar",
+        type=str,
+        help="Append to this memory-mapped columnar history directory instead of the database",
+    )
+    ingest_parser.add_argument(
+        "--config",
+        type=str,
+        help="Path to config file (default: testops.yaml or testops.yml in current directory)",
+    )
+    ingest_parser.add_argument(
+        "--jobs",
+        type=int,
+        help="Number of worker processes used to parse run files (default: 1 or from config)",
+    )
+    ingest_parser.add_argument(
+        "--cache-dir",
+        type=str,
+        help="Directory for the parsed run cache (default: ./.testops-cache or from config)",
+    )
+    ingest_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Parse every run file without reading or writing the parse cache",
+    )
+
+    gate_parser = subparsers.add_parser(
+        "gate",
+        help="Check the health score from JUnit header counts without building a report",
+    )
+    gate_parser.add_argument(
+        "--runs-path",
+        type=str,
+        help="Path to directory containing test run folders (default: ./test-results or from config)",
+    )
+    gate_parser.add_argument(
+        "--config",
+        type=str,
+        help="Path to config file (default: testops.yaml or testops.yml in current directory)",
+    )
+    gate_parser.add_argument(
+        "--last",
+        type=int,
+        help="Use only the most recent N runs",
+    )
+    gate_parser.add_argument(
         "--fail-under-health",
         type=float,
+        required=True,
         help="Exit with non-zero code if health score is below this threshold",
     )
 
@@ -61,12 +186,18 @@ def main() -> None:
 
     if args.command == "analyze":
         run_analyze(args)
+    elif args.command == "ingest":
+        run_ingest(args)
+    elif args.command == "gate":
+        run_gate(args)
     else:
         parser.print_help()
         sys.exit(1)
 
 
 def run_analyze(args: argparse.Namespace) -> None:
+    from testops_insight.cli.config import CacheConfig, load_config
+
     config = None
     if args.config:
         config = load_config(Path(args.config))
@@ -77,28 +208,156 @@ def run_analyze(args: argparse.Namespace) -> None:
     output_dir = args.out or (config.report.output_dir if config else "./report")
     suite_name = args.name or (config.report.suite_name if config else "Test Suite")
     last_n = args.last or (config.analysis.last_n_runs if config else None)
+    jobs = args.jobs if args.jobs is not None else (config.analysis.jobs if config else 1)
+    cache_config = config.cache if config else CacheConfig()
 
     runs_path = Path(runs_path)
-    if not runs_path.exists():
+    history_path = args.db or args.columnar
+    if args.db and args.columnar:
+        print("Error: --db cannot be combined with --columnar")
+        sys.exit(1)
+    if args.stream and (history_path or args.incremental):
+        option = "--db" if args.db else "--columnar" if args.columnar else "--incremental"
+        print(f"Error: --stream cannot be combined with {option}")
+        sys.exit(1)
+    if history_path:
+        if not Path(history_path).exists():
+            kind = "History database" if args.db else "Columnar history"
+            print(f"Error: {kind} does not exist: {history_path}")
+            sys.exit(1)
+        if args.incremental:
+            print(f"Error: --incremental cannot be combined with {'--db' if args.db else '--columnar'}")
+            sys.exit(1)
+        if args.columnar and (args.since or args.until):
+            print("Error: --since and --until cannot be combined with --columnar")
+            sys.exit(1)
+    elif not runs_path.exists():
         print(f"Error: Runs path does not exist: {runs_path}")
         sys.exit(1)
 
-    discovered_runs = discover_test_runs(runs_path, last_n)
-    if not discovered_runs:
-        print(f"Error: No test runs found in {runs_path}")
+    if jobs < 1:
+        print(f"Error: --jobs must be at least 1, got {jobs}")
+        sys.exit(1)
+
+    try:
+        since = _parse_time_bound(args.since) if args.since else None
+        until = _parse_time_bound(args.until) if args.until else None
+    except ValueError as e:
+        print(f"Error: {e}")
         sys.exit(1)
 
-    test_runs = [test_run for _, test_run in discovered_runs]
+    # Imported only once the arguments are valid, so that --help, --version,
+    # bad arguments and the gate command do not load the parser, analytics
+    # and report generator.
+    from testops_insight.cli.discovery import discover_test_runs, find_run_candidates, stream_test_runs
+    from testops_insight.cli.state import update_analytics_state
+    from testops_insight.domain.models import TestSuite
+    from testops_insight.ingestion.cache import ParseCache
+    from testops_insight.profiling import Profiler, profile_stage
+    from testops_insight.reporting import generate_aggregate_report, generate_report
 
-    for xml_path, test_run in discovered_runs:
-        print(f"Parsed: {xml_path} ({test_run.total_tests} tests)")
+    profiler = None
+    if args.profile or args.profile_dir:
+        profiler = Profiler(cprofile_dir=args.profile_dir)
 
-    test_suite = TestSuite(name=suite_name, test_runs=test_runs)
+    cache = None
+    if cache_config.enabled and not args.no_cache:
+        cache = ParseCache(
+            args.cache_dir or cache_config.dir,
+            max_size_bytes=cache_config.max_size_mb * 1024 * 1024,
+            verify_hash=cache_config.verify_hash,
+        )
 
     output_dir = Path(output_dir)
-    metrics = generate_report(test_suite, output_dir)
+
+    if args.db:
+        from testops_insight.cli.history import load_history_aggregator
+        from testops_insight.storage import HistoryDatabase
+
+        with HistoryDatabase(args.db) as db:
+            with profile_stage(profiler, "load_history"):
+                aggregator = load_history_aggregator(db, last_n, since, until)
+            if aggregator.total_runs == 0:
+                print(f"Error: No test runs found in {args.db}")
+                sys.exit(1)
+
+            print(f"Loaded {aggregator.total_runs} run{'' if aggregator.total_runs == 1 else 's'} from {args.db}")
+            metrics = generate_aggregate_report(aggregator, suite_name, output_dir, profiler)
+    elif args.columnar:
+        from testops_insight.analytics.vectorized import ColumnarAggregator
+        from testops_insight.storage import ColumnarHistory
+
+        with profile_stage(profiler, "load_history"):
+            history = ColumnarHistory(args.columnar)
+            start = max(0, history.total_runs - last_n) if last_n else 0
+            aggregator = ColumnarAggregator(history.suite(suite_name, start=start))
+        if aggregator.total_runs == 0:
+            print(f"Error: No test runs found in {args.columnar}")
+            sys.exit(1)
+
+        print(f"Loaded {aggregator.total_runs} run{'' if aggregator.total_runs == 1 else 's'} from {args.columnar}")
+        metrics = generate_aggregate_report(aggregator, suite_name, output_dir, profiler)
+    elif args.incremental:
+        state_path = Path(args.state) if args.state else output_dir / "analytics-state.json"
+        with profile_stage(profiler, "discover"):
+            candidates = find_run_candidates(runs_path, cache=cache, since=since, until=until)
+        aggregator, new_runs = update_analytics_state(
+            state_path, candidates, jobs=jobs, cache=cache, window=last_n, profiler=profiler
+        )
+        if cache is not None:
+            cache.flush()
+
+        if aggregator.total_runs == 0:
+            print(f"Error: No test runs found in {runs_path}")
+            sys.exit(1)
+
+        for xml_path, test_run in new_runs:
+            print(f"Parsed: {xml_path} ({_describe_run(test_run)})")
+        print(f"Folded {len(new_runs)} new run{'' if len(new_runs) == 1 else 's'} into {state_path}")
+
+        metrics = generate_aggregate_report(aggregator, suite_name, output_dir, profiler)
+    elif args.stream:
+        aggregator, parsed_runs = stream_test_runs(
+            runs_path,
+            last_n,
+            jobs=jobs,
+            cache=cache,
+            since=since,
+            until=until,
+            profiler=profiler,
+            describe=_describe_run,
+        )
+        if aggregator.total_runs == 0:
+            print(f"Error: No test runs found in {runs_path}")
+            sys.exit(1)
+
+        for xml_path, description in parsed_runs:
+            print(f"Parsed: {xml_path} ({description})")
+
+        metrics = generate_aggregate_report(aggregator, suite_name, output_dir, profiler)
+    else:
+        discovered_runs = discover_test_runs(
+            runs_path, last_n, jobs=jobs, cache=cache, since=since, until=until, profiler=profiler
+        )
+        if not discovered_runs:
+            print(f"Error: No test runs found in {runs_path}")
+            sys.exit(1)
+
+        test_runs = [test_run for _, test_run in discovered_runs]
+
+        for xml_path, test_run in discovered_runs:
+            print(f"Parsed: {xml_path} ({_describe_run(test_run)})")
+
+        test_suite = TestSuite(name=suite_name, test_runs=test_runs)
+        metrics = generate_report(test_suite, output_dir, profiler)
+
     print(f"Report generated: {output_dir.absolute()}")
 
+    if profiler is not None:
+        print(f"{'stage':<30} {'wall s':>8} {'cpu s':>8} {'peak MB':>9}")
+        for name, timing in profiler.stages:
+            print(f"{name:<30} {timing.wall_s:>8.3f} {timing.cpu_s:>8.3f} {timing.peak_bytes / 1e6:>9.1f}")
+
     if args.fail_under_health is not None:
         health_score = metrics["health_score"]
         if health_score < args.fail_under_health:
@@ -108,5 +367,109 @@ def run_analyze(args: argparse.Namespace) -> None:
     sys.exit(0)
 
 
+def run_ingest(args: argparse.Namespace) -> None:
+    from testops_insight.cli.config import CacheConfig, load_config
+
+    config = load_config(Path(args.config)) if args.config else load_config()
+
+    runs_path = Path(args.runs_path or (config.runs_path if config else "./test-results"))
+    db_path = Path(args.db or (config.history.db_path if config else "./testops-history.db"))
+    if args.columnar:
+        if args.db:
+            print("Error: --db cannot be combined with --columnar")
+            sys.exit(1)
+        db_path = Path(args.columnar)
+    jobs = args.jobs if args.jobs is not None else (config.analysis.jobs if config else 1)
+    cache_config = config.cache if config else CacheConfig()
+
+    if not runs_path.exists():
+        print(f"Error: Runs path does not exist: {runs_path}")
+        sys.exit(1)
+
+    if jobs < 1:
+        print(f"Error: --jobs must be at least 1, got {jobs}")
+        sys.exit(1)
+
+    from testops_insight.cli.discovery import find_run_candidates
+    from testops_insight.cli.history import ingest_runs, pending_ingest
+    from testops_insight.ingestion.cache import ParseCache
+    from testops_insight.storage import ColumnarHistory, HistoryDatabase
+
+    cache = None
+    if cache_config.enabled and not args.no_cache:
+        cache = ParseCache(
+            args.cache_dir or cache_config.dir,
+            max_size_bytes=cache_config.max_size_mb * 1024 * 1024,
+            verify_hash=cache_config.verify_hash,
+        )
+
+    candidates = find_run_candidates(runs_path, cache=cache)
+    store = ColumnarHistory if args.columnar else HistoryDatabase
+    with store(db_path) as db:
+        pending = pending_ingest(db, candidates)
+        ingested = 0
+        for xml_path, test_run in ingest_runs(db, pending, jobs=jobs, cache=cache):
+            print(f"Ingested: {xml_path} ({_describe_run(test_run)})")
+            ingested += 1
+    if cache is not None:
+        cache.flush()
+
+    known = len(candidates) - len(pending)
+    print(f"Added {ingested} run{'' if ingested == 1 else 's'} to {db_path} ({known} already stored)")
+    sys.exit(0)
+
+
+def run_gate(args: argparse.Namespace) -> None:
+    from testops_insight.cli.config import load_config
+    from testops_insight.cli.gate import compute_gate_health
+
+    config = load_config(Path(args.config)) if args.config else load_config()
+
+    runs_path = Path(args.runs_path or (config.runs_path if config else "./test-results"))
+    last_n = args.last or (config.analysis.last_n_runs if config else None)
+
+    if not runs_path.exists():
+        print(f"Error: Runs path does not exist: {runs_path}")
+        sys.exit(1)
+
+    result = compute_gate_health(runs_path, last_n)
+    if not result.runs:
+        print(f"Error: No test runs found in {runs_path}")
+        sys.exit(1)
+
+    counted = f", {result.counted_runs} counted without header totals" if result.counted_runs else ""
+    print(f"Health score: {result.health_score:.1f} ({len(result.runs)} runs{counted})")
+
+    if result.health_score < args.fail_under_health:
+        print(f"Health score {result.health_score:.1f} is below threshold {args.fail_under_health}")
+        sys.exit(1)
+
+    sys.exit(0)
+
+
+def _describe_run(test_run: "TestRun") -> str:
+    description = f"{test_run.total_tests} tests"
+    slowest_shard = test_run.slowest_shard
+    if slowest_shard is not None and len(test_run.shards) > 1:
+        description += (
+            f", {len(test_run.shards)} shards, spread {test_run.shard_spread:.1f}s, "
+            f"slowest {slowest_shard.file} {slowest_shard.duration:.1f}s"
+        )
+    return description
+
+
+def _parse_time_bound(value: str) -> datetime:
+    match = re.fullmatch(r"(\d+)([mhdw])", value.strip())
+    if match:
+        amount = int(match.group(1))
+        unit = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks"}[match.group(2)]
+        return datetime.now() - timedelta(**{unit: amount})
+
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"Invalid time value: {value} (expected ISO date/time or age such as 7d)")
+
+
 if __name__ == "__main__":
     main()
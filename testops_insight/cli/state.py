@@ -0,0 +1,126 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional, Union
+
+from testops_insight.analytics import SuiteAggregator, SuiteAnalytics, WindowedAggregator
+from testops_insight.cli.discovery import parse_run_candidates
+from testops_insight.domain.models import TestRun
+from testops_insight.ingestion import ParseCache
+from testops_insight.ingestion.sources import source_stat
+from testops_insight.profiling import Profiler, profile_stage
+
+STATE_FORMAT_VERSION = 6
+
+
+class AnalyticsState:
+    def __init__(
+        self,
+        aggregator: Optional[Union[SuiteAggregator, WindowedAggregator]] = None,
+        run_keys: Optional[list] = None,
+    ):
+        self.aggregator = aggregator if aggregator is not None else SuiteAggregator()
+        self.run_keys = run_keys if run_keys is not None else []
+
+    @classmethod
+    def create(cls, window: Optional[int] = None) -> "AnalyticsState":
+        return cls(WindowedAggregator(window) if window else SuiteAggregator())
+
+    @classmethod
+    def load(cls, state_path: Path, window: Optional[int] = None) -> "AnalyticsState":
+        try:
+            with open(state_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            aggregate = data["aggregate"]
+            if data.get("version") != STATE_FORMAT_VERSION or aggregate.get("window") != window:
+                return cls.create(window)
+            if window:
+                return cls(WindowedAggregator.from_dict(aggregate), data["runs"])
+            return cls(SuiteAggregator.from_dict(aggregate), data["runs"])
+        except Exception:
+            return cls.create(window)
+
+    def save(self, state_path: Path) -> None:
+        state_path = Path(state_path)
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": STATE_FORMAT_VERSION,
+            "runs": self.run_keys,
+            "aggregate": self.aggregator.to_dict(),
+        }
+
+        fd, tmp_path = tempfile.mkstemp(dir=state_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, state_path)
+        except OSError:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def pending_candidates(self, candidates: list[list[Path]]) -> Optional[list[list[Path]]]:
+        known = len(self.run_keys)
+        if known > len(candidates):
+            return None
+
+        for run_key, junit_files in zip(self.run_keys, candidates):
+            if run_key != run_fingerprint(junit_files):
+                return None
+
+        return candidates[known:]
+
+    def fold(self, candidates: list[list[Path]], results: list[Optional[tuple[Path, TestRun]]]) -> None:
+        for junit_files, result in zip(candidates, results):
+            self.run_keys.append(run_fingerprint(junit_files))
+            if result is not None:
+                self.aggregator.add_run(result[1])
+
+
+def run_fingerprint(junit_files: list[Path]) -> list:
+    fingerprint = []
+    for xml_file in junit_files:
+        try:
+            stat = source_stat(xml_file)
+            fingerprint.append([str(xml_file), stat.st_size, stat.st_mtime_ns])
+        except OSError:
+            fingerprint.append([str(xml_file), None, None])
+    return fingerprint
+
+
+def update_analytics_state(
+    state_path: Path,
+    candidates: list[list[Path]],
+    jobs: int = 1,
+    cache: Optional[ParseCache] = None,
+    window: Optional[int] = None,
+    profiler: Optional[Profiler] = None,
+) -> tuple[SuiteAnalytics, list[tuple[Path, TestRun]]]:
+    with profile_stage(profiler, "load_state"):
+        state = AnalyticsState.load(state_path, window)
+        pending = state.pending_candidates(candidates)
+        if pending is None:
+            state = AnalyticsState.create(window)
+            pending = candidates
+
+    with profile_stage(profiler, "parse"):
+        if window and len(pending) > window:
+            results = [None] * len(pending)
+            parsed = 0
+            end = len(pending)
+            while end > 0 and parsed < window:
+                start = max(0, end - (window - parsed))
+                batch = parse_run_candidates(pending[start:end], jobs, cache, profiler)
+                results[start:end] = batch
+                parsed += sum(1 for result in batch if result is not None)
+                end = start
+        else:
+            results = parse_run_candidates(pending, jobs, cache, profiler)
+
+    with profile_stage(profiler, "aggregate"):
+        state.fold(pending, results)
+
+    with profile_stage(profiler, "save_state"):
+        state.save(state_path)
+
+    return state.aggregator, [result for result in results if result is not None]
@@ -1,4 +1,34 @@
-from .models import TestCase, TestRun, TestSuite
+from .models import (
+    HistoryEntry,
+    ShardSummary,
+    TestCase,
+    TestHistory,
+    TestIdentity,
+    TestRun,
+    TestStatus,
+    TestSuite,
+    intern_test_identity,
+)
 
-__all__ = ["TestCase", "TestRun", "TestSuite"]
+__all__ = [
+    "ColumnarSuite",
+    "HistoryEntry",
+    "ShardSummary",
+    "TestCase",
+    "TestHistory",
+    "TestIdentity",
+    "TestRun",
+    "TestStatus",
+    "TestSuite",
+    "intern_test_identity",
+]
 
+
+def __getattr__(name: str):
+    # The columnar module imports numpy when it is installed, so it is only
+    # loaded when ColumnarSuite is actually used.
+    if name == "ColumnarSuite":
+        from .columnar import ColumnarSuite
+
+        return ColumnarSuite
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,95 @@
+from array import array
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from testops_insight.domain.models import STATUS_CODES, TestStatus, TestSuite
+
+STATUS_PASSED = STATUS_CODES[TestStatus.PASSED]
+STATUS_FAILED = STATUS_CODES[TestStatus.FAILED]
+STATUS_SKIPPED = STATUS_CODES[TestStatus.SKIPPED]
+STATUS_ERROR = STATUS_CODES[TestStatus.ERROR]
+
+
+@dataclass
+class ColumnarSuite:
+    name: str
+    test_names: list[str]
+    test_ids: Any
+    run_ids: Any
+    statuses: Any
+    durations: Any
+    run_timestamps: list[Optional[datetime]]
+    run_total_tests: Any
+    run_passed: Any
+    run_failed: Any
+    run_skipped: Any
+    run_errors: Any
+    run_durations: Any
+    # Global id of the first run when the columns hold a slice of a longer
+    # history; run_ids are not rebased.
+    first_run: int = 0
+    run_shard_counts: Optional[list[int]] = None
+    run_shard_spreads: Optional[list[float]] = None
+    run_slowest_shards: Optional[list[Optional[str]]] = None
+
+    @property
+    def total_runs(self) -> int:
+        return len(self.run_timestamps)
+
+    @property
+    def total_results(self) -> int:
+        return len(self.test_ids)
+
+    @classmethod
+    def from_test_suite(cls, test_suite: TestSuite) -> "ColumnarSuite":
+        test_index = {}
+        test_names = []
+        test_ids = array("i")
+        run_ids = array("i")
+        statuses = array("b")
+        durations = array("d")
+
+        for run_id, test_run in enumerate(test_suite.test_runs):
+            for test_case in test_run.test_cases:
+                full_name = test_case.full_name
+                test_id = test_index.get(full_name)
+                if test_id is None:
+                    test_id = len(test_names)
+                    test_index[full_name] = test_id
+                    test_names.append(full_name)
+                test_ids.append(test_id)
+                run_ids.append(run_id)
+                statuses.append(test_case.status_code)
+                durations.append(test_case.duration)
+
+        runs = test_suite.test_runs
+        return cls(
+            name=test_suite.name,
+            test_names=test_names,
+            test_ids=_column(test_ids),
+            run_ids=_column(run_ids),
+            statuses=_column(statuses),
+            durations=_column(durations),
+            run_timestamps=[run.timestamp for run in runs],
+            run_total_tests=_column(array("q", [run.total_tests for run in runs])),
+            run_passed=_column(array("q", [run.passed for run in runs])),
+            run_failed=_column(array("q", [run.failed for run in runs])),
+            run_skipped=_column(array("q", [run.skipped for run in runs])),
+            run_errors=_column(array("q", [run.errors for run in runs])),
+            run_durations=_column(array("d", [run.duration for run in runs])),
+            run_shard_counts=[len(run.shards) for run in runs],
+            run_shard_spreads=[run.shard_spread for run in runs],
+            run_slowest_shards=[run.slowest_shard.file if run.slowest_shard is not None else None for run in runs],
+        )
+
+
+def _column(values: array) -> Any:
+    if np is None:
+        return values
+    return np.array(values)
@@ -1,7 +1,11 @@
-from dataclasses import dataclass
+import sys
+import weakref
+from array import array
+from collections.abc import KeysView, Sequence
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Any, NamedTuple, Optional
 
 
 class TestStatus(Enum):
@@ -11,18 +15,111 @@ class TestStatus(Enum):
     ERROR = "error"
 
 
-@dataclass
-class TestCase:
+STATUS_BY_CODE = tuple(TestStatus)
+STATUS_CODES = {status: code for code, status in enumerate(STATUS_BY_CODE)}
+
+
+class TestIdentity:
+    __slots__ = ("classname", "name", "full_name", "__weakref__")
+
+    def __init__(self, classname: str, name: str):
+        self.classname = classname
+        self.name = name
+        self.full_name = f"{classname}.{name}"
+
+    def __repr__(self) -> str:
+        return f"TestIdentity({self.full_name!r})"
+
+
+_identities: "weakref.WeakValueDictionary[tuple[str, str], TestIdentity]" = weakref.WeakValueDictionary()
+
+
+def intern_test_identity(classname: str, name: str) -> TestIdentity:
+    key = (classname, name)
+    identity = _identities.get(key)
+    if identity is None:
+        identity = TestIdentity(sys.intern(classname), sys.intern(name))
+        _identities[key] = identity
+    return identity
+
+
+class _TestCaseCache:
+    __slots__ = ("_identity", "_status_code")
+
+
+@dataclass(slots=True)
+class TestCase(_TestCaseCache):
     name: str
     classname: str
     status: TestStatus
     duration: float
+    # Parsers may store a lazy reference (anything with ``load()``) instead of
+    # the text. The first access loads it and keeps the text in its place; if
+    # the file changed or went away since parsing, that access raises the
+    # reference's OSError or ValueError instead.
     message: Optional[str] = None
     failure_type: Optional[str] = None
 
+    def __post_init__(self):
+        identity = self._identity = intern_test_identity(self.classname, self.name)
+        self.name = identity.name
+        self.classname = identity.classname
+        self._status_code = STATUS_CODES[self.status]
+        if self.failure_type is not None:
+            self.failure_type = sys.intern(self.failure_type)
+
+    @property
+    def identity(self) -> TestIdentity:
+        """The interned identity of ``classname`` and ``name``, kept up to date when either is assigned."""
+        identity = self._identity
+        if identity.name is not self.name or identity.classname is not self.classname:
+            identity = self._identity = intern_test_identity(self.classname, self.name)
+            self.name = identity.name
+            self.classname = identity.classname
+        return identity
+
+    @property
+    def status_code(self) -> int:
+        """Index of ``status`` in STATUS_BY_CODE."""
+        code = self._status_code
+        if STATUS_BY_CODE[code] is not self.status:
+            code = self._status_code = STATUS_CODES[self.status]
+        return code
+
     @property
     def full_name(self) -> str:
-        return f"{self.classname}.{self.name}"
+        return self.identity.full_name
+
+    @property
+    def stored_message(self) -> Optional[Any]:
+        """The message as stored: a string, None, or an unloaded lazy reference."""
+        return _message_slot.__get__(self)
+
+    def __reduce__(self):
+        return (
+            self.__class__,
+            (self.name, self.classname, self.status, self.duration, self.stored_message, self.failure_type),
+        )
+
+
+def _load_message(test_case: TestCase) -> Optional[str]:
+    message = _message_slot.__get__(test_case)
+    if message is None or message.__class__ is str:
+        return message
+    text = message.load()
+    _message_slot.__set__(test_case, text)
+    return text
+
+
+# ``message`` keeps its slot as storage behind a property that loads lazy references.
+_message_slot = TestCase.__dict__["message"]
+TestCase.message = property(_load_message, _message_slot.__set__)
+
+
+class ShardSummary(NamedTuple):
+    file: str
+    total_tests: int
+    duration: float
 
 
 @dataclass
@@ -35,6 +132,7 @@ class TestRun:
     skipped: int
     errors: int
     duration: float
+    shards: list[ShardSummary] = field(default_factory=list)
 
     @classmethod
     def from_test_cases(cls, test_cases: list[TestCase], timestamp: Optional[datetime] = None) -> "TestRun":
@@ -58,12 +156,91 @@ class TestRun:
             duration=duration,
         )
 
+    @classmethod
+    def from_shards(cls, shard_runs: list[tuple[str, "TestRun"]]) -> "TestRun":
+        """Merge the runs parsed from one run's shard files, in the given order.
+
+        The merged run takes the first shard's timestamp, which is also the one
+        used to place the run in a time window.
+        """
+        test_cases = []
+        for _, shard_run in shard_runs:
+            test_cases.extend(shard_run.test_cases)
+
+        test_run = cls.from_test_cases(test_cases, shard_runs[0][1].timestamp)
+        test_run.shards = [
+            ShardSummary(file=file, total_tests=shard_run.total_tests, duration=shard_run.duration)
+            for file, shard_run in shard_runs
+        ]
+        return test_run
+
+    @property
+    def slowest_shard(self) -> Optional[ShardSummary]:
+        if not self.shards:
+            return None
+        return max(self.shards, key=lambda shard: shard.duration)
+
+    @property
+    def shard_spread(self) -> float:
+        """Seconds between the fastest and the slowest shard."""
+        if not self.shards:
+            return 0.0
+        durations = [shard.duration for shard in self.shards]
+        return max(durations) - min(durations)
+
+
+class HistoryEntry(NamedTuple):
+    run_index: int
+    status: TestStatus
+    duration: float
+
+
+class TestHistory(Sequence):
+    """Per-run results of one test in run order, stored as compact arrays."""
+
+    __slots__ = ("full_name", "run_indices", "status_codes", "durations")
+
+    def __init__(self, full_name: str):
+        self.full_name = full_name
+        self.run_indices = array("l")
+        self.status_codes = array("b")
+        self.durations = array("d")
+
+    def _append(self, run_index: int, test_case: TestCase) -> None:
+        self.run_indices.append(run_index)
+        self.status_codes.append(test_case.status_code)
+        self.durations.append(test_case.duration)
+
+    def __len__(self) -> int:
+        return len(self.run_indices)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        return HistoryEntry(
+            self.run_indices[position],
+            STATUS_BY_CODE[self.status_codes[position]],
+            self.durations[position],
+        )
+
+    def __iter__(self):
+        for run_index, code, duration in zip(self.run_indices, self.status_codes, self.durations):
+            yield HistoryEntry(run_index, STATUS_BY_CODE[code], duration)
+
+    def __repr__(self) -> str:
+        return f"TestHistory({self.full_name!r}, {len(self)} results)"
+
 
 @dataclass
 class TestSuite:
     name: str
     test_runs: list[TestRun]
 
+    def __post_init__(self):
+        # The history index is a plain attribute rather than a field, so asdict,
+        # replace and comparisons leave it out.
+        self.invalidate_index()
+
     @property
     def total_runs(self) -> int:
         return len(self.test_runs)
@@ -75,3 +252,51 @@ class TestSuite:
             all_cases.extend(test_run.test_cases)
         return all_cases
 
+    def history(self, test_id: str) -> TestHistory:
+        """Results of ``test_id`` (a full name) per run; empty if it never ran."""
+        history = self._history().get(test_id)
+        if history is None:
+            return TestHistory(test_id)
+        return history
+
+    def tests(self) -> KeysView[str]:
+        """Full names of all tests in the suite, in order of first appearance."""
+        return self._history().keys()
+
+    def invalidate_index(self) -> None:
+        """Drop the history index after editing runs that are already indexed."""
+        self._history_index = None
+        self._indexed_runs = None
+        self._indexed_count = 0
+
+    def _history(self) -> dict[str, TestHistory]:
+        # Runs are only ever appended, so new runs extend the index in place.
+        # A replaced or shortened run list is re-indexed from scratch.
+        test_runs = self.test_runs
+        if (
+            self._history_index is None
+            or self._indexed_runs is not test_runs
+            or self._indexed_count > len(test_runs)
+        ):
+            self._history_index = {}
+            self._indexed_runs = test_runs
+            self._indexed_count = 0
+
+        index = self._history_index
+        for run_index in range(self._indexed_count, len(test_runs)):
+            for test_case in test_runs[run_index].test_cases:
+                full_name = test_case.identity.full_name
+                history = index.get(full_name)
+                if history is None:
+                    history = index[full_name] = TestHistory(full_name)
+                history._append(run_index, test_case)
+        self._indexed_count = len(test_runs)
+        return index
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_history_index"] = None
+        state["_indexed_runs"] = None
+        state["_indexed_count"] = 0
+        return state
+
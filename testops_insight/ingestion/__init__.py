@@ -1,4 +1,28 @@
-from .junit_parser import parse_junit_xml
+import importlib
 
-__all__ = ["parse_junit_xml"]
+# Names are imported on first access so that reading headers or listing runs
+# does not load the parse cache and the full parser.
+_EXPORTS = {
+    "ArchiveMember": ".sources",
+    "LazyMessage": ".junit_parser",
+    "MessageSource": ".junit_parser",
+    "ParseCache": ".cache",
+    "iter_test_cases": ".junit_parser",
+    "parse_junit_xml": ".junit_parser",
+    "read_junit_counts": ".junit_parser",
+    "read_junit_timestamp": ".junit_parser",
+}
 
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
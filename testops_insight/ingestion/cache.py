@@ -0,0 +1,303 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+from testops_insight.domain.models import STATUS_BY_CODE, TestCase, TestRun
+from testops_insight.ingestion.junit_parser import LazyMessage, MessageSource
+from testops_insight.ingestion.sources import open_raw, source_key, source_stat
+
+CACHE_FORMAT_VERSION = 2
+DEFAULT_MAX_SIZE_BYTES = 512 * 1024 * 1024
+
+# Entries are zlib-compressed JSON holding plain data only, and are checked
+# field by field before a run is built from them: anyone who can write to the
+# cache directory can make a run look different, but not run code.
+_MESSAGE_TAGS = ("failure", "error", "skipped")
+_ENCODING_NAME = re.compile(r"[A-Za-z][A-Za-z0-9._-]*")
+
+
+class ParseCache:
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        max_size_bytes: int = DEFAULT_MAX_SIZE_BYTES,
+        verify_hash: bool = False,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_size_bytes = max_size_bytes
+        self.verify_hash = verify_hash
+        self._manifest = None
+        self._manifest_dirty = False
+        # Size of the entries as of the last prune, kept in the manifest, plus
+        # the bytes written since; prune() only scans once they could exceed
+        # max_size_bytes.
+        self._size: Optional[int] = None
+        self._written = 0
+
+    def load(self, xml_file: Path) -> tuple[bool, Optional[TestRun]]:
+        entry_path = self._entry_path(xml_file)
+        try:
+            with open(entry_path, "rb") as f:
+                entry = json.loads(zlib.decompress(f.read()))
+            fingerprint = self._fingerprint(xml_file)
+            if entry["version"] != CACHE_FORMAT_VERSION or entry["fingerprint"] != list(fingerprint):
+                return False, None
+            payload = entry["run"]
+            test_run = None if payload is None else _unpack_run(payload, xml_file, fingerprint)
+        except Exception:
+            return False, None
+
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+
+        return True, test_run
+
+    def store(self, xml_file: Path, test_run: Optional[TestRun]) -> None:
+        try:
+            fingerprint = self._fingerprint(xml_file)
+        except OSError:
+            return
+
+        try:
+            payload = None if test_run is None else _pack_run(test_run, xml_file, fingerprint)
+        except (OSError, ValueError):
+            # A lazy message whose file changed since parsing cannot be stored.
+            return
+        entry = {"version": CACHE_FORMAT_VERSION, "fingerprint": list(fingerprint), "run": payload}
+        data = zlib.compress(json.dumps(entry, separators=(",", ":")).encode("utf-8"))
+
+        if self._write(self._entry_path(xml_file), data):
+            self._written += len(data)
+
+    def load_timestamp(self, xml_file: Path) -> tuple[bool, Optional[datetime]]:
+        entry = self._load_manifest().get(self._manifest_key(xml_file))
+        if entry is None:
+            return False, None
+
+        size, mtime_ns, timestamp = entry
+        try:
+            stat = source_stat(xml_file)
+        except OSError:
+            return False, None
+        if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+            return False, None
+
+        return True, datetime.fromisoformat(timestamp) if timestamp else None
+
+    def store_timestamp(self, xml_file: Path, timestamp: Optional[datetime]) -> None:
+        try:
+            stat = source_stat(xml_file)
+        except OSError:
+            return
+
+        self._load_manifest()[self._manifest_key(xml_file)] = [
+            stat.st_size,
+            stat.st_mtime_ns,
+            timestamp.isoformat() if timestamp else None,
+        ]
+        self._manifest_dirty = True
+
+    def save_manifest(self) -> None:
+        if not self._manifest_dirty:
+            return
+
+        manifest = {"version": CACHE_FORMAT_VERSION, "entries": self._load_manifest(), "size": self._size}
+        data = json.dumps(manifest, separators=(",", ":"))
+        if self._write(self.cache_dir / "manifest.json", data.encode("utf-8")):
+            self._manifest_dirty = False
+
+    def flush(self) -> None:
+        self._load_manifest()
+        if self._size is None or self._size + self._written > self.max_size_bytes:
+            self.prune()
+        elif self._written:
+            self._size += self._written
+            self._written = 0
+            self._manifest_dirty = True
+        self.save_manifest()
+
+    def prune(self) -> None:
+        if not self.cache_dir.exists():
+            return
+
+        entries = []
+        total_size = 0
+        for entry_path in self.cache_dir.glob("*.run"):
+            try:
+                stat = entry_path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+            total_size += stat.st_size
+
+        if total_size > self.max_size_bytes:
+            entries.sort()
+            for _, size, entry_path in entries:
+                if total_size <= self.max_size_bytes:
+                    break
+                try:
+                    entry_path.unlink(missing_ok=True)
+                except OSError:
+                    continue
+                total_size -= size
+
+        self._load_manifest()
+        self._size = total_size
+        self._written = 0
+        self._manifest_dirty = True
+
+    def _write(self, path: Path, data: bytes) -> bool:
+        # The cache is best effort: a read-only or missing cache directory
+        # just means nothing gets cached.
+        tmp_path = None
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            return True
+        except OSError:
+            if tmp_path is not None:
+                Path(tmp_path).unlink(missing_ok=True)
+            return False
+
+    def _load_manifest(self) -> dict:
+        if self._manifest is None:
+            try:
+                with open(self.cache_dir / "manifest.json", "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") != CACHE_FORMAT_VERSION:
+                    raise ValueError("Stale manifest")
+                self._manifest = data["entries"]
+                size = data.get("size")
+                self._size = size if type(size) is int else None
+            except Exception:
+                self._manifest = {}
+        return self._manifest
+
+    def _manifest_key(self, xml_file: Path) -> str:
+        return source_key(xml_file)
+
+    def _entry_path(self, xml_file: Path) -> Path:
+        key = hashlib.sha1(source_key(xml_file).encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.run"
+
+    def _fingerprint(self, xml_file: Path) -> tuple:
+        stat = source_stat(xml_file)
+        content_hash = None
+        if self.verify_hash:
+            digest = hashlib.sha256()
+            with open_raw(xml_file) as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(chunk)
+            content_hash = digest.hexdigest()
+        return (stat.st_size, stat.st_mtime_ns, content_hash)
+
+
+def _pack_run(test_run: TestRun, xml_file: Path, fingerprint: tuple) -> dict[str, Any]:
+    test_cases = test_run.test_cases
+    return {
+        "timestamp": test_run.timestamp.isoformat() if test_run.timestamp is not None else None,
+        "counts": [test_run.total_tests, test_run.passed, test_run.failed, test_run.skipped, test_run.errors],
+        "duration": test_run.duration,
+        "names": [tc.name for tc in test_cases],
+        "classnames": [tc.classname for tc in test_cases],
+        "statuses": [tc.status_code for tc in test_cases],
+        "durations": [tc.duration for tc in test_cases],
+        "messages": [_pack_message(tc.stored_message, xml_file, fingerprint) for tc in test_cases],
+        "failure_types": [tc.failure_type for tc in test_cases],
+    }
+
+
+def _pack_message(message: Any, xml_file: Path, fingerprint: tuple) -> Any:
+    if message is None or message.__class__ is str:
+        return message
+    if (
+        isinstance(message, LazyMessage)
+        and message.source.path == os.path.abspath(xml_file)
+        and (message.source.size, message.source.mtime_ns) == fingerprint[:2]
+    ):
+        # The message is read from the cached file itself when needed.
+        return [message.start, message.end, message.tag, message.source.encoding]
+    return message.load()
+
+
+def _unpack_run(payload: dict[str, Any], xml_file: Path, fingerprint: tuple) -> TestRun:
+    """Build the run of a decoded entry; raises ValueError if any field is malformed."""
+    timestamp = payload["timestamp"]
+    counts = payload["counts"]
+    duration = payload["duration"]
+    columns = [
+        payload[name] for name in ("names", "classnames", "statuses", "durations", "messages", "failure_types")
+    ]
+    if not (
+        (timestamp is None or type(timestamp) is str)
+        and type(counts) is list
+        and len(counts) == 5
+        and all(type(count) is int for count in counts)
+        and type(duration) in (int, float)
+        and all(type(column) is list and len(column) == len(columns[0]) for column in columns)
+    ):
+        raise ValueError("Malformed cache entry")
+
+    names, classnames, statuses, durations, messages, failure_types = columns
+    if not (
+        set(map(type, names)) <= {str}
+        and set(map(type, classnames)) <= {str}
+        and set(map(type, statuses)) <= {int}
+        and all(0 <= status < len(STATUS_BY_CODE) for status in set(statuses))
+        and set(map(type, durations)) <= {int, float}
+        and set(map(type, failure_types)) <= {str, type(None)}
+    ):
+        raise ValueError("Malformed cache entry")
+
+    source = MessageSource(os.path.abspath(xml_file), None, fingerprint[0], fingerprint[1])
+    test_cases = [
+        TestCase(
+            name=name,
+            classname=classname,
+            status=STATUS_BY_CODE[status],
+            duration=float(case_duration),
+            message=message if message is None or type(message) is str else _unpack_message(message, source),
+            failure_type=failure_type,
+        )
+        for name, classname, status, case_duration, message, failure_type in zip(*columns)
+    ]
+
+    total_tests, passed, failed, skipped, errors = counts
+    return TestRun(
+        timestamp=datetime.fromisoformat(timestamp) if timestamp is not None else None,
+        test_cases=test_cases,
+        total_tests=total_tests,
+        passed=passed,
+        failed=failed,
+        skipped=skipped,
+        errors=errors,
+        duration=float(duration),
+    )
+
+
+def _unpack_message(message: Any, source: MessageSource) -> LazyMessage:
+    if type(message) is list and len(message) == 4:
+        start, end, tag, encoding = message
+        if (
+            type(start) is int
+            and type(end) is int
+            and 0 <= start <= end <= source.size
+            and tag in _MESSAGE_TAGS
+            and (encoding is None or (type(encoding) is str and _ENCODING_NAME.fullmatch(encoding)))
+        ):
+            # Messages of one file share its source, as when parsed.
+            if encoding is not None:
+                source.encoding = encoding
+            return LazyMessage(source, start, end, tag)
+    raise ValueError("Malformed cache entry")
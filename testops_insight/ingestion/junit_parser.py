@@ -1,12 +1,31 @@
+import mmap
+import os
 import xml.etree.ElementTree as ET
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, NamedTuple, Optional
+from xml.parsers import expat
 
 from testops_insight.domain.models import TestCase, TestRun, TestStatus
+from testops_insight.ingestion.sources import ArchiveMember, is_plain_file, open_junit_file
 
+_HEADER_CHUNK_SIZE = 4096
+
+# Shorter failure texts are kept in memory; a lazy reference is not worth it.
+LAZY_MESSAGE_MIN_CHARS = 256
+
+
+def parse_junit_xml(
+    file_path: str | Path | ArchiveMember,
+    streaming: bool = False,
+    lazy_messages: bool = False,
+    use_mmap: bool = False,
+) -> TestRun:
+    # Compressed files and archive members are always streamed through the
+    # decompressor; the streaming parser gives the same result as the tree.
+    if streaming or lazy_messages or not is_plain_file(file_path):
+        return _parse_junit_xml_streaming(file_path, lazy_messages=lazy_messages, use_mmap=use_mmap)
 
-def parse_junit_xml(file_path: str | Path) -> TestRun:
     tree = ET.parse(file_path)
     root = tree.getroot()
 
@@ -24,6 +43,146 @@ def parse_junit_xml(file_path: str | Path) -> TestRun:
     return TestRun.from_test_cases(test_cases, timestamp)
 
 
+class _HeaderRead(Exception):
+    pass
+
+
+def read_junit_timestamp(file_path: str | Path | ArchiveMember) -> Optional[datetime]:
+    root_attrs = {}
+
+    def start(tag: str, attrs: dict[str, str]) -> None:
+        if tag not in ("testsuites", "testsuite"):
+            raise ValueError(f"Unexpected root element: {tag}")
+        root_attrs.update(attrs)
+        raise _HeaderRead()
+
+    expat_parser = expat.ParserCreate()
+    expat_parser.StartElementHandler = start
+
+    with open_junit_file(file_path) as f:
+        try:
+            while True:
+                chunk = f.read(_HEADER_CHUNK_SIZE)
+                expat_parser.Parse(chunk, not chunk)
+                if not chunk:
+                    break
+        except _HeaderRead:
+            return _parse_timestamp(root_attrs.get("timestamp"))
+
+    raise ValueError(f"No root element found in {file_path}")
+
+
+class JUnitCounts(NamedTuple):
+    total_tests: int
+    passed: int
+    failed: int
+    skipped: int
+    errors: int
+    counted: bool
+
+
+# Rank of a testcase child in the status it sets; later checks in
+# _parse_testsuite override earlier ones.
+_COUNT_RANKS = {"failure": 1, "error": 2, "skipped": 3}
+
+
+def read_junit_counts(file_path: str | Path | ArchiveMember) -> JUnitCounts:
+    """Read test counts from the ``tests``/``failures``/``errors``/``skipped`` attributes.
+
+    A ``<testsuites>`` root that carries the counts is enough on its own.
+    Otherwise each ``<testsuite>`` is taken from its attributes, and only a
+    suite missing ``tests``, ``failures`` or ``errors`` has its test cases
+    counted. ``skipped`` defaults to 0 as in the JUnit schema.
+    """
+    counter = _CountReader()
+    expat_parser = expat.ParserCreate()
+    expat_parser.StartElementHandler = counter.start
+    expat_parser.EndElementHandler = counter.end
+
+    with open_junit_file(file_path) as f:
+        try:
+            while True:
+                chunk = f.read(_HEADER_CHUNK_SIZE)
+                expat_parser.Parse(chunk, not chunk)
+                if not chunk:
+                    break
+        except _HeaderRead:
+            pass
+
+    tests, failed, errors, skipped = counter.totals
+    return JUnitCounts(
+        total_tests=tests,
+        passed=max(0, tests - failed - errors - skipped),
+        failed=failed,
+        skipped=skipped,
+        errors=errors,
+        counted=counter.counted,
+    )
+
+
+class _CountReader:
+    def __init__(self):
+        self.totals = [0, 0, 0, 0]
+        self.counted = False
+        self.depth = 0
+        self.suite_depth = None
+        self._counting = False
+        self._case_rank = None
+
+    def start(self, tag: str, attrs: dict[str, str]) -> None:
+        depth = self.depth
+        self.depth += 1
+
+        if depth == 0:
+            if tag == "testsuites":
+                self.suite_depth = 1
+                if self._add_header(attrs):
+                    raise _HeaderRead()
+            elif tag == "testsuite":
+                self.suite_depth = 0
+                if self._add_header(attrs):
+                    raise _HeaderRead()
+                self._counting = True
+            else:
+                raise ValueError(f"Unexpected root element: {tag}")
+            return
+
+        if depth == self.suite_depth and tag == "testsuite":
+            self._counting = not self._add_header(attrs)
+        elif self._counting and depth == self.suite_depth + 1 and tag == "testcase":
+            self._case_rank = 0
+        elif self._case_rank is not None and depth == self.suite_depth + 2:
+            self._case_rank = max(self._case_rank, _COUNT_RANKS.get(tag, 0))
+
+    def end(self, tag: str) -> None:
+        self.depth -= 1
+        depth = self.depth
+
+        if self._case_rank is not None and depth == self.suite_depth + 1:
+            self.totals[0] += 1
+            if self._case_rank:
+                self.totals[self._case_rank] += 1
+            self._case_rank = None
+            self.counted = True
+        elif depth == self.suite_depth:
+            self._counting = False
+
+    def _add_header(self, attrs: dict[str, str]) -> bool:
+        try:
+            counts = [
+                int(attrs["tests"]),
+                int(attrs["failures"]),
+                int(attrs["errors"]),
+                int(attrs.get("skipped", 0)),
+            ]
+        except (KeyError, ValueError):
+            return False
+
+        for idx, count in enumerate(counts):
+            self.totals[idx] += count
+        return True
+
+
 def _parse_testsuite(testsuite: ET.Element) -> list[TestCase]:
     test_cases = []
     classname = testsuite.get("name", "")
@@ -80,3 +239,258 @@ def _parse_timestamp(timestamp_str: Optional[str]) -> Optional[datetime]:
         except ValueError:
             return None
 
+
+def iter_test_cases(
+    file_path: str | Path | ArchiveMember, lazy_messages: bool = False, use_mmap: bool = False
+) -> Iterator[TestCase]:
+    parser = _StreamingParser(lazy_messages=lazy_messages, use_mmap=use_mmap)
+    yield from parser.iter_parse(file_path)
+
+
+def _parse_junit_xml_streaming(
+    file_path: str | Path | ArchiveMember, lazy_messages: bool = False, use_mmap: bool = False
+) -> TestRun:
+    parser = _StreamingParser(lazy_messages=lazy_messages, use_mmap=use_mmap)
+    test_cases = list(parser.iter_parse(file_path))
+    return TestRun.from_test_cases(test_cases, _parse_timestamp(parser.timestamp))
+
+
+class MessageSource:
+    """A parsed JUnit XML file that lazy messages are read back from.
+
+    With ``use_mmap`` the file stays mapped after the first read, until
+    ``close()`` or until the source is released along with the last run and
+    unloaded message referring to it.
+    """
+
+    __slots__ = ("path", "encoding", "size", "mtime_ns", "use_mmap", "_mmap")
+
+    def __init__(
+        self,
+        path: str,
+        encoding: Optional[str],
+        size: int,
+        mtime_ns: int,
+        use_mmap: bool = False,
+    ):
+        self.path = path
+        self.encoding = encoding
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.use_mmap = use_mmap
+        self._mmap = None
+
+    @classmethod
+    def for_file(cls, file_path: str | Path, use_mmap: bool = False) -> "MessageSource":
+        stat = os.stat(file_path)
+        return cls(os.path.abspath(file_path), None, stat.st_size, stat.st_mtime_ns, use_mmap)
+
+    def read(self, start: int, end: int) -> bytes:
+        if self.use_mmap:
+            if self._mmap is None:
+                with open(self.path, "rb") as f:
+                    self._check_unchanged(os.fstat(f.fileno()))
+                    self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return self._mmap[start:end]
+
+        with open(self.path, "rb") as f:
+            self._check_unchanged(os.fstat(f.fileno()))
+            f.seek(start)
+            return f.read(end - start)
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    __del__ = close
+
+    def _check_unchanged(self, stat: os.stat_result) -> None:
+        if stat.st_size != self.size or stat.st_mtime_ns != self.mtime_ns:
+            raise ValueError(f"{self.path} changed since it was parsed")
+
+    def __reduce__(self):
+        return (self.__class__, (self.path, self.encoding, self.size, self.mtime_ns, self.use_mmap))
+
+
+class LazyMessage:
+    """The text of a failure, error or skipped element, read from its file on demand."""
+
+    __slots__ = ("source", "start", "end", "tag")
+
+    def __init__(self, source: MessageSource, start: int, end: int, tag: str):
+        self.source = source
+        self.start = start
+        self.end = end
+        self.tag = tag
+
+    def load(self) -> Optional[str]:
+        # The range runs from the element's start tag up to its end tag, so
+        # parsing it as a document yields exactly the text ElementTree sees.
+        prolog = b""
+        if self.source.encoding:
+            prolog = f'<?xml version="1.0" encoding="{self.source.encoding}"?>'.encode("ascii")
+        data = self.source.read(self.start, self.end)
+        element = ET.fromstring(b"".join([prolog, data, b"</", self.tag.encode("ascii"), b">"]))
+        return element.text
+
+    def __repr__(self) -> str:
+        return f"LazyMessage({self.source.path!r}, {self.start}, {self.end})"
+
+    def __reduce__(self):
+        return (self.__class__, (self.source, self.start, self.end, self.tag))
+
+
+class _StreamingParser:
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, lazy_messages: bool = False, use_mmap: bool = False):
+        self.lazy_messages = lazy_messages
+        self.use_mmap = use_mmap
+        self.timestamp = None
+        self._expat = None
+        self._source = None
+        self._child_start = None
+        self._completed = []
+        self._depth = 0
+        self._suite_depth = None
+        self._suite_classname = None
+        self._testcase = None
+        self._child = None
+        self._text = None
+        self._collecting = False
+
+    def iter_parse(self, file_path: str | Path | ArchiveMember) -> Iterator[TestCase]:
+        expat_parser = expat.ParserCreate()
+        expat_parser.buffer_text = True
+        expat_parser.StartElementHandler = self._start
+        expat_parser.EndElementHandler = self._end
+        expat_parser.CharacterDataHandler = self._data
+        self._expat = expat_parser
+
+        if hasattr(file_path, "read"):
+            source = file_path
+            close_source = False
+        else:
+            if self.lazy_messages and is_plain_file(file_path):
+                # Only uncompressed files on disk can be read back later.
+                self._source = MessageSource.for_file(file_path, use_mmap=self.use_mmap)
+                expat_parser.XmlDeclHandler = self._xml_decl
+                expat_parser.StartDoctypeDeclHandler = self._doctype
+            source = open_junit_file(file_path)
+            close_source = True
+
+        try:
+            while True:
+                chunk = source.read(self.CHUNK_SIZE)
+                expat_parser.Parse(chunk, not chunk)
+                yield from self._drain()
+                if not chunk:
+                    break
+        finally:
+            if close_source:
+                source.close()
+
+    def _xml_decl(self, version: str, encoding: Optional[str], standalone: int) -> None:
+        if self._source is None or not encoding:
+            return
+        if "16" in encoding or "32" in encoding:
+            # A byte range of a multi-byte encoding cannot be re-read on its own.
+            self._source = None
+        else:
+            self._source.encoding = encoding
+
+    def _doctype(self, *args) -> None:
+        # Entities declared in a DTD would be unknown when re-reading a range.
+        self._source = None
+
+    def _drain(self) -> list[TestCase]:
+        completed = self._completed
+        self._completed = []
+        return completed
+
+    def _start(self, tag: str, attrs: dict[str, str]) -> None:
+        depth = self._depth
+        self._depth += 1
+        self._collecting = False
+
+        if depth == 0:
+            if tag == "testsuites":
+                self._suite_depth = 1
+            elif tag == "testsuite":
+                self._suite_depth = 0
+                self._suite_classname = attrs.get("name", "")
+            else:
+                raise ValueError(f"Unexpected root element: {tag}")
+            self.timestamp = attrs.get("timestamp")
+            return
+
+        if depth == self._suite_depth and tag == "testsuite":
+            self._suite_classname = attrs.get("name", "")
+        elif self._suite_classname is not None and depth == self._suite_depth + 1 and tag == "testcase":
+            self._testcase = {
+                "name": attrs.get("name", ""),
+                "classname": attrs.get("classname", self._suite_classname),
+                "duration": float(attrs.get("time", "0.0")),
+            }
+        elif self._testcase is not None and depth == self._suite_depth + 2:
+            if tag in ("failure", "error", "skipped") and tag not in self._testcase:
+                self._child = (tag, attrs)
+                self._child_start = self._expat.CurrentByteIndex
+                self._text = []
+                self._collecting = True
+
+    def _end(self, tag: str) -> None:
+        self._depth -= 1
+        self._collecting = False
+        depth = self._depth
+
+        if self._child is not None and depth == self._suite_depth + 2:
+            child_tag, attrs = self._child
+            text = "".join(self._text) if self._text else None
+            if self._source is not None and text is not None and len(text) >= LAZY_MESSAGE_MIN_CHARS:
+                text = LazyMessage(self._source, self._child_start, self._expat.CurrentByteIndex, child_tag)
+            self._testcase[child_tag] = (attrs, text)
+            self._child = None
+            self._text = None
+        elif self._testcase is not None and depth == self._suite_depth + 1:
+            self._completed.append(self._build_test_case(self._testcase))
+            self._testcase = None
+        elif depth == self._suite_depth and self._suite_depth > 0:
+            self._suite_classname = None
+
+    def _data(self, data: str) -> None:
+        if self._collecting:
+            self._text.append(data)
+
+    @staticmethod
+    def _build_test_case(testcase: dict) -> TestCase:
+        status = TestStatus.PASSED
+        message = None
+        failure_type = None
+
+        if "failure" in testcase:
+            attrs, text = testcase["failure"]
+            status = TestStatus.FAILED
+            message = attrs.get("message") or text
+            failure_type = attrs.get("type", "failure")
+
+        if "error" in testcase:
+            attrs, text = testcase["error"]
+            status = TestStatus.ERROR
+            message = text
+            failure_type = attrs.get("type", "error")
+
+        if "skipped" in testcase:
+            attrs, text = testcase["skipped"]
+            status = TestStatus.SKIPPED
+            message = text
+
+        return TestCase(
+            name=testcase["name"],
+            classname=testcase["classname"],
+            status=status,
+            duration=testcase["duration"],
+            message=message,
+            failure_type=failure_type,
+        )
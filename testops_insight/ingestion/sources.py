@@ -0,0 +1,200 @@
+import bz2
+import gzip
+import lzma
+import os
+import tarfile
+import zipfile
+from collections import OrderedDict
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO
+
+_DECOMPRESSORS = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+_JUNIT_SUFFIXES = (".xml", ".xml.gz", ".xml.bz2", ".xml.xz")
+_TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+_PRIMARY_NAMES = ("junit.xml", "junit.xml.gz", "junit.xml.bz2", "junit.xml.xz")
+
+# Open archives kept per process so the runs of one archive do not each
+# re-read its member index.
+_MAX_OPEN_ARCHIVES = 4
+_open_archives: "OrderedDict[Path, tuple[tuple[int, int], object]]" = OrderedDict()
+
+# A forked worker must not use the parent's archive objects: they share one
+# OS file offset with the parent and every other worker, so concurrent reads
+# would interleave. Children start with no open archives instead.
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_open_archives.clear)
+
+
+class ArchiveMember:
+    """A JUnit XML file inside a tar or zip archive, shown as ``archive!member``."""
+
+    __slots__ = ("archive", "member")
+
+    def __init__(self, archive: str | Path, member: str):
+        self.archive = Path(archive)
+        self.member = member
+
+    @property
+    def name(self) -> str:
+        return PurePosixPath(self.member).name
+
+    @property
+    def parent(self) -> PurePosixPath:
+        return PurePosixPath(self.member).parent
+
+    def stat(self) -> os.stat_result:
+        return os.stat(self.archive)
+
+    def resolve(self) -> "ArchiveMember":
+        return ArchiveMember(self.archive.resolve(), self.member)
+
+    def open(self) -> BinaryIO:
+        archive = _open_archive(self.archive)
+        if isinstance(archive, zipfile.ZipFile):
+            return archive.open(self.member)
+        stream = archive.extractfile(self.member)
+        if stream is None:
+            raise ValueError(f"{self} is not a regular file")
+        return stream
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ArchiveMember):
+            return NotImplemented
+        return (self.archive, self.member) == (other.archive, other.member)
+
+    def __hash__(self) -> int:
+        return hash((self.archive, self.member))
+
+    def __str__(self) -> str:
+        return f"{self.archive}!{self.member}"
+
+    def __repr__(self) -> str:
+        return f"ArchiveMember({str(self.archive)!r}, {self.member!r})"
+
+    def __reduce__(self):
+        return (self.__class__, (str(self.archive), self.member))
+
+
+def is_junit_file(path: str | Path) -> bool:
+    return os.path.basename(path).lower().endswith(_JUNIT_SUFFIXES)
+
+
+def is_archive(path: str | Path) -> bool:
+    name = os.path.basename(path).lower()
+    return name.endswith(_TAR_SUFFIXES) or name.endswith(".zip")
+
+
+def is_plain_file(source: str | Path | ArchiveMember) -> bool:
+    """True for an uncompressed file on disk, whose byte offsets can be re-read."""
+    if isinstance(source, ArchiveMember):
+        return False
+    return os.path.splitext(source)[1].lower() not in _DECOMPRESSORS
+
+
+def open_junit_file(source: str | Path | ArchiveMember) -> BinaryIO:
+    """Open a JUnit file for reading, decompressing gzip, bz2 and xz on the fly."""
+    if isinstance(source, ArchiveMember):
+        return source.open()
+    opener = _DECOMPRESSORS.get(os.path.splitext(source)[1].lower(), open)
+    return opener(source, "rb")
+
+
+def open_raw(source: str | Path | ArchiveMember) -> BinaryIO:
+    """Open the stored bytes of a source, without decompressing a compressed file."""
+    if isinstance(source, ArchiveMember):
+        return source.open()
+    return open(source, "rb")
+
+
+def source_stat(source: str | Path | ArchiveMember) -> os.stat_result:
+    """Stat the file on disk; for an archive member this is the archive itself."""
+    if isinstance(source, ArchiveMember):
+        return source.stat()
+    return os.stat(source)
+
+
+def source_key(source: str | Path | ArchiveMember) -> str:
+    if isinstance(source, ArchiveMember):
+        return str(source.resolve())
+    return str(Path(source).resolve())
+
+
+def select_run_files(junit_files: list) -> list:
+    """Pick the files of one run: ``junit.xml`` if present, otherwise every shard."""
+    for junit_file in junit_files:
+        if junit_file.name in _PRIMARY_NAMES:
+            return [junit_file]
+    return junit_files
+
+
+def list_run_files(runs_path: str | Path) -> list[list]:
+    """List the files of each run under ``runs_path``, in run order.
+
+    A run is a folder of JUnit files or a member directory of an archive placed
+    next to the folders. Unreadable archives are skipped.
+    """
+    runs_path = Path(runs_path)
+    if not runs_path.exists():
+        return []
+
+    # scandir entries carry the file type, which saves a stat per entry on
+    # large run folders.
+    runs = []
+    with os.scandir(runs_path) as entries:
+        run_entries = sorted(entries, key=lambda entry: entry.name)
+    for entry in run_entries:
+        if entry.is_dir():
+            run_dir = runs_path / entry.name
+            with os.scandir(entry.path) as files:
+                names = sorted(file.name for file in files if is_junit_file(file.name))
+            junit_files = select_run_files([run_dir / name for name in names])
+            if junit_files:
+                runs.append(junit_files)
+        elif is_archive(entry.name):
+            try:
+                runs.extend(list_archive_runs(runs_path / entry.name))
+            except (OSError, tarfile.TarError, zipfile.BadZipFile):
+                continue
+    return runs
+
+
+def list_archive_runs(archive_path: str | Path) -> list[list[ArchiveMember]]:
+    """Group the JUnit members of an archive into runs, one per member directory."""
+    archive_path = Path(archive_path)
+    archive = _open_archive(archive_path)
+    if isinstance(archive, zipfile.ZipFile):
+        names = [info.filename for info in archive.infolist() if not info.is_dir()]
+    else:
+        names = [info.name for info in archive.getmembers() if info.isfile()]
+
+    by_directory: dict[str, list[ArchiveMember]] = {}
+    for name in sorted(names):
+        if is_junit_file(name):
+            directory = str(PurePosixPath(name).parent)
+            by_directory.setdefault(directory, []).append(ArchiveMember(archive_path, name))
+
+    return [select_run_files(by_directory[directory]) for directory in sorted(by_directory)]
+
+
+def _open_archive(archive_path: Path):
+    stat = os.stat(archive_path)
+    fingerprint = (stat.st_size, stat.st_mtime_ns)
+
+    entry = _open_archives.get(archive_path)
+    if entry is not None:
+        if entry[0] == fingerprint:
+            _open_archives.move_to_end(archive_path)
+            return entry[1]
+        entry[1].close()
+        del _open_archives[archive_path]
+
+    if archive_path.name.lower().endswith(".zip"):
+        archive = zipfile.ZipFile(archive_path)
+    else:
+        archive = tarfile.open(archive_path, "r:*")
+
+    _open_archives[archive_path] = (fingerprint, archive)
+    while len(_open_archives) > _MAX_OPEN_ARCHIVES:
+        _, (_, evicted) = _open_archives.popitem(last=False)
+        evicted.close()
+    return archive
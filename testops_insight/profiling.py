@@ -0,0 +1,100 @@
+import cProfile
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Iterator, NamedTuple, Optional
+
+
+class Timing(NamedTuple):
+    wall_s: float
+    cpu_s: float
+    peak_bytes: int
+
+
+# Absolute tracemalloc peaks of the measurements in progress, innermost last.
+# An inner measurement resets the tracemalloc peak, so it hands its own peak
+# back to the enclosing one when it ends.
+_peak_stack: list[int] = []
+
+
+@contextmanager
+def measure() -> Iterator[list]:
+    """Measure the enclosed block; the yielded list receives its Timing on exit."""
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+
+    current, peak = tracemalloc.get_traced_memory()
+    if _peak_stack:
+        _peak_stack[-1] = max(_peak_stack[-1], peak)
+    _peak_stack.append(current)
+    tracemalloc.reset_peak()
+
+    out = []
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        yield out
+    finally:
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        peak = max(_peak_stack.pop(), tracemalloc.get_traced_memory()[1])
+        if _peak_stack:
+            _peak_stack[-1] = max(_peak_stack[-1], peak)
+        out.append(Timing(wall_s=wall, cpu_s=cpu, peak_bytes=max(0, peak - current)))
+        if started:
+            tracemalloc.stop()
+
+
+def measure_call(func: Callable[..., Any], *args: Any) -> tuple[Any, Timing]:
+    with measure() as timing:
+        result = func(*args)
+    return result, timing[0]
+
+
+class Profiler:
+    """Wall time, CPU time and tracemalloc peak per pipeline stage and per parsed file.
+
+    Peaks are the memory allocated on top of what was live when the stage
+    started. With ``cprofile_dir`` set, each stage also writes
+    ``<cprofile_dir>/<stage>.prof``; parsing done in worker processes is not
+    part of those dumps.
+    """
+
+    def __init__(self, cprofile_dir: Optional[str | Path] = None):
+        self.cprofile_dir = Path(cprofile_dir) if cprofile_dir is not None else None
+        self.stages: list[tuple[str, Timing]] = []
+        self.files: list[tuple[str, Timing, bool]] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        profile = cProfile.Profile() if self.cprofile_dir is not None else None
+        with measure() as timing:
+            if profile is not None:
+                profile.enable()
+            try:
+                yield
+            finally:
+                if profile is not None:
+                    profile.disable()
+        self.stages.append((name, timing[0]))
+
+        if profile is not None:
+            self.cprofile_dir.mkdir(parents=True, exist_ok=True)
+            profile.dump_stats(self.cprofile_dir / f"{name}.prof")
+
+    def add_file(self, file: str, timing: Timing, cached: bool = False) -> None:
+        self.files.append((file, timing, cached))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "stages": [{"name": name, **timing._asdict()} for name, timing in self.stages],
+            "files": [
+                {"file": file, "cached": cached, **timing._asdict()} for file, timing, cached in self.files
+            ],
+        }
+
+
+def profile_stage(profiler: Optional[Profiler], name: str) -> ContextManager[None]:
+    return profiler.stage(name) if profiler is not None else nullcontext()
@@ -1,5 +1,23 @@
-from .html_generator import generate_html_report
-from .report_generator import generate_report
+import importlib
 
-__all__ = ["generate_html_report", "generate_report"]
+# Names are imported on first access; the HTML generator pulls in the whole
+# analytics stack.
+_EXPORTS = {
+    "generate_html_report": ".html_generator",
+    "generate_aggregate_report": ".report_generator",
+    "generate_report": ".report_generator",
+}
 
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,27 +1,17 @@
 from datetime import datetime, timedelta
 from pathlib import Path
 
-from testops_insight.analytics import (
-    calculate_health_score,
-    detect_flaky_tests,
-    get_frequent_failures,
-    get_last_failed_timestamp,
-    get_last_test_status,
-    get_pass_rate_trend,
-    get_slowest_tests,
-)
+from testops_insight.analytics import SuiteAggregator
+from testops_insight.analytics.engine import LastSeen, RunSummary
 from testops_insight.domain.models import TestSuite
 
 
 def generate_html_report(test_suite: TestSuite, output_path: str | Path) -> None:
-    health_score = calculate_health_score(test_suite)
-    flaky_tests = detect_flaky_tests(test_suite)
-    frequent_failures = get_frequent_failures(test_suite)
-    slow_tests = get_slowest_tests(test_suite, limit=20)
-    trends = get_pass_rate_trend(test_suite)
+    aggregator = SuiteAggregator.from_suite(test_suite)
+    health_score, flaky_tests, frequent_failures, slow_tests, trends = aggregator.result(slow_limit=20)
 
     html_content = _generate_html_content(
-        test_suite, health_score, flaky_tests, frequent_failures, slow_tests, trends
+        test_suite.name, aggregator, health_score, flaky_tests, frequent_failures, slow_tests, trends
     )
 
     output_path = Path(output_path)
@@ -30,16 +20,19 @@ def generate_html_report(test_suite: TestSuite, output_path: str | Path) -> None
 
 
 def _generate_html_content(
-    test_suite: TestSuite,
+    suite_name: str,
+    aggregator: SuiteAggregator,
     health_score: float,
     flaky_tests: list,
     frequent_failures: list,
     slow_tests: list,
     trends: list,
 ) -> str:
-    time_range = _calculate_time_range(test_suite)
-    exec_summary = _calculate_executive_summary(test_suite, flaky_tests, frequent_failures)
-    health_explanation = _get_health_explanation(test_suite, health_score, flaky_tests, slow_tests)
+    runs = aggregator.runs
+    last_seen = aggregator.last_seen_index()
+    time_range = _calculate_time_range(runs)
+    exec_summary = _calculate_executive_summary(runs, flaky_tests, frequent_failures)
+    health_explanation = _get_health_explanation(runs, health_score, flaky_tests, slow_tests)
 
     return f"""<!DOCTYPE html>
 <html lang="en">
@@ -256,7 +249,7 @@ def _generate_html_content(
         <header>
             <h1>TestOps Insights</h1>
             <div class="header-meta">
-                {test_suite.name} • Analyzed {test_suite.total_runs} test run{'' if test_suite.total_runs == 1 else 's'}{time_range}
+                {suite_name} • Analyzed {len(runs)} test run{'' if len(runs) == 1 else 's'}{time_range}
             </div>
         </header>
 
@@ -276,12 +269,12 @@ def _generate_html_content(
 
         <section>
             <h2>Flaky Tests</h2>
-            {_generate_flaky_tests_table(test_suite, flaky_tests)}
+            {_generate_flaky_tests_table(last_seen, flaky_tests)}
         </section>
 
         <section>
             <h2>Top Failing Tests</h2>
-            {_generate_failing_tests_table(test_suite, frequent_failures)}
+            {_generate_failing_tests_table(last_seen, frequent_failures)}
         </section>
 
         <section>
@@ -300,11 +293,11 @@ def _generate_html_content(
 </html>"""
 
 
-def _calculate_time_range(test_suite: TestSuite) -> str:
-    if len(test_suite.test_runs) == 0:
+def _calculate_time_range(runs: list[RunSummary]) -> str:
+    if len(runs) == 0:
         return ""
 
-    timestamps = [run.timestamp for run in test_suite.test_runs if run.timestamp]
+    timestamps = [run.timestamp for run in runs if run.timestamp]
     if not timestamps:
         return ""
 
@@ -321,8 +314,8 @@ def _calculate_time_range(test_suite: TestSuite) -> str:
         return ""
 
 
-def _calculate_executive_summary(test_suite: TestSuite, flaky_tests: list, frequent_failures: list) -> str:
-    if len(test_suite.test_runs) == 0:
+def _calculate_executive_summary(runs: list[RunSummary], flaky_tests: list, frequent_failures: list) -> str:
+    if len(runs) == 0:
         return """
             <div class="metric-card">
                 <div class="metric-value metric-pass">0%</div>
@@ -342,9 +335,8 @@ def _calculate_executive_summary(test_suite: TestSuite, flaky_tests: list, frequ
             </div>
         """
 
-    total_tests = sum(run.total_tests for run in test_suite.test_runs)
-    total_passed = sum(run.passed for run in test_suite.test_runs)
-    total_runs = len(test_suite.test_runs)
+    total_tests = sum(run.total_tests for run in runs)
+    total_passed = sum(run.passed for run in runs)
 
     if total_tests > 0:
         pass_rate = (total_passed / total_tests) * 100.0
@@ -354,7 +346,7 @@ def _calculate_executive_summary(test_suite: TestSuite, flaky_tests: list, frequ
     flaky_count = len(flaky_tests)
     failing_count = len(frequent_failures)
 
-    total_duration = sum(run.duration for run in test_suite.test_runs)
+    total_duration = sum(run.duration for run in runs)
     if total_tests > 0:
         avg_duration = total_duration / total_tests
     else:
@@ -380,7 +372,7 @@ def _calculate_executive_summary(test_suite: TestSuite, flaky_tests: list, frequ
         """
 
 
-def _get_health_explanation(test_suite: TestSuite, health_score: float, flaky_tests: list, slow_tests: list) -> str:
+def _get_health_explanation(runs: list[RunSummary], health_score: float, flaky_tests: list, slow_tests: list) -> str:
     reasons = []
 
     if len(flaky_tests) > 0:
@@ -389,8 +381,8 @@ def _get_health_explanation(test_suite: TestSuite, health_score: float, flaky_te
     if len(slow_tests) > 0 and slow_tests[0].avg_duration > 5.0:
         reasons.append("increased average duration")
 
-    if len(test_suite.test_runs) > 0:
-        recent_runs = test_suite.test_runs[-min(3, len(test_suite.test_runs)):]
+    if len(runs) > 0:
+        recent_runs = runs[-min(3, len(runs)):]
         recent_failures = sum(run.failed + run.errors for run in recent_runs)
         if recent_failures > 0:
             reasons.append("recent test failures")
@@ -410,7 +402,7 @@ def _get_score_class(score: float) -> str:
         return "score-poor"
 
 
-def _generate_flaky_tests_table(test_suite: TestSuite, flaky_tests: list) -> str:
+def _generate_flaky_tests_table(last_seen: dict[str, LastSeen], flaky_tests: list) -> str:
     if not flaky_tests:
         return '<div class="no-data">No flaky tests detected</div>'
 
@@ -418,17 +410,20 @@ def _generate_flaky_tests_table(test_suite: TestSuite, flaky_tests: list) -> str
     for test in flaky_tests:
         fail_rate = (test.fail_count / test.total_runs) * 100.0
         flaky_score = test.flakiness_rate * 100.0
-        last_status = get_last_test_status(test_suite, test.test_name)
+        last_status = last_seen[test.test_name].status if test.test_name in last_seen else "NOT_FOUND"
 
         status_class = f"status-{last_status.lower()}"
         rate_class = "rate-high" if fail_rate > 50 else "rate-medium" if fail_rate > 25 else "rate-low"
+        recent = ' <span class="rate-high">(recently flaky)</span>' if test.recently_flaky else ""
 
         rows.append(
             f"""
             <tr>
-                <td class="test-name">{test.test_name}</td>
+                <td class="test-name">{test.test_name}{recent}</td>
                 <td><span class="{rate_class}">{fail_rate:.1f}%</span></td>
                 <td><span class="{rate_class}">{flaky_score:.1f}%</span></td>
+                <td>{test.flip_rate * 100.0:.1f}%</td>
+                <td>{test.longest_fail_streak}</td>
                 <td><span class="status-badge {status_class}">{last_status}</span></td>
             </tr>
             """
@@ -441,6 +436,8 @@ def _generate_flaky_tests_table(test_suite: TestSuite, flaky_tests: list) -> str
                     <th>Test Name</th>
                     <th>Fail Rate</th>
                     <th>Flaky Score</th>
+                    <th>Flip Rate</th>
+                    <th>Longest Fail Streak</th>
                     <th>Last Status</th>
                 </tr>
             </thead>
@@ -451,13 +448,13 @@ def _generate_flaky_tests_table(test_suite: TestSuite, flaky_tests: list) -> str
     """
 
 
-def _generate_failing_tests_table(test_suite: TestSuite, frequent_failures: list) -> str:
+def _generate_failing_tests_table(last_seen: dict[str, LastSeen], frequent_failures: list) -> str:
     if not frequent_failures:
         return '<div class="no-data">No failing tests detected</div>'
 
     rows = []
     for failure in frequent_failures:
-        last_failed = get_last_failed_timestamp(test_suite, failure.test_name)
+        last_failed = last_seen[failure.test_name].last_failed if failure.test_name in last_seen else None
         last_failed_str = last_failed.strftime("%Y-%m-%d %H:%M") if last_failed else "N/A"
 
         rows.append(
@@ -506,6 +503,7 @@ def _generate_slow_tests_table(slow_tests: list) -> str:
                         <span>{test.avg_duration:.3f}s</span>
                     </div>
                 </td>
+                <td>{test.p50_duration:.3f} / {test.p95_duration:.3f} / {test.p99_duration:.3f}</td>
             </tr>
             """
         )
@@ -516,6 +514,7 @@ def _generate_slow_tests_table(slow_tests: list) -> str:
                 <tr>
                     <th>Test Name</th>
                     <th>Avg Duration (s)</th>
+                    <th>p50 / p95 / p99 (s)</th>
                 </tr>
             </thead>
             <tbody>
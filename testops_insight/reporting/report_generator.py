@@ -1,36 +1,50 @@
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
-from testops_insight.analytics import (
-    calculate_health_score,
-    detect_flaky_tests,
-    get_frequent_failures,
-    get_pass_rate_trend,
-    get_slowest_tests,
-)
+from testops_insight.analytics import SuiteAggregator, SuiteAnalytics
 from testops_insight.domain.models import TestSuite
+from testops_insight.profiling import Profiler, profile_stage
 from testops_insight.reporting.html_generator import _generate_html_content
 
 
-def generate_report(test_suite: TestSuite, output_dir: Path) -> dict[str, Any]:
+def generate_report(
+    test_suite: TestSuite, output_dir: Path, profiler: Optional[Profiler] = None
+) -> dict[str, Any]:
+    with profile_stage(profiler, "aggregate"):
+        aggregator = SuiteAggregator.from_suite(test_suite)
+    return generate_aggregate_report(aggregator, test_suite.name, output_dir, profiler)
+
+
+def generate_aggregate_report(
+    aggregator: SuiteAnalytics,
+    suite_name: str,
+    output_dir: Path,
+    profiler: Optional[Profiler] = None,
+) -> dict[str, Any]:
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
     assets_dir = output_dir / "assets"
     assets_dir.mkdir(exist_ok=True)
 
-    health_score = calculate_health_score(test_suite)
-    flaky_tests = detect_flaky_tests(test_suite)
-    frequent_failures = get_frequent_failures(test_suite)
-    slow_tests = get_slowest_tests(test_suite, limit=20)
-    trends = get_pass_rate_trend(test_suite)
+    # Same as aggregator.result(slow_limit=20), one stage per analytic.
+    with profile_stage(profiler, "analytics.health_score"):
+        health_score = aggregator.health_score()
+    with profile_stage(profiler, "analytics.flaky_tests"):
+        flaky_tests = aggregator.flaky_tests()
+    with profile_stage(profiler, "analytics.frequent_failures"):
+        frequent_failures = aggregator.frequent_failures()
+    with profile_stage(profiler, "analytics.slow_tests"):
+        slow_tests = aggregator.slowest_tests(20)
+    with profile_stage(profiler, "analytics.trends"):
+        trends = aggregator.pass_rate_trend()
 
     metrics = {
         "health_score": health_score,
-        "total_runs": test_suite.total_runs,
-        "suite_name": test_suite.name,
+        "total_runs": aggregator.total_runs,
+        "suite_name": suite_name,
         "generated_at": datetime.now().isoformat(),
         "flaky_tests_count": len(flaky_tests),
         "failing_tests_count": len(frequent_failures),
@@ -41,6 +55,9 @@ def generate_report(test_suite: TestSuite, output_dir: Path) -> dict[str, Any]:
                 "fail_count": t.fail_count,
                 "total_runs": t.total_runs,
                 "flakiness_rate": t.flakiness_rate,
+                "flip_rate": t.flip_rate,
+                "longest_fail_streak": t.longest_fail_streak,
+                "recently_flaky": t.recently_flaky,
             }
             for t in flaky_tests
         ],
@@ -58,17 +75,37 @@ def generate_report(test_suite: TestSuite, output_dir: Path) -> dict[str, Any]:
                 "test_name": t.test_name,
                 "avg_duration": t.avg_duration,
                 "max_duration": t.max_duration,
+                "p50_duration": t.p50_duration,
+                "p95_duration": t.p95_duration,
+                "p99_duration": t.p99_duration,
                 "total_runs": t.total_runs,
             }
             for t in slow_tests
         ],
+        "shard_spread": [
+            {
+                "run_index": run_index,
+                "timestamp": run.timestamp.isoformat() if run.timestamp is not None else None,
+                "shard_count": run.shard_count,
+                "slowest_shard": run.slowest_shard,
+                "spread": run.shard_spread,
+            }
+            for run_index, run in enumerate(aggregator.runs)
+            if run.shard_count > 1
+        ],
     }
 
-    html_content = _generate_html_content(
-        test_suite, health_score, flaky_tests, frequent_failures, slow_tests, trends
-    )
+    with profile_stage(profiler, "render_html"):
+        html_content = _generate_html_content(
+            suite_name, aggregator, health_score, flaky_tests, frequent_failures, slow_tests, trends
+        )
+
+    with profile_stage(profiler, "write_html"):
+        (output_dir / "index.html").write_text(html_content, encoding="utf-8")
 
-    (output_dir / "index.html").write_text(html_content, encoding="utf-8")
+    # metrics.json is written last so that it can carry every stage above.
+    if profiler is not None:
+        metrics["profile"] = profiler.to_dict()
     (output_dir / "metrics.json").write_text(json.dumps(metrics, indent=2), encoding="utf-8")
 
     return metrics
@@ -0,0 +1,23 @@
+import importlib
+
+# sqlite3, numpy and the analytics engine are only loaded by the commands
+# that read or write a history store.
+_EXPORTS = {
+    "ColumnarHistory": ".columnar_history",
+    "HistoryAggregator": ".history_db",
+    "HistoryDatabase": ".history_db",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,412 @@
+import hashlib
+import mmap
+import os
+import struct
+from array import array
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from testops_insight.domain.columnar import ColumnarSuite, _column, np
+from testops_insight.domain.models import TestRun
+
+_MAGIC = b"TOPSCOL1"
+_FORMAT_VERSION = 2
+_HEADER = struct.Struct("<8sI4x")
+# One record per run: key digest, end offsets of the run's rows and of the
+# test and shard string tables (in strings and in bytes), the RunSummary
+# counts, the timestamp and the shard summary.
+_RUN = struct.Struct("<32s10qdqiiqid")
+_STRING_LENGTH = struct.Struct("<I")
+# sources.bin holds the SHA-256 digests of recorded source fingerprints, back to back.
+_SOURCE_SIZE = 32
+
+_NO_TIMESTAMP, _NAIVE_TIMESTAMP, _AWARE_TIMESTAMP = 0, 1, 2
+_EPOCH = datetime(1970, 1, 1)
+
+# File name, array typecode and ColumnarSuite field of each per-result column.
+_COLUMNS = (
+    ("test_ids.i32", "i", "test_ids"),
+    ("run_ids.i32", "i", "run_ids"),
+    ("statuses.i8", "b", "statuses"),
+    ("durations.f64", "d", "durations"),
+)
+
+
+class _RunRecord:
+    __slots__ = (
+        "key",
+        "rows_end",
+        "names_end",
+        "strings_end",
+        "shard_names_end",
+        "shard_strings_end",
+        "total_tests",
+        "passed",
+        "failed",
+        "skipped",
+        "errors",
+        "duration",
+        "timestamp",
+        "shard_count",
+        "shard_spread",
+        "slowest_shard",
+    )
+
+    @classmethod
+    def unpack(cls, data: bytes, offset: int) -> "_RunRecord":
+        record = cls()
+        (
+            record.key,
+            record.rows_end,
+            record.names_end,
+            record.strings_end,
+            record.shard_names_end,
+            record.shard_strings_end,
+            record.total_tests,
+            record.passed,
+            record.failed,
+            record.skipped,
+            record.errors,
+            record.duration,
+            timestamp_us,
+            offset_s,
+            timestamp_kind,
+            record.slowest_shard,
+            record.shard_count,
+            record.shard_spread,
+        ) = _RUN.unpack_from(data, offset)
+        record.timestamp = _timestamp_from_fields(timestamp_kind, timestamp_us, offset_s)
+        return record
+
+
+class ColumnarHistory:
+    """Append-only columnar test history, read through memory maps.
+
+    The history is a directory of fixed-width column files (test id, run id,
+    status and duration per result), string tables of length-prefixed UTF-8
+    test names and shard file names, and a run table of fixed-size records. Appending a run appends
+    its rows to each column and then its run record; the record is the commit
+    point, so readers ignore column bytes past the last record and a writer
+    that died half way leaves nothing visible. Appends are serialized with an
+    ``fcntl`` lock where available.
+
+    ``suite()`` maps the columns into a ColumnarSuite without copying them, so
+    opening a history costs the run table and the string tables only.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._runs_file = self.path / "runs.bin"
+        self._sources_file = self.path / "sources.bin"
+        self._records: list[_RunRecord] = []
+        self._run_table_size = _HEADER.size
+        self._keys: set[bytes] = set()
+        self._names = _StringTable(self.path / "strings.bin")
+        self._shard_names = _StringTable(self.path / "shards.bin")
+
+        if not self._runs_file.exists():
+            with self._locked():
+                if not self._runs_file.exists():
+                    tmp_file = self.path / "runs.bin.tmp"
+                    tmp_file.write_bytes(_HEADER.pack(_MAGIC, _FORMAT_VERSION))
+                    os.replace(tmp_file, self._runs_file)
+        self._refresh()
+
+    def __enter__(self) -> "ColumnarHistory":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+    @property
+    def total_runs(self) -> int:
+        return len(self._records)
+
+    def has_run(self, run_key: str) -> bool:
+        self._refresh()
+        return _digest(run_key) in self._keys
+
+    def add_run(self, run_key: str, source: str, test_run: TestRun) -> bool:
+        """Append a run; returns False if a run with ``run_key`` is already stored."""
+        key = _digest(run_key)
+        with self._locked():
+            self._refresh()
+            if key in self._keys:
+                return False
+
+            last = self._records[-1] if self._records else None
+            rows_end = last.rows_end if last else 0
+            strings_end = last.strings_end if last else 0
+            shard_strings_end = last.shard_strings_end if last else 0
+            run_id = len(self._records)
+
+            new_names = []
+            test_ids = array("i")
+            statuses = array("b")
+            durations = array("d")
+            for test_case in test_run.test_cases:
+                test_ids.append(self._names.intern(test_case.identity.full_name, new_names))
+                statuses.append(test_case.status_code)
+                durations.append(test_case.duration)
+            new_shard_names = []
+            slowest = test_run.slowest_shard
+            slowest_shard = self._shard_names.intern(slowest.file, new_shard_names) if slowest is not None else -1
+
+            encoded = _encode_strings(new_names)
+            encoded_shards = _encode_strings(new_shard_names)
+            columns = {
+                "test_ids.i32": test_ids,
+                "run_ids.i32": array("i", [run_id]) * len(test_ids),
+                "statuses.i8": statuses,
+                "durations.f64": durations,
+            }
+            committed = {file_name: rows_end * array(typecode).itemsize for file_name, typecode, _ in _COLUMNS}
+            committed["strings.bin"] = strings_end
+            columns["strings.bin"] = encoded
+            committed["shards.bin"] = shard_strings_end
+            columns["shards.bin"] = encoded_shards
+            # Bytes past the committed size are left over from an append that
+            # did not finish; they are overwritten.
+            for file_name, data in columns.items():
+                _write_at(self.path / file_name, committed[file_name], bytes(data))
+
+            record = _pack_run(
+                key,
+                rows_end + len(test_ids),
+                (len(self._names.strings), strings_end + len(encoded)),
+                (len(self._shard_names.strings), shard_strings_end + len(encoded_shards)),
+                test_run,
+                slowest_shard,
+            )
+            _write_at(self._runs_file, self._run_table_size, record)
+            self._refresh()
+        return True
+
+    def known_sources(self) -> set[str]:
+        """Fingerprints recorded with ``add_sources``."""
+        return {digest.hex() for digest in self._read_sources()[0]}
+
+    def add_sources(self, fingerprints: list[str]) -> None:
+        """Record the fingerprints of source files whose runs are stored, see ``cli.history``."""
+        if not fingerprints:
+            return
+        with self._locked():
+            known, end = self._read_sources()
+            new = b"".join({bytes.fromhex(fingerprint) for fingerprint in fingerprints} - known)
+            if new:
+                # A digest cut short by an append that did not finish is overwritten.
+                _write_at(self._sources_file, end, new)
+
+    def _read_sources(self) -> tuple[set[bytes], int]:
+        try:
+            data = self._sources_file.read_bytes()
+        except FileNotFoundError:
+            return set(), 0
+        end = len(data) // _SOURCE_SIZE * _SOURCE_SIZE
+        return {data[offset : offset + _SOURCE_SIZE] for offset in range(0, end, _SOURCE_SIZE)}, end
+
+    def _refresh(self) -> None:
+        """Read run records and names committed since the last refresh."""
+        with open(self._runs_file, "rb") as f:
+            if self._run_table_size == _HEADER.size:
+                header = f.read(_HEADER.size)
+                if len(header) < _HEADER.size or _HEADER.unpack(header)[0] != _MAGIC:
+                    raise ValueError(f"{self.path} is not a columnar test history")
+                version = _HEADER.unpack(header)[1]
+                if version != _FORMAT_VERSION:
+                    raise ValueError(
+                        f"{self.path} has columnar history format version {version}, expected {_FORMAT_VERSION}"
+                    )
+            f.seek(self._run_table_size)
+            data = f.read()
+
+        # A record cut short by an append in progress is read next time.
+        end = len(data) // _RUN.size * _RUN.size
+        new_records = [_RunRecord.unpack(data, offset) for offset in range(0, end, _RUN.size)]
+
+        # A failed append may have added names to the in-memory tables that
+        # no record commits; drop them before reading the committed ones.
+        last = self._records[-1] if self._records else None
+        self._names.truncate(last.names_end if last else 0)
+        self._shard_names.truncate(last.shard_names_end if last else 0)
+
+        if new_records:
+            self._names.read(last.strings_end if last else 0, new_records[-1].strings_end)
+            self._shard_names.read(last.shard_strings_end if last else 0, new_records[-1].shard_strings_end)
+            self._records.extend(new_records)
+            self._keys.update(record.key for record in new_records)
+            self._run_table_size += end
+
+    def suite(self, name: str = "Test Suite", start: int = 0, stop: Optional[int] = None) -> ColumnarSuite:
+        """The runs ``start:stop`` as a ColumnarSuite whose result columns map the files."""
+        self._refresh()
+        start = min(start, len(self._records))
+        records = self._records[start:stop]
+        row_start = self._records[start - 1].rows_end if start > 0 else 0
+        row_end = records[-1].rows_end if records else row_start
+
+        columns = {
+            field: _map_column(self.path / file_name, typecode, row_start, row_end)
+            for file_name, typecode, field in _COLUMNS
+        }
+        return ColumnarSuite(
+            name=name,
+            test_names=self._names.strings[: records[-1].names_end] if records else [],
+            **columns,
+            run_timestamps=[record.timestamp for record in records],
+            run_total_tests=_column(array("q", [record.total_tests for record in records])),
+            run_passed=_column(array("q", [record.passed for record in records])),
+            run_failed=_column(array("q", [record.failed for record in records])),
+            run_skipped=_column(array("q", [record.skipped for record in records])),
+            run_errors=_column(array("q", [record.errors for record in records])),
+            run_durations=_column(array("d", [record.duration for record in records])),
+            first_run=start,
+            run_shard_counts=[record.shard_count for record in records],
+            run_shard_spreads=[record.shard_spread for record in records],
+            run_slowest_shards=[
+                self._shard_names.strings[record.slowest_shard] if record.slowest_shard >= 0 else None
+                for record in records
+            ],
+        )
+
+    def _locked(self):
+        return _FileLock(self.path / "lock")
+
+
+class _StringTable:
+    """Length-prefixed UTF-8 strings stored back to back in one file, each interned to its index."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.strings: list[str] = []
+        self.ids: dict[str, int] = {}
+
+    def intern(self, string: str, new_strings: list[str]) -> int:
+        string_id = self.ids.get(string)
+        if string_id is None:
+            string_id = self.ids[string] = len(self.strings)
+            self.strings.append(string)
+            new_strings.append(string)
+        return string_id
+
+    def truncate(self, size: int) -> None:
+        for string in self.strings[size:]:
+            del self.ids[string]
+        del self.strings[size:]
+
+    def read(self, start: int, end: int) -> None:
+        """Append the strings stored between byte offsets ``start`` and ``end``."""
+        if end <= start:
+            return
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            data = f.read(end - start)
+        offset = 0
+        while offset < len(data):
+            (length,) = _STRING_LENGTH.unpack_from(data, offset)
+            offset += _STRING_LENGTH.size
+            string = data[offset : offset + length].decode()
+            offset += length
+            self.ids[string] = len(self.strings)
+            self.strings.append(string)
+
+
+class _FileLock:
+    def __init__(self, path: Path):
+        self.path = path
+        self.file = None
+
+    def __enter__(self) -> None:
+        self.file = open(self.path, "a+b")
+        if fcntl is not None:
+            fcntl.flock(self.file, fcntl.LOCK_EX)
+
+    def __exit__(self, *exc_info) -> None:
+        if fcntl is not None:
+            fcntl.flock(self.file, fcntl.LOCK_UN)
+        self.file.close()
+
+
+def _digest(run_key: str) -> bytes:
+    return hashlib.sha256(run_key.encode()).digest()
+
+
+def _write_at(path: Path, offset: int, data: bytes) -> None:
+    mode = "r+b" if path.exists() else "w+b"
+    with open(path, mode) as f:
+        f.seek(offset)
+        f.write(data)
+        f.truncate()
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _map_column(path: Path, typecode: str, row_start: int, row_end: int) -> Any:
+    itemsize = array(typecode).itemsize
+    if row_end <= row_start:
+        return _column(array(typecode))
+
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), row_end * itemsize, access=mmap.ACCESS_READ)
+    if np is not None:
+        return np.frombuffer(mapped, dtype=np.dtype(typecode), count=row_end - row_start, offset=row_start * itemsize)
+    return memoryview(mapped)[row_start * itemsize : row_end * itemsize].cast(typecode)
+
+
+def _encode_strings(strings: list[str]) -> bytes:
+    return b"".join(_STRING_LENGTH.pack(len(data)) + data for data in (string.encode() for string in strings))
+
+
+def _pack_run(
+    key: bytes,
+    rows_end: int,
+    names_end: tuple[int, int],
+    shard_names_end: tuple[int, int],
+    test_run: TestRun,
+    slowest_shard: int,
+) -> bytes:
+    timestamp_kind, timestamp_us, offset_s = _timestamp_fields(test_run.timestamp)
+    return _RUN.pack(
+        key,
+        rows_end,
+        *names_end,
+        *shard_names_end,
+        test_run.total_tests,
+        test_run.passed,
+        test_run.failed,
+        test_run.skipped,
+        test_run.errors,
+        test_run.duration,
+        timestamp_us,
+        offset_s,
+        timestamp_kind,
+        slowest_shard,
+        len(test_run.shards),
+        test_run.shard_spread,
+    )
+
+
+def _timestamp_fields(timestamp: Optional[datetime]) -> tuple[int, int, int]:
+    if timestamp is None:
+        return _NO_TIMESTAMP, 0, 0
+    offset = timestamp.utcoffset()
+    wall_clock = (timestamp.replace(tzinfo=None) - _EPOCH) // timedelta(microseconds=1)
+    if offset is None:
+        return _NAIVE_TIMESTAMP, wall_clock, 0
+    return _AWARE_TIMESTAMP, wall_clock, int(offset.total_seconds())
+
+
+def _timestamp_from_fields(kind: int, timestamp_us: int, offset_s: int) -> Optional[datetime]:
+    if kind == _NO_TIMESTAMP:
+        return None
+    wall_clock = _EPOCH + timedelta(microseconds=timestamp_us)
+    if kind == _NAIVE_TIMESTAMP:
+        return wall_clock
+    return wall_clock.replace(tzinfo=timezone(timedelta(seconds=offset_s)))
@@ -0,0 +1,424 @@
+import heapq
+import sqlite3
+from array import array
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+
+from testops_insight.analytics.engine import (
+    _ERROR,
+    _FAILED,
+    _PASSED,
+    FlakyTest,
+    FrequentFailure,
+    LastSeen,
+    RunSummary,
+    SlowTest,
+    SuiteAnalytics,
+    flaky_test,
+    slow_test,
+)
+from testops_insight.analytics.exact_sum import ExactSum
+from testops_insight.analytics.quantiles import add_duration
+from testops_insight.domain.models import STATUS_BY_CODE, TestRun
+
+SCHEMA_VERSION = 3
+
+# results is clustered by run, so appending a run writes new pages at the end
+# of the table instead of touching a page per test. The aggregates read every
+# selected row anyway and group them with a sort.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    run_key TEXT NOT NULL UNIQUE,
+    source TEXT NOT NULL,
+    ingested_at TEXT NOT NULL,
+    timestamp TEXT,
+    total_tests INTEGER NOT NULL,
+    passed INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    skipped INTEGER NOT NULL,
+    errors INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    shard_count INTEGER NOT NULL,
+    shard_spread REAL NOT NULL,
+    slowest_shard TEXT
+);
+CREATE TABLE IF NOT EXISTS tests (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS results (
+    test_id INTEGER NOT NULL REFERENCES tests (id),
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    seq INTEGER NOT NULL,
+    status INTEGER NOT NULL,
+    first_status INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    duration_sum REAL NOT NULL,
+    duration_max REAL NOT NULL,
+    occurrences INTEGER NOT NULL,
+    durations BLOB,
+    PRIMARY KEY (run_id, test_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sources (
+    fingerprint TEXT PRIMARY KEY
+) WITHOUT ROWID;
+"""
+
+# Sort key that reproduces SuiteAggregator's order among equal scores: tests
+# in the order they first appear, by run and then by position in the run.
+_FIRST_SEEN = "MIN((s.run_index << 32) + r.seq)"
+
+
+class HistoryDatabase:
+    """Test history kept in SQLite, one row per test per run.
+
+    Test names are stored once in ``tests`` and referenced by id. Each
+    ``results`` row folds every occurrence of a test in a run the way
+    ``SuiteAggregator.add_run`` does. The database runs in WAL mode and every
+    run is written in its own ``BEGIN IMMEDIATE`` transaction, so several
+    processes can append at once while others read.
+    """
+
+    def __init__(self, db_path: str | Path, timeout: float = 30.0):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.db_path, timeout=timeout, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self._test_ids: dict[str, int] = {}
+        self._create_schema()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "HistoryDatabase":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _create_schema(self) -> None:
+        connection = self.connection
+        with _write_transaction(connection):
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+            if version not in (0, 1, 2, SCHEMA_VERSION):
+                raise ValueError(f"{self.db_path} has history schema version {version}, expected {SCHEMA_VERSION}")
+            if version == 1:
+                # Version 1 rows have no per-occurrence durations; percentiles
+                # count a repeated test's occurrences at their mean.
+                connection.execute("ALTER TABLE results ADD COLUMN durations BLOB")
+            # Versions before 3 lack the sources table, which the schema below adds.
+            for statement in _SCHEMA.split(";"):
+                if statement.strip():
+                    connection.execute(statement)
+            connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def has_run(self, run_key: str) -> bool:
+        return self.connection.execute("SELECT 1 FROM runs WHERE run_key = ?", (run_key,)).fetchone() is not None
+
+    def add_run(self, run_key: str, source: str, test_run: TestRun) -> bool:
+        """Append a run; returns False if a run with ``run_key`` is already stored."""
+        contributions = _run_contributions(test_run)
+        summary = RunSummary.from_test_run(test_run).to_list()
+        connection = self.connection
+
+        with _write_transaction(connection):
+            cursor = connection.execute(
+                "INSERT INTO runs (run_key, source, ingested_at, timestamp, total_tests, passed, failed,"
+                " skipped, errors, duration, shard_count, shard_spread, slowest_shard)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (run_key) DO NOTHING",
+                (run_key, source, datetime.now().isoformat(), *summary),
+            )
+            if cursor.rowcount == 0:
+                return False
+            run_id = cursor.lastrowid
+
+            new_ids = self._intern_new(contributions)
+            cached = self._test_ids
+            connection.executemany(
+                "INSERT INTO results (test_id, run_id, seq, status, first_status, failed,"
+                " duration_sum, duration_max, occurrences, durations) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (cached[test_name] if test_name in cached else new_ids[test_name], run_id, *contribution)
+                    for test_name, contribution in contributions.items()
+                ],
+            )
+        # Ids are only cached once committed: a rolled back insert frees its ids.
+        self._test_ids.update(new_ids)
+        return True
+
+    def known_sources(self) -> set[str]:
+        """Fingerprints recorded with ``add_sources``."""
+        return {row[0] for row in self.connection.execute("SELECT fingerprint FROM sources")}
+
+    def add_sources(self, fingerprints: list[str]) -> None:
+        """Record the fingerprints of source files whose runs are stored, see ``cli.history``."""
+        if not fingerprints:
+            return
+        with _write_transaction(self.connection):
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO sources (fingerprint) VALUES (?)",
+                ((fingerprint,) for fingerprint in fingerprints),
+            )
+
+    def _intern_new(self, test_names) -> dict[str, int]:
+        """Ids of the names not cached yet, inserting the ones no process has stored."""
+        missing = [test_name for test_name in test_names if test_name not in self._test_ids]
+        if not missing:
+            return {}
+        connection = self.connection
+        connection.executemany("INSERT OR IGNORE INTO tests (name) VALUES (?)", ((name,) for name in missing))
+        return {
+            test_name: connection.execute("SELECT id FROM tests WHERE name = ?", (test_name,)).fetchone()[0]
+            for test_name in missing
+        }
+
+    def runs(self) -> list[tuple[int, RunSummary]]:
+        """Every stored run as ``(run_id, summary)``, in the order they were added."""
+        rows = self.connection.execute(
+            "SELECT id, timestamp, total_tests, passed, failed, skipped, errors, duration,"
+            " shard_count, shard_spread, slowest_shard FROM runs ORDER BY id"
+        )
+        return [(row[0], RunSummary.from_list(list(row[1:]))) for row in rows]
+
+    def aggregator(self, runs: Optional[list[tuple[int, RunSummary]]] = None) -> "HistoryAggregator":
+        """Analytics over ``runs`` from ``runs()`` (every run when None), answered by SQL queries."""
+        return HistoryAggregator(self.connection, self.runs() if runs is None else runs)
+
+
+class HistoryAggregator(SuiteAnalytics):
+    """Analytics whose per-test results stay in a HistoryDatabase.
+
+    Run summaries are loaded into memory; flaky, failure, slow-test and
+    last-seen results are computed with aggregate queries over the selected
+    runs and match what ``SuiteAggregator`` returns for the same runs.
+    """
+
+    def __init__(self, connection: sqlite3.Connection, runs: list[tuple[int, RunSummary]]):
+        self.connection = connection
+        self.runs = [summary for _, summary in runs]
+
+        connection.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS selected_runs (run_index INTEGER PRIMARY KEY, run_id INTEGER NOT NULL)"
+        )
+        # Only the temp database is written, so the history stays unlocked.
+        with _write_transaction(connection, immediate=False):
+            connection.execute("DELETE FROM selected_runs")
+            connection.executemany(
+                "INSERT INTO selected_runs (run_index, run_id) VALUES (?, ?)",
+                ((run_index, run_id) for run_index, (run_id, _) in enumerate(runs)),
+            )
+
+    def flaky_tests(self, min_runs: int = 2) -> list[FlakyTest]:
+        if self.total_runs < min_runs:
+            return []
+
+        rows = self.connection.execute(
+            f"""
+            SELECT test_id, name, passed, failed, total FROM (
+                SELECT r.test_id, SUM(r.status = ?) AS passed, SUM(r.status IN (?, ?)) AS failed,
+                       COUNT(*) AS total, {_FIRST_SEEN} AS first_seen
+                FROM results r JOIN selected_runs s ON s.run_id = r.run_id
+                GROUP BY r.test_id
+            ) JOIN tests ON tests.id = test_id
+            WHERE total >= ? AND passed > 0 AND failed > 0
+            ORDER BY MIN(passed, failed) * 1.0 / total DESC, first_seen
+            """,
+            (_PASSED, _FAILED, _ERROR, min_runs),
+        ).fetchall()
+
+        # Pass/fail history bitsets (see analytics.status_history), built for the flaky tests only.
+        outcomes = {row[0]: [0, 0] for row in rows}
+        placeholders = ", ".join("?" * len(outcomes))
+        statuses = self.connection.execute(
+            f"""
+            SELECT r.test_id, r.status
+            FROM results r JOIN selected_runs s ON s.run_id = r.run_id
+            WHERE r.test_id IN ({placeholders}) AND r.status IN (?, ?, ?)
+            ORDER BY s.run_index
+            """,
+            [*outcomes, _PASSED, _FAILED, _ERROR],
+        )
+        for test_id, status in statuses:
+            history = outcomes[test_id]
+            if status != _PASSED:
+                history[0] |= 1 << history[1]
+            history[1] += 1
+
+        return [
+            flaky_test(test_name, passed, failed, total, outcomes[test_id][0])
+            for test_id, test_name, passed, failed, total in rows
+        ]
+
+    def frequent_failures(self, min_runs: int = 1) -> list[FrequentFailure]:
+        if self.total_runs == 0:
+            return []
+
+        rows = self.connection.execute(
+            f"""
+            SELECT name, failed, total FROM (
+                SELECT r.test_id, SUM(r.status IN (?, ?)) AS failed, COUNT(*) AS total, {_FIRST_SEEN} AS first_seen
+                FROM results r JOIN selected_runs s ON s.run_id = r.run_id
+                GROUP BY r.test_id
+            ) JOIN tests ON tests.id = test_id
+            WHERE total >= ? AND failed > 0
+            ORDER BY failed * 1.0 / total DESC, failed DESC, first_seen
+            """,
+            (_FAILED, _ERROR, min_runs),
+        )
+        return [
+            FrequentFailure(
+                test_name=test_name,
+                failure_count=failed,
+                total_runs=total,
+                failure_rate=failed / total,
+            )
+            for test_name, failed, total in rows
+        ]
+
+    def slowest_tests(self, limit: int = 10) -> list[SlowTest]:
+        if self.total_runs == 0:
+            return []
+
+        connection = self.connection
+        rows = connection.execute(
+            f"""
+            SELECT test_id, name, duration_max, occurrences FROM (
+                SELECT r.test_id, MAX(r.duration_max) AS duration_max, SUM(r.occurrences) AS occurrences,
+                       {_FIRST_SEEN} AS first_seen
+                FROM results r JOIN selected_runs s ON s.run_id = r.run_id
+                GROUP BY r.test_id
+            ) JOIN tests ON tests.id = test_id
+            ORDER BY first_seen
+            """
+        ).fetchall()
+
+        # A row's duration_sum is rounded once it adds several durations, so
+        # totals are summed exactly from the stored durations, as in
+        # SuiteAggregator; SQL's SUM would add the rounded sums again.
+        totals = {row[0]: ExactSum() for row in rows}
+        results = connection.execute(
+            "SELECT r.test_id, r.duration_sum, r.durations FROM results r JOIN selected_runs s ON s.run_id = r.run_id"
+        )
+        for test_id, duration_sum, packed in results:
+            total = totals[test_id]
+            if packed is None:
+                total.add(duration_sum)
+            else:
+                for duration in array("d", packed):
+                    total.add(duration)
+
+        # nlargest keeps first-seen order among equal averages, like a stable sort.
+        rows = heapq.nlargest(
+            limit,
+            (
+                (totals[test_id].value(), test_id, name, duration_max, occurrences)
+                for test_id, name, duration_max, occurrences in rows
+            ),
+            key=lambda row: row[0] / row[4],
+        )
+
+        # Percentiles need each duration again, but only those of the selected tests.
+        buckets = {row[1]: {} for row in rows}
+        placeholders = ", ".join("?" * len(buckets))
+        durations = self.connection.execute(
+            f"""
+            SELECT r.test_id, r.duration_sum, r.occurrences, r.durations
+            FROM results r JOIN selected_runs s ON s.run_id = r.run_id
+            WHERE r.test_id IN ({placeholders})
+            ORDER BY s.run_index
+            """,
+            list(buckets),
+        )
+        for test_id, duration_sum, occurrences, packed in durations:
+            if packed is not None:
+                for duration in array("d", packed):
+                    add_duration(buckets[test_id], duration)
+            else:
+                for _ in range(occurrences):
+                    add_duration(buckets[test_id], duration_sum / occurrences)
+
+        return [
+            slow_test(test_name, duration_sum, occurrences, duration_max, buckets[test_id])
+            for duration_sum, test_id, test_name, duration_max, occurrences in rows
+        ]
+
+    def last_seen_index(self) -> dict[str, LastSeen]:
+        connection = self.connection
+        # With a single MAX() aggregate, SQLite takes the bare first_status
+        # column from the row holding the maximum, i.e. the test's last run.
+        last_runs = connection.execute(
+            """
+            SELECT name, MAX(s.run_index), r.first_status
+            FROM results r JOIN selected_runs s ON s.run_id = r.run_id JOIN tests ON tests.id = r.test_id
+            GROUP BY r.test_id
+            """
+        ).fetchall()
+        last_failed = dict(
+            connection.execute(
+                """
+                SELECT name, MAX(s.run_index)
+                FROM results r JOIN selected_runs s ON s.run_id = r.run_id JOIN tests ON tests.id = r.test_id
+                WHERE r.failed
+                GROUP BY r.test_id
+                """
+            ).fetchall()
+        )
+
+        index = {}
+        for test_name, run_index, status in last_runs:
+            failed_run = last_failed.get(test_name)
+            index[test_name] = LastSeen(
+                status=STATUS_BY_CODE[status].name,
+                run_index=run_index,
+                last_failed=self.runs[failed_run].timestamp if failed_run is not None else None,
+            )
+        return index
+
+
+def _run_contributions(test_run: TestRun) -> dict[str, list]:
+    """Per test: position, last and first status, any failure, duration sum, max and count.
+
+    A test that occurs more than once also gets its durations, packed as doubles.
+    """
+    contributions: dict[str, list] = {}
+    for seq, test_case in enumerate(test_run.test_cases):
+        test_name = test_case.identity.full_name
+        status = test_case.status_code
+        duration = test_case.duration
+        failed = status == _FAILED or status == _ERROR
+        contribution = contributions.get(test_name)
+        if contribution is None:
+            contributions[test_name] = [seq, status, status, failed, duration, duration, 1, None]
+        else:
+            if contribution[7] is None:
+                # The sum still holds just the first duration.
+                contribution[7] = array("d", [contribution[4]])
+            contribution[7].append(duration)
+            contribution[1] = status
+            contribution[3] = contribution[3] or failed
+            contribution[4] += duration
+            contribution[5] = max(contribution[5], duration)
+            contribution[6] += 1
+    for contribution in contributions.values():
+        if contribution[7] is not None:
+            contribution[7] = contribution[7].tobytes()
+    return contributions
+
+
+@contextmanager
+def _write_transaction(connection: sqlite3.Connection, immediate: bool = True) -> Iterator[None]:
+    # BEGIN IMMEDIATE takes the write lock up front, so a writer waits for
+    # others (up to the connection timeout) instead of failing when it
+    # upgrades a read lock halfway through.
+    connection.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+    try:
+        yield
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    connection.execute("COMMIT")
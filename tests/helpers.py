@@ -0,0 +1,60 @@
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+from testops_insight.cli.main import main
+from testops_insight.domain.models import TestCase, TestRun, TestStatus
+
+STATUS_CYCLE = [TestStatus.PASSED, TestStatus.FAILED, TestStatus.PASSED, TestStatus.ERROR, TestStatus.SKIPPED]
+RANDOM_STATUSES = [TestStatus.PASSED] * 4 + [TestStatus.FAILED, TestStatus.ERROR, TestStatus.SKIPPED]
+
+
+def make_run(run_idx, tests=6, timestamp=None, rng=None, presence=1.0):
+    """A run whose statuses and durations vary with ``run_idx``, with test_0 retried once.
+
+    With a ``random.Random`` as ``rng`` they are drawn from it instead: each
+    test is kept with probability ``presence`` and test_0 is retried in about
+    a third of the runs.
+    """
+    test_cases = []
+    for idx in range(tests):
+        if rng is None:
+            status = STATUS_CYCLE[(run_idx * (idx + 1)) % len(STATUS_CYCLE)]
+            duration = 0.25 * ((run_idx + idx) % 4)
+        elif rng.random() < presence:
+            status = rng.choice(RANDOM_STATUSES)
+            duration = 0.25 * rng.randint(0, 20)
+        else:
+            continue
+        test_cases.append(TestCase(name=f"test_{idx}", classname="pkg.Module", status=status, duration=duration))
+    # A retried test appears twice in the same run.
+    if rng is None:
+        test_cases.append(TestCase(name="test_0", classname="pkg.Module", status=TestStatus.PASSED, duration=1.5))
+    elif rng.random() < 0.3:
+        test_cases.append(
+            TestCase(name="test_0", classname="pkg.Module", status=rng.choice(RANDOM_STATUSES), duration=9.0)
+        )
+    if timestamp is None:
+        timestamp = datetime(2024, 1, 1) + timedelta(hours=run_idx)
+    return TestRun.from_test_cases(test_cases, timestamp)
+
+
+def write_run(runs_path, run_name, statuses):
+    """Write ``run_name/junit.xml`` with one test per character of ``statuses`` (P, F or S)."""
+    cases = []
+    for idx, status in enumerate(statuses):
+        body = "<failure/>" if status == "F" else "<skipped/>" if status == "S" else ""
+        cases.append(f'<testcase classname="ClassA" name="test{idx}" time="0.{idx + 1}">{body}</testcase>')
+    run_dir = runs_path / run_name
+    run_dir.mkdir(parents=True)
+    (run_dir / "junit.xml").write_text(
+        f'<testsuite name="Suite" timestamp="2024-01-0{run_name[-1]}T10:00:00">{"".join(cases)}</testsuite>'
+    )
+
+
+def run_cli(monkeypatch, *args):
+    monkeypatch.setattr(sys, "argv", ["testops-insights", *args])
+    with pytest.raises(SystemExit) as excinfo:
+        main()
+    return excinfo.value.code
@@ -0,0 +1,154 @@
+import json
+import struct
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from testops_insight.analytics import SuiteAggregator, SuiteAnalytics, vectorized
+from testops_insight.analytics.vectorized import ColumnarAggregator
+from testops_insight.domain import columnar
+from testops_insight.domain.models import ShardSummary, TestSuite
+from testops_insight.storage import ColumnarHistory, columnar_history
+from tests import helpers
+from tests.helpers import run_cli, write_run
+
+TIMESTAMPS = [
+    datetime(2024, 1, 1, 10, 30),
+    datetime(2024, 1, 2, 8, 0, 0, 123456, tzinfo=timezone(timedelta(hours=3))),
+    datetime(2024, 1, 3, 23, 59, 59),
+]
+
+
+def make_run(run_idx, tests=6):
+    test_run = helpers.make_run(run_idx, tests, TIMESTAMPS[run_idx % len(TIMESTAMPS)])
+    if run_idx % 2:
+        test_run.shards = [ShardSummary("junit-0.xml", 3, 1.0), ShardSummary("junit-1.xml", 4, 2.5)]
+    return test_run
+
+
+@pytest.fixture(params=["numpy", "pure-python"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        if columnar.np is None:
+            pytest.skip("numpy is not installed")
+    else:
+        monkeypatch.setattr(columnar, "np", None)
+        monkeypatch.setattr(vectorized, "np", None)
+        monkeypatch.setattr(columnar_history, "np", None)
+    return request.param
+
+
+def assert_same_analytics(aggregator, expected):
+    assert aggregator.runs == expected.runs
+    assert aggregator.flaky_tests() == pytest.approx(expected.flaky_tests())
+    assert aggregator.frequent_failures() == pytest.approx(expected.frequent_failures())
+    assert aggregator.slowest_tests(3) == pytest.approx(expected.slowest_tests(3))
+    assert aggregator.pass_rate_trend() == expected.pass_rate_trend()
+    assert aggregator.health_score() == expected.health_score()
+    assert aggregator.last_seen_index() == expected.last_seen_index()
+
+
+def test_columnar_history_matches_suite_aggregator(tmp_path, backend):
+    runs = [make_run(idx, tests=4 + idx % 3) for idx in range(12)]
+    history = ColumnarHistory(tmp_path / "history")
+    for idx, run in enumerate(runs):
+        assert history.add_run(f"run-{idx}", "source", run)
+
+    reopened = ColumnarHistory(tmp_path / "history")
+    assert reopened.total_runs == 12
+    suite = reopened.suite("s")
+    expected = columnar.ColumnarSuite.from_test_suite(TestSuite(name="s", test_runs=runs))
+    assert suite.test_names == expected.test_names
+    assert list(suite.test_ids) == list(expected.test_ids)
+    assert suite.run_slowest_shards == [run.slowest_shard.file if run.shards else None for run in runs]
+    for column in ("run_ids", "statuses", "durations"):
+        assert list(getattr(suite, column)) == list(getattr(expected, column))
+    assert suite.run_timestamps == [run.timestamp for run in runs]
+
+    assert_same_analytics(ColumnarAggregator(suite), SuiteAggregator.from_suite(TestSuite(name="s", test_runs=runs)))
+    assert isinstance(ColumnarAggregator(suite), SuiteAnalytics)
+    assert not hasattr(ColumnarAggregator(suite), "add_run")
+
+    window = ColumnarAggregator(reopened.suite("s", start=7))
+    expected_window = SuiteAggregator.from_suite(TestSuite(name="s", test_runs=runs[7:]))
+    assert window.runs == expected_window.runs
+    assert window.last_seen_index() == expected_window.last_seen_index()
+    assert sorted(window.flaky_tests()) == sorted(expected_window.flaky_tests())
+
+
+def test_append_writes_only_the_new_rows(tmp_path):
+    history = ColumnarHistory(tmp_path)
+    history.add_run("a", "source", make_run(0, tests=5))
+    before = {path.name: path.read_bytes() for path in tmp_path.iterdir()}
+
+    assert not history.add_run("a", "source", make_run(1))
+    assert history.add_run("b", "source", make_run(1, tests=5))
+
+    after = {path.name: path.read_bytes() for path in tmp_path.iterdir()}
+    for name in ("test_ids.i32", "run_ids.i32", "statuses.i8", "durations.f64"):
+        assert after[name].startswith(before[name])
+    assert len(after["durations.f64"]) - len(before["durations.f64"]) == 6 * 8
+    assert ColumnarHistory(tmp_path).total_runs == 2
+
+
+def test_unfinished_append_is_ignored_and_overwritten(tmp_path):
+    history = ColumnarHistory(tmp_path)
+    history.add_run("a", "source", make_run(0))
+    committed = history.suite()
+
+    # A writer that died after writing rows and half a run record.
+    for name in ("test_ids.i32", "run_ids.i32", "durations.f64", "strings.bin", "shards.bin"):
+        with open(tmp_path / name, "ab") as f:
+            f.write(b"\xff" * 40)
+    with open(tmp_path / "runs.bin", "ab") as f:
+        f.write(b"\xff" * 10)
+
+    reopened = ColumnarHistory(tmp_path)
+    assert reopened.total_runs == 1
+    assert list(reopened.suite().test_ids) == list(committed.test_ids)
+
+    assert reopened.add_run("b", "source", make_run(1))
+    assert ColumnarHistory(tmp_path).suite().run_slowest_shards == [None, "junit-1.xml"]
+    runs = [make_run(0), make_run(1)]
+    expected = SuiteAggregator.from_suite(TestSuite(name="s", test_runs=runs))
+    assert ColumnarAggregator(ColumnarHistory(tmp_path).suite()).last_seen_index() == expected.last_seen_index()
+
+
+def test_other_format_version_is_rejected(tmp_path):
+    ColumnarHistory(tmp_path)
+    runs_file = tmp_path / "runs.bin"
+    runs_file.write_bytes(runs_file.read_bytes().replace(struct.pack("<I", 2), struct.pack("<I", 1), 1))
+    with pytest.raises(ValueError, match="format version 1"):
+        ColumnarHistory(tmp_path)
+
+
+def test_ingest_and_analyze_columnar_match_analyze(tmp_path, monkeypatch):
+    runs_path = tmp_path / "runs"
+    write_run(runs_path, "run_1", "PPFS")
+    write_run(runs_path, "run_2", "PFPP")
+    write_run(runs_path, "run_3", "FFPP")
+    monkeypatch.chdir(tmp_path)
+
+    history = str(tmp_path / "history")
+    assert run_cli(monkeypatch, "ingest", "--runs-path", str(runs_path), "--columnar", history, "--no-cache") == 0
+    assert run_cli(monkeypatch, "analyze", "--columnar", history, "--out", "from-history") == 0
+    assert run_cli(monkeypatch, "analyze", "--runs-path", str(runs_path), "--out", "from-dir", "--no-cache") == 0
+
+    from_history = json.loads((tmp_path / "from-history" / "metrics.json").read_text())
+    from_dir = json.loads((tmp_path / "from-dir" / "metrics.json").read_text())
+    del from_history["generated_at"], from_dir["generated_at"]
+    assert from_history == from_dir
+
+
+def test_recorded_sources_survive_reopening_and_torn_appends(tmp_path):
+    fingerprints = [f"{idx:064x}" for idx in range(3)]
+    history = ColumnarHistory(tmp_path)
+    history.add_sources(fingerprints[:2])
+    with open(tmp_path / "sources.bin", "ab") as f:
+        f.write(b"\xff" * 5)
+
+    reopened = ColumnarHistory(tmp_path)
+    assert reopened.known_sources() == set(fingerprints[:2])
+    reopened.add_sources(fingerprints[1:])
+    assert ColumnarHistory(tmp_path).known_sources() == set(fingerprints)
+    assert (tmp_path / "sources.bin").stat().st_size == 3 * 32
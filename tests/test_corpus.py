@@ -0,0 +1,45 @@
+import pytest
+
+from benchmarks.corpus import CorpusSpec, run_documents, write_corpus
+from testops_insight.cli.discovery import discover_test_runs
+from testops_insight.domain.models import TestStatus
+
+
+def test_same_spec_writes_same_bytes(tmp_path):
+    spec = CorpusSpec(runs=3, tests_per_run=40, seed=7)
+    write_corpus(tmp_path / "a", spec)
+    write_corpus(tmp_path / "b", spec)
+
+    files_a = sorted(p.relative_to(tmp_path / "a") for p in (tmp_path / "a").rglob("*.xml"))
+    files_b = sorted(p.relative_to(tmp_path / "b") for p in (tmp_path / "b").rglob("*.xml"))
+    assert files_a == files_b
+    assert all((tmp_path / "a" / f).read_bytes() == (tmp_path / "b" / f).read_bytes() for f in files_a)
+    assert run_documents(spec, 1) != run_documents(CorpusSpec(runs=3, tests_per_run=40, seed=8), 1)
+
+
+def test_run_contents_do_not_depend_on_run_count():
+    assert run_documents(CorpusSpec(runs=2), 1) == run_documents(CorpusSpec(runs=50), 1)
+
+
+def test_corpus_shape_follows_spec(tmp_path):
+    spec = CorpusSpec(runs=4, tests_per_run=200, failure_rate=0.1, flake_rate=0.0, message_bytes=300, shards=3)
+    write_corpus(tmp_path, spec)
+
+    assert sorted(p.name for p in (tmp_path / "run_00000").iterdir()) == ["junit-0.xml", "junit-1.xml", "junit-2.xml"]
+
+    runs = [run for _, run in discover_test_runs(tmp_path)]
+    assert len(runs) == 4
+    assert all(run.total_tests == 200 for run in runs)
+
+    # Without flaky tests the same tests fail in every run.
+    failing = [{tc.full_name for tc in run.test_cases if tc.status == TestStatus.FAILED} for run in runs]
+    assert failing[0] and all(names == failing[0] for names in failing)
+    messages = [tc.message for tc in runs[0].test_cases if tc.status == TestStatus.FAILED]
+    assert messages and all(len(message) == 300 for message in messages)
+
+
+def test_invalid_spec_is_rejected():
+    with pytest.raises(ValueError):
+        CorpusSpec(failure_rate=0.8, flake_rate=0.5)
+    with pytest.raises(ValueError):
+        CorpusSpec(shards=0)
@@ -0,0 +1,291 @@
+import bz2
+import gzip
+import io
+import lzma
+import multiprocessing
+import tarfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from testops_insight.analytics import SuiteAggregator
+from testops_insight.cli import discovery
+from testops_insight.cli.discovery import discover_test_runs, stream_test_runs
+from testops_insight.ingestion import ParseCache, sources
+
+
+def write_run(
+    runs_path: Path,
+    run_name: str,
+    statuses: list[str],
+    filename: str = "junit.xml",
+    timestamp: str = "2024-01-01T10:00:00",
+) -> Path:
+    cases = []
+    for idx, status in enumerate(statuses):
+        body = '<failure message="failed"/>' if status == "failed" else ""
+        cases.append(f'<testcase classname="ClassA" name="test{idx}" time="0.5">{body}</testcase>')
+
+    run_dir = runs_path / run_name
+    run_dir.mkdir(parents=True, exist_ok=True)
+    xml_file = run_dir / filename
+    xml_file.write_text(
+        f'<testsuite name="Suite" timestamp="{timestamp}">{"".join(cases)}</testsuite>',
+        encoding="utf-8",
+    )
+    return xml_file
+
+
+def test_discover_runs_in_directory_order(tmp_path):
+    write_run(tmp_path, "run_002", ["passed"])
+    write_run(tmp_path, "run_001", ["passed", "failed"])
+    (tmp_path / "notes.txt").write_text("not a run")
+
+    runs = discover_test_runs(tmp_path)
+
+    assert [xml_path.parent.name for xml_path, _ in runs] == ["run_001", "run_002"]
+    assert runs[0][1].total_tests == 2
+    assert runs[0][1].failed == 1
+
+
+def test_discover_skips_unparseable_files(tmp_path):
+    write_run(tmp_path, "run_001", ["passed"])
+    bad_dir = tmp_path / "run_002"
+    bad_dir.mkdir()
+    (bad_dir / "junit.xml").write_text("<testsuite><testcase")
+
+    runs = discover_test_runs(tmp_path)
+
+    assert [xml_path.parent.name for xml_path, _ in runs] == ["run_001"]
+
+
+def test_discover_last_n(tmp_path):
+    for idx in range(5):
+        write_run(tmp_path, f"run_{idx:03d}", ["passed"])
+
+    runs = discover_test_runs(tmp_path, last_n=2)
+
+    assert [xml_path.parent.name for xml_path, _ in runs] == ["run_003", "run_004"]
+
+
+def test_discover_with_jobs_matches_serial(tmp_path):
+    for idx in range(6):
+        write_run(tmp_path, f"run_{idx:03d}", ["passed", "failed"][: idx % 2 + 1])
+    bad_dir = tmp_path / "run_003"
+    (bad_dir / "junit.xml").write_text("not xml")
+
+    serial = discover_test_runs(tmp_path)
+    parallel = discover_test_runs(tmp_path, jobs=2)
+
+    assert [path for path, _ in parallel] == [path for path, _ in serial]
+    assert [run.test_cases for _, run in parallel] == [run.test_cases for _, run in serial]
+    assert len(parallel) == 5
+
+
+def test_discover_last_n_parses_only_window(tmp_path, monkeypatch):
+    for idx in range(6):
+        write_run(tmp_path, f"run_{idx:03d}", ["passed"])
+    (tmp_path / "run_004" / "junit.xml").write_text("not xml")
+
+    parsed = []
+    original_parse = discovery.parse_junit_xml
+
+    def counting_parse(xml_file, **kwargs):
+        parsed.append(xml_file.parent.name)
+        return original_parse(xml_file, **kwargs)
+
+    monkeypatch.setattr(discovery, "parse_junit_xml", counting_parse)
+    runs = discover_test_runs(tmp_path, last_n=3)
+
+    assert [xml_path.parent.name for xml_path, _ in runs] == ["run_002", "run_003", "run_005"]
+    assert sorted(parsed) == ["run_002", "run_003", "run_004", "run_005"]
+
+
+def test_discover_time_window_reads_headers_only(tmp_path, monkeypatch):
+    write_run(tmp_path, "run_001", ["passed"], timestamp="2024-01-01T10:00:00")
+    write_run(tmp_path, "run_002", ["failed"], timestamp="2024-01-05T10:00:00")
+    write_run(tmp_path, "run_003", ["passed"], timestamp="2024-01-09T10:00:00Z")
+    no_timestamp = tmp_path / "run_004"
+    no_timestamp.mkdir()
+    (no_timestamp / "junit.xml").write_text('<testsuite name="Suite"><testcase name="t"/></testsuite>')
+
+    parsed = []
+    original_parse = discovery.parse_junit_xml
+
+    def counting_parse(xml_file, **kwargs):
+        parsed.append(xml_file.parent.name)
+        return original_parse(xml_file, **kwargs)
+
+    monkeypatch.setattr(discovery, "parse_junit_xml", counting_parse)
+    runs = discover_test_runs(
+        tmp_path,
+        since=datetime(2024, 1, 2),
+        until=datetime(2024, 1, 10, tzinfo=timezone.utc),
+    )
+
+    assert [xml_path.parent.name for xml_path, _ in runs] == ["run_002", "run_003"]
+    assert parsed == ["run_002", "run_003"]
+
+
+def test_discover_merges_shard_files(tmp_path):
+    write_run(tmp_path, "run_001", ["passed", "failed"], filename="junit-1.xml")
+    write_run(tmp_path, "run_001", ["passed"] * 4, filename="junit-0.xml")
+    write_run(tmp_path, "run_001", ["failed"], filename="junit-2.xml")
+    (tmp_path / "run_001" / "junit-3.xml").write_text("not xml")
+
+    runs = discover_test_runs(tmp_path)
+
+    assert len(runs) == 1
+    xml_path, test_run = runs[0]
+    assert xml_path.name == "junit-0.xml"
+    assert test_run.total_tests == 7
+    assert (test_run.passed, test_run.failed) == (5, 2)
+    assert test_run.duration == pytest.approx(3.5)
+    assert [shard.file for shard in test_run.shards] == ["junit-0.xml", "junit-1.xml", "junit-2.xml"]
+    assert test_run.slowest_shard.file == "junit-0.xml"
+    assert test_run.shard_spread == pytest.approx(1.5)
+
+
+def test_discover_shards_with_jobs_matches_serial(tmp_path):
+    for shard in range(5):
+        write_run(tmp_path, "run_001", ["passed", "failed"][: shard % 2 + 1], filename=f"junit-{shard}.xml")
+    write_run(tmp_path, "run_002", ["passed"])
+
+    serial = discover_test_runs(tmp_path)
+    parallel = discover_test_runs(tmp_path, jobs=3)
+
+    assert [path for path, _ in parallel] == [path for path, _ in serial]
+    assert [run.test_cases for _, run in parallel] == [run.test_cases for _, run in serial]
+    assert [run.shards for _, run in parallel] == [run.shards for _, run in serial]
+    assert len(parallel[0][1].shards) == 5
+
+
+def _junit_bytes(statuses: list[str], timestamp: str = "2024-01-01T10:00:00") -> bytes:
+    cases = []
+    for idx, status in enumerate(statuses):
+        body = '<failure message="failed"/>' if status == "failed" else ""
+        cases.append(f'<testcase classname="ClassA" name="test{idx}" time="0.5">{body}</testcase>')
+    return f'<testsuite name="Suite" timestamp="{timestamp}">{"".join(cases)}</testsuite>'.encode("utf-8")
+
+
+def test_discover_compressed_run_files(tmp_path):
+    (tmp_path / "run_001").mkdir()
+    with gzip.open(tmp_path / "run_001" / "junit.xml.gz", "wb") as f:
+        f.write(_junit_bytes(["passed", "failed"]))
+    (tmp_path / "run_002").mkdir()
+    with bz2.open(tmp_path / "run_002" / "junit-0.xml.bz2", "wb") as f:
+        f.write(_junit_bytes(["passed"]))
+    with lzma.open(tmp_path / "run_002" / "junit-1.xml.xz", "wb") as f:
+        f.write(_junit_bytes(["failed"]))
+
+    runs = discover_test_runs(tmp_path)
+
+    assert [xml_path.parent.name for xml_path, _ in runs] == ["run_001", "run_002"]
+    assert [(run.passed, run.failed) for _, run in runs] == [(1, 1), (1, 1)]
+    assert len(runs[1][1].shards) == 2
+
+
+@pytest.mark.parametrize("archive_name", ["day.tar.gz", "day.zip"])
+def test_discover_archive_member_directories(tmp_path, archive_name):
+    members = {
+        "run_002/junit.xml": _junit_bytes(["failed"], "2024-01-02T10:00:00"),
+        "run_001/junit-0.xml": _junit_bytes(["passed"], "2024-01-01T10:00:00"),
+        "run_001/junit-1.xml": _junit_bytes(["passed", "failed"], "2024-01-01T10:00:00"),
+        "run_001/notes.txt": b"ignored",
+    }
+    archive_path = tmp_path / archive_name
+    if archive_name.endswith(".zip"):
+        with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED) as archive:
+            for name, data in members.items():
+                archive.writestr(name, data)
+    else:
+        with tarfile.open(archive_path, "w:gz") as archive:
+            for name, data in members.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+    write_run(tmp_path, "run_003", ["passed"], timestamp="2024-01-03T10:00:00")
+
+    runs = discover_test_runs(tmp_path)
+    parallel = discover_test_runs(tmp_path, jobs=2, cache=ParseCache(tmp_path / ".cache"))
+    cached = discover_test_runs(tmp_path, jobs=2, cache=ParseCache(tmp_path / ".cache"))
+    windowed = discover_test_runs(tmp_path, since=datetime(2024, 1, 2))
+
+    assert [xml_path.parent.name for xml_path, _ in runs] == ["run_001", "run_002", "run_003"]
+    assert str(runs[0][0]) == f"{archive_path}!run_001/junit-0.xml"
+    assert [run.total_tests for _, run in runs] == [3, 1, 1]
+    assert [run.test_cases for _, run in parallel] == [run.test_cases for _, run in runs]
+    assert [run.test_cases for _, run in cached] == [run.test_cases for _, run in runs]
+    assert [xml_path.parent.name for xml_path, _ in windowed] == ["run_002", "run_003"]
+
+
+def _open_archive_count() -> int:
+    return len(sources._open_archives)
+
+
+@pytest.mark.parametrize("archive_name", ["day.tar", "day.zip"])
+def test_discover_archive_with_jobs_matches_serial(tmp_path, archive_name):
+    members = {
+        f"run_{idx:03d}/junit.xml": _junit_bytes(["passed", "failed"][: idx % 2 + 1], "2024-01-01T10:00:00")
+        for idx in range(40)
+    }
+    archive_path = tmp_path / archive_name
+    if archive_name.endswith(".zip"):
+        with zipfile.ZipFile(archive_path, "w") as archive:
+            for name, data in members.items():
+                archive.writestr(name, data)
+    else:
+        with tarfile.open(archive_path, "w") as archive:
+            for name, data in members.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+
+    serial = discover_test_runs(tmp_path)
+    parallel = discover_test_runs(tmp_path, jobs=4)
+    # The parent keeps the archive open; forked workers must not share it.
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("fork")) as executor:
+        worker_archives = executor.submit(_open_archive_count).result()
+
+    assert len(serial) == 40
+    assert [path for path, _ in parallel] == [path for path, _ in serial]
+    assert [run.test_cases for _, run in parallel] == [run.test_cases for _, run in serial]
+    assert _open_archive_count() > 0
+    assert worker_archives == 0
+
+
+def test_discover_skips_corrupt_archive(tmp_path):
+    (tmp_path / "broken.zip").write_bytes(b"not a zip")
+    write_run(tmp_path, "run_001", ["passed"])
+
+    runs = discover_test_runs(tmp_path)
+
+    assert [xml_path.parent.name for xml_path, _ in runs] == ["run_001"]
+
+
+def describe_total(test_run) -> int:
+    return test_run.total_tests
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+@pytest.mark.parametrize("last_n", [None, 3])
+def test_stream_matches_discover(tmp_path, jobs, last_n):
+    for idx in range(7):
+        write_run(tmp_path, f"run_{idx:03d}", ["passed", "failed", "passed"][: idx % 3 + 1])
+    (tmp_path / "run_005" / "junit.xml").write_text("not xml")
+    (tmp_path / "run_006" / "junit.xml").write_text("not xml")
+
+    runs = discover_test_runs(tmp_path, last_n)
+    expected = SuiteAggregator()
+    for _, test_run in runs:
+        expected.add_run(test_run)
+
+    aggregator, parsed = stream_test_runs(
+        tmp_path, last_n, jobs=jobs, cache=ParseCache(tmp_path / ".cache"), describe=describe_total
+    )
+
+    assert aggregator.to_dict() == expected.to_dict()
+    assert parsed == [(xml_path, test_run.total_tests) for xml_path, test_run in runs]
@@ -0,0 +1,164 @@
+import math
+from datetime import datetime
+
+import pytest
+
+from testops_insight.analytics import (
+    SuiteAggregator,
+    analyze_suite,
+    calculate_health_score,
+    detect_flaky_tests,
+    get_frequent_failures,
+    get_pass_rate_trend,
+    get_slowest_tests,
+)
+from testops_insight.analytics.exact_sum import ExactSum
+from testops_insight.domain.models import TestCase, TestRun, TestSuite, TestStatus
+
+
+def create_test_case(name: str, classname: str, status: TestStatus, duration: float = 1.0) -> TestCase:
+    return TestCase(
+        name=name,
+        classname=classname,
+        status=status,
+        duration=duration,
+    )
+
+
+class CountingList(list):
+    iterations = 0
+
+    def __iter__(self):
+        CountingList.iterations += 1
+        return super().__iter__()
+
+
+def build_suite() -> TestSuite:
+    return TestSuite(
+        name="TestSuite",
+        test_runs=[
+            TestRun.from_test_cases(
+                [
+                    create_test_case("test1", "ClassA", TestStatus.PASSED, duration=2.0),
+                    create_test_case("test2", "ClassA", TestStatus.FAILED, duration=1.0),
+                    create_test_case("test3", "ClassB", TestStatus.SKIPPED, duration=0.0),
+                ],
+                timestamp=datetime(2024, 1, 1, 10, 0),
+            ),
+            TestRun.from_test_cases(
+                [
+                    create_test_case("test1", "ClassA", TestStatus.FAILED, duration=4.0),
+                    create_test_case("test2", "ClassA", TestStatus.ERROR, duration=1.5),
+                ],
+                timestamp=datetime(2024, 1, 1, 11, 0),
+            ),
+            TestRun.from_test_cases(
+                [
+                    create_test_case("test1", "ClassA", TestStatus.PASSED, duration=3.0),
+                    create_test_case("test2", "ClassA", TestStatus.PASSED, duration=0.5),
+                ],
+                timestamp=datetime(2024, 1, 1, 12, 0),
+            ),
+        ],
+    )
+
+
+def test_analyze_suite_matches_individual_functions():
+    suite = build_suite()
+    result = analyze_suite(suite, slow_limit=20)
+
+    assert result.health_score == calculate_health_score(suite)
+    assert result.flaky_tests == detect_flaky_tests(suite)
+    assert result.frequent_failures == get_frequent_failures(suite)
+    assert result.slow_tests == get_slowest_tests(suite, limit=20)
+    assert result.trends == get_pass_rate_trend(suite)
+
+
+def test_analyze_suite_single_pass():
+    suite = build_suite()
+    for test_run in suite.test_runs:
+        test_run.test_cases = CountingList(test_run.test_cases)
+    CountingList.iterations = 0
+
+    analyze_suite(suite)
+
+    assert CountingList.iterations == len(suite.test_runs)
+
+
+def test_duplicate_results_in_run_keep_last_status():
+    suite = TestSuite(
+        name="TestSuite",
+        test_runs=[
+            TestRun.from_test_cases(
+                [
+                    create_test_case("test1", "ClassA", TestStatus.FAILED, duration=1.0),
+                    create_test_case("test1", "ClassA", TestStatus.PASSED, duration=3.0),
+                ],
+                timestamp=datetime(2024, 1, 1, 10, 0),
+            ),
+            TestRun.from_test_cases(
+                [create_test_case("test1", "ClassA", TestStatus.FAILED, duration=2.0)],
+                timestamp=datetime(2024, 1, 1, 11, 0),
+            ),
+        ],
+    )
+
+    aggregator = SuiteAggregator.from_suite(suite)
+    flaky = aggregator.flaky_tests()
+    slow = aggregator.slowest_tests()
+
+    assert flaky[0].pass_count == 1
+    assert flaky[0].fail_count == 1
+    assert flaky[0].total_runs == 2
+    assert slow[0].total_runs == 3
+    assert slow[0].avg_duration == pytest.approx(2.0)
+    assert slow[0].max_duration == 3.0
+
+
+def test_merging_partials_in_run_order_matches_serial():
+    durations = [0.1, 0.2, 0.7, 0.3]
+    runs = [
+        TestRun.from_test_cases(
+            [
+                create_test_case("test1", "ClassA", [TestStatus.PASSED, TestStatus.FAILED][idx % 2], duration),
+                create_test_case(f"test{idx + 2}", "ClassB", TestStatus.ERROR, duration=duration / 3),
+            ],
+            timestamp=datetime(2024, 1, 1, idx),
+        )
+        for idx, duration in enumerate(durations)
+    ]
+    serial = SuiteAggregator.from_suite(TestSuite(name="TestSuite", test_runs=runs))
+
+    for slices in [[(0, 1), (1, 4)], [(0, 2), (2, 3), (3, 4)]]:
+        merged = SuiteAggregator()
+        for start, stop in slices:
+            merged.merge(SuiteAggregator.from_suite(TestSuite(name="TestSuite", test_runs=runs[start:stop])))
+
+        assert merged.result(slow_limit=20) == serial.result(slow_limit=20)
+        assert merged.last_seen_index() == serial.last_seen_index()
+    # Exactly the correctly rounded total, whichever way the runs were split.
+    assert serial.slowest_tests(1)[0].avg_duration == math.fsum(durations) / 4
+
+
+def test_exact_sum_adds_merges_and_removes_exactly():
+    values = [0.1, 0.2, 0.7, 1e16, 3.3, -1e16, 0.3]
+    first, second = ExactSum(), ExactSum()
+    for value in values[:3]:
+        first.add(value)
+    for value in values[3:]:
+        second.add(value)
+
+    first.merge(second)
+    assert first.value() == math.fsum(values)
+
+    first.subtract(second)
+    first.remove(0.2)
+    assert first.value() == math.fsum([0.1, 0.7])
+
+    first.add(math.inf)
+    assert first.value() == math.inf
+    first.add(-math.inf)
+    assert math.isnan(first.value())
+    first.remove(math.inf)
+    first.remove(-math.inf)
+    assert ExactSum.from_list(first.to_list()).value() == math.fsum([0.1, 0.7])
@@ -156,3 +156,63 @@ def test_empty_test_suite():
 
     assert len(flaky) == 0
 
+
+
+def build_history(outcomes: str) -> TestSuite:
+    statuses = {"P": TestStatus.PASSED, "F": TestStatus.FAILED, "S": TestStatus.SKIPPED}
+    return TestSuite(
+        name="TestSuite",
+        test_runs=[
+            TestRun.from_test_cases(
+                [create_test_case("test1", "ClassA", statuses[outcome])],
+                timestamp=datetime(2024, 1, 1, 10, 0),
+            )
+            for outcome in outcomes
+        ],
+    )
+
+
+def test_flip_rate_and_fail_streak():
+    streak = detect_flaky_tests(build_history("PPFFSFFPP"))[0]
+    alternating = detect_flaky_tests(build_history("PFPFSPFPF"))[0]
+
+    assert streak.flakiness_rate == alternating.flakiness_rate
+    assert streak.flip_rate == pytest.approx(2 / 7)
+    # Skipped runs are left out of the pass/fail history.
+    assert streak.longest_fail_streak == 4
+    assert alternating.flip_rate == 1.0
+    assert alternating.longest_fail_streak == 1
+
+
+def test_recently_flaky():
+    recent = detect_flaky_tests(build_history("P" * 15 + "FPFPF"))[0]
+    steady = detect_flaky_tests(build_history("PFPF" + "P" * 16))[0]
+    short = detect_flaky_tests(build_history("PPFPF"))[0]
+
+    assert recent.recently_flaky
+    assert not steady.recently_flaky
+    assert not short.recently_flaky
+
+
+def test_flip_history_counts_last_result_in_run():
+    runs = build_history("PPP").test_runs
+    runs[1] = TestRun.from_test_cases(
+        [
+            create_test_case("test1", "ClassA", TestStatus.PASSED),
+            create_test_case("test1", "ClassA", TestStatus.FAILED),
+        ],
+        timestamp=datetime(2024, 1, 1, 11, 0),
+    )
+    runs[2] = TestRun.from_test_cases(
+        [
+            create_test_case("test1", "ClassA", TestStatus.FAILED),
+            create_test_case("test1", "ClassA", TestStatus.PASSED),
+        ],
+        timestamp=datetime(2024, 1, 1, 12, 0),
+    )
+
+    flaky = detect_flaky_tests(TestSuite(name="TestSuite", test_runs=runs))[0]
+
+    assert (flaky.pass_count, flaky.fail_count) == (2, 1)
+    assert flaky.flip_rate == 1.0
+    assert flaky.longest_fail_streak == 1
@@ -0,0 +1,79 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from testops_insight.analytics import SuiteAggregator
+from testops_insight.cli.main import main
+from testops_insight.cli.discovery import discover_test_runs
+from testops_insight.cli.gate import compute_gate_health
+from testops_insight.domain.models import TestSuite
+
+
+def write_run(runs_path, run_name, passed, failed, header=True, filename="junit.xml"):
+    cases = [f'<testcase classname="ClassA" name="pass{idx}" time="0.1"/>' for idx in range(passed)]
+    cases += [f'<testcase classname="ClassA" name="fail{idx}"><failure/></testcase>' for idx in range(failed)]
+    attrs = f' tests="{passed + failed}" failures="{failed}" errors="0" skipped="0"' if header else ""
+    run_dir = runs_path / run_name
+    run_dir.mkdir(parents=True, exist_ok=True)
+    (run_dir / filename).write_text(f'<testsuite name="Suite"{attrs}>{"".join(cases)}</testsuite>')
+
+
+def test_gate_health_matches_analyze(tmp_path):
+    for idx in range(8):
+        write_run(tmp_path, f"run_{idx:03d}", passed=10 - idx, failed=idx, header=idx % 3 != 0)
+    write_run(tmp_path, "run_008", passed=4, failed=1, filename="junit-0.xml")
+    write_run(tmp_path, "run_008", passed=2, failed=2, header=False, filename="junit-1.xml")
+    (tmp_path / "run_009").mkdir()
+    (tmp_path / "run_009" / "junit.xml").write_text("not xml")
+
+    result = compute_gate_health(tmp_path)
+    suite = TestSuite(name="Suite", test_runs=[run for _, run in discover_test_runs(tmp_path)])
+
+    assert len(result.runs) == 9
+    assert result.counted_runs == 4
+    assert result.health_score == SuiteAggregator.from_suite(suite).health_score()
+
+
+def test_gate_last_n_reads_only_recent_runs(tmp_path):
+    for idx in range(5):
+        write_run(tmp_path, f"run_{idx:03d}", passed=idx, failed=1)
+
+    result = compute_gate_health(tmp_path, last_n=2)
+
+    assert [run.run_files[0].parent.name for run in result.runs] == ["run_003", "run_004"]
+
+
+@pytest.mark.parametrize("threshold, exit_code", [(50.0, 0), (90.0, 1)])
+def test_gate_command_exit_code(tmp_path, monkeypatch, capsys, threshold, exit_code):
+    write_run(tmp_path, "run_001", passed=3, failed=1)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["testops-insights", "gate", "--runs-path", str(tmp_path), "--fail-under-health", str(threshold)],
+    )
+
+    with pytest.raises(SystemExit) as excinfo:
+        main()
+
+    assert excinfo.value.code == exit_code
+    assert "Health score: 75.0 (1 runs)" in capsys.readouterr().out
+    assert not (tmp_path / "report").exists()
+
+
+def test_gate_imports_stay_minimal():
+    code = (
+        "import sys\n"
+        "import testops_insight.cli.main, testops_insight.cli.gate\n"
+        "heavy = ['numpy', 'testops_insight.reporting', 'testops_insight.analytics.window',\n"
+        "         'testops_insight.ingestion.cache', 'testops_insight.cli.discovery']\n"
+        "print([name for name in heavy if name in sys.modules])\n"
+    )
+    repo_root = Path(__file__).resolve().parents[1]
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=repo_root
+    ).stdout
+
+    assert output.strip() == "[]"
@@ -0,0 +1,157 @@
+import json
+import multiprocessing
+import sqlite3
+from datetime import datetime
+
+from testops_insight.analytics import SuiteAggregator, SuiteAnalytics
+from testops_insight.cli.history import load_history_aggregator
+from testops_insight.domain.models import TestCase, TestRun, TestStatus, TestSuite
+from testops_insight.storage import HistoryDatabase
+from tests.helpers import make_run, run_cli, write_run
+
+
+def assert_same_analytics(history, expected):
+    assert history.total_runs == expected.total_runs
+    assert history.flaky_tests() == expected.flaky_tests()
+    assert history.frequent_failures() == expected.frequent_failures()
+    assert history.slowest_tests(3) == expected.slowest_tests(3)
+    assert history.pass_rate_trend() == expected.pass_rate_trend()
+    assert history.health_score() == expected.health_score()
+    assert history.last_seen_index() == expected.last_seen_index()
+
+
+def test_history_aggregator_matches_suite_aggregator(tmp_path):
+    runs = [make_run(idx, tests=4 + idx % 3) for idx in range(12)]
+
+    with HistoryDatabase(tmp_path / "history.db") as db:
+        for idx, run in enumerate(runs):
+            assert db.add_run(f"run-{idx}", f"run_{idx}/junit.xml", run)
+
+        assert_same_analytics(db.aggregator(), SuiteAggregator.from_suite(TestSuite(name="s", test_runs=runs)))
+        # The aggregator only answers queries; runs go in through the database.
+        assert isinstance(db.aggregator(), SuiteAnalytics)
+        assert not hasattr(db.aggregator(), "add_run")
+        assert_same_analytics(
+            load_history_aggregator(db, last_n=5),
+            SuiteAggregator.from_suite(TestSuite(name="s", test_runs=runs[-5:])),
+        )
+        assert_same_analytics(
+            load_history_aggregator(db, since=datetime(2024, 1, 1, 3), until=datetime(2024, 1, 1, 9)),
+            SuiteAggregator.from_suite(TestSuite(name="s", test_runs=runs[3:9])),
+        )
+
+
+def test_slowest_tests_sum_retried_durations_exactly(tmp_path):
+    # Summing each run's rounded 0.1 + 0.2 + 0.7 again drifts from the exact total.
+    runs = [
+        TestRun.from_test_cases(
+            [
+                TestCase(name="retried", classname="ClassA", status=status, duration=duration)
+                for status, duration in zip(
+                    (TestStatus.FAILED, TestStatus.FAILED, TestStatus.PASSED), (0.1, 0.2, 0.7 + run_idx / 9)
+                )
+            ]
+            + [TestCase(name="steady", classname="ClassA", status=TestStatus.PASSED, duration=0.3 + run_idx / 7)],
+            timestamp=datetime(2024, 1, 1, run_idx),
+        )
+        for run_idx in range(9)
+    ]
+    expected = SuiteAggregator.from_suite(TestSuite(name="s", test_runs=runs))
+
+    with HistoryDatabase(tmp_path / "history.db") as db:
+        for idx, run in enumerate(runs):
+            db.add_run(f"run-{idx}", f"run_{idx}/junit.xml", run)
+        assert db.aggregator().slowest_tests() == expected.slowest_tests()
+
+
+def test_run_is_stored_once_and_names_are_interned(tmp_path):
+    db_path = tmp_path / "history.db"
+    with HistoryDatabase(db_path) as db:
+        assert db.add_run("key", "a", make_run(0))
+        assert not db.add_run("key", "b", make_run(1))
+        assert db.add_run("other", "c", make_run(1))
+
+    with sqlite3.connect(db_path) as connection:
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 2
+        assert connection.execute("SELECT COUNT(*) FROM tests").fetchone()[0] == 6
+        assert connection.execute("SELECT COUNT(*) FROM results").fetchone()[0] == 12
+
+
+def _append_runs(db_path, worker):
+    with HistoryDatabase(db_path) as db:
+        for idx in range(10):
+            db.add_run(f"worker-{worker}-{idx}", "source", make_run(idx, tests=20))
+
+
+def test_concurrent_appends(tmp_path):
+    db_path = tmp_path / "history.db"
+    processes = [multiprocessing.Process(target=_append_runs, args=(db_path, worker)) for worker in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert [process.exitcode for process in processes] == [0, 0, 0, 0]
+
+    with HistoryDatabase(db_path) as db:
+        assert len(db.runs()) == 40
+        aggregator = db.aggregator()
+        assert sum(failure.total_runs for failure in aggregator.frequent_failures()) > 0
+        assert len(aggregator.last_seen_index()) == 20
+
+
+def test_ingest_and_analyze_db_match_analyze(tmp_path, monkeypatch, capsys):
+    runs_path = tmp_path / "runs"
+    write_run(runs_path, "run_1", "PPFS")
+    write_run(runs_path, "run_2", "PFPP")
+    monkeypatch.chdir(tmp_path)
+
+    db = str(tmp_path / "history.db")
+    assert run_cli(monkeypatch, "ingest", "--runs-path", str(runs_path), "--db", db, "--no-cache") == 0
+    write_run(runs_path, "run_3", "FFPP")
+    assert run_cli(monkeypatch, "ingest", "--runs-path", str(runs_path), "--db", db, "--no-cache") == 0
+    assert "Added 1 run to" in capsys.readouterr().out
+
+    assert run_cli(monkeypatch, "analyze", "--db", db, "--out", "from-db") == 0
+    assert run_cli(monkeypatch, "analyze", "--runs-path", str(runs_path), "--out", "from-dir", "--no-cache") == 0
+
+    from_db = json.loads((tmp_path / "from-db" / "metrics.json").read_text())
+    from_dir = json.loads((tmp_path / "from-dir" / "metrics.json").read_text())
+    del from_db["generated_at"], from_dir["generated_at"]
+    assert from_db == from_dir
+    assert from_db["total_runs"] == 3
+
+
+def test_ingest_hashes_only_unseen_files(tmp_path, monkeypatch, capsys):
+    from testops_insight.cli import history
+
+    runs_path = tmp_path / "runs"
+    write_run(runs_path, "run_1", "PPFS")
+    write_run(runs_path, "run_2", "PFPP")
+    db = str(tmp_path / "history.db")
+    assert run_cli(monkeypatch, "ingest", "--runs-path", str(runs_path), "--db", db, "--no-cache") == 0
+
+    hashed = []
+
+    def counting_run_key(junit_files):
+        hashed.append(junit_files[0].parent.name)
+        return run_key(junit_files)
+
+    run_key = history.run_key
+    monkeypatch.setattr(history, "run_key", counting_run_key)
+    write_run(runs_path, "run_3", "FFPP")
+    # Same content under a new path: hashed once, stored once, then recognized by its fingerprint.
+    (runs_path / "run_2").rename(runs_path / "run_4")
+    for _ in range(2):
+        assert run_cli(monkeypatch, "ingest", "--runs-path", str(runs_path), "--db", db, "--no-cache") == 0
+
+    assert sorted(hashed) == ["run_3", "run_4"]
+    assert "Added 1 run to" in capsys.readouterr().out
+    with HistoryDatabase(db) as history_db:
+        assert len(history_db.runs()) == 3
+
+
+def test_analyze_db_missing(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    assert run_cli(monkeypatch, "analyze", "--db", str(tmp_path / "missing.db")) == 1
+    assert "History database does not exist" in capsys.readouterr().out
@@ -0,0 +1,112 @@
+import json
+from pathlib import Path
+
+from testops_insight.analytics import SuiteAggregator
+from testops_insight.cli.discovery import discover_test_runs, find_run_candidates
+from testops_insight.cli.state import AnalyticsState, update_analytics_state
+from testops_insight.domain.models import TestSuite
+
+
+def write_run(runs_path: Path, run_name: str, statuses: list[str], hour: int) -> None:
+    cases = []
+    for idx, status in enumerate(statuses):
+        body = '<failure message="failed"/>' if status == "failed" else ""
+        cases.append(f'<testcase classname="ClassA" name="test{idx}" time="{0.1 * (idx + hour):.2f}">{body}</testcase>')
+    run_dir = runs_path / run_name
+    run_dir.mkdir(parents=True, exist_ok=True)
+    (run_dir / "junit.xml").write_text(
+        f'<testsuite name="Suite" timestamp="2024-01-01T{hour:02d}:00:00">{"".join(cases)}</testsuite>',
+        encoding="utf-8",
+    )
+
+
+def full_result(runs_path: Path):
+    runs = discover_test_runs(runs_path)
+    suite = TestSuite(name="Suite", test_runs=[test_run for _, test_run in runs])
+    return SuiteAggregator.from_suite(suite).result(slow_limit=20)
+
+
+def test_incremental_state_matches_full_recompute(tmp_path):
+    runs_path = tmp_path / "runs"
+    state_path = tmp_path / "state.json"
+    write_run(runs_path, "run_001", ["passed", "failed", "passed"], hour=1)
+    write_run(runs_path, "run_002", ["failed", "passed"], hour=2)
+
+    aggregator, new_runs = update_analytics_state(state_path, find_run_candidates(runs_path))
+    assert len(new_runs) == 2
+
+    write_run(runs_path, "run_003", ["passed", "failed", "failed"], hour=3)
+    aggregator, new_runs = update_analytics_state(state_path, find_run_candidates(runs_path))
+
+    assert [xml_path.parent.name for xml_path, _ in new_runs] == ["run_003"]
+    assert aggregator.result(slow_limit=20) == full_result(runs_path)
+    assert aggregator.last_test_status("ClassA.test2") == "FAILED"
+
+
+def test_incremental_state_recomputes_when_history_changes(tmp_path):
+    runs_path = tmp_path / "runs"
+    state_path = tmp_path / "state.json"
+    write_run(runs_path, "run_001", ["passed"], hour=1)
+    write_run(runs_path, "run_002", ["passed"], hour=2)
+    update_analytics_state(state_path, find_run_candidates(runs_path))
+
+    write_run(runs_path, "run_001", ["failed", "failed"], hour=1)
+    aggregator, new_runs = update_analytics_state(state_path, find_run_candidates(runs_path))
+
+    assert len(new_runs) == 2
+    assert aggregator.result() == full_result(runs_path)
+
+
+def test_state_round_trip(tmp_path):
+    runs_path = tmp_path / "runs"
+    write_run(runs_path, "run_001", ["passed", "failed"], hour=1)
+    write_run(runs_path, "run_002", ["failed", "passed"], hour=2)
+    state_path = tmp_path / "state.json"
+    aggregator, _ = update_analytics_state(state_path, find_run_candidates(runs_path))
+
+    reloaded = AnalyticsState.load(state_path)
+
+    assert json.loads(state_path.read_text())["version"] == 6
+    assert reloaded.aggregator.result() == aggregator.result()
+    assert reloaded.aggregator.last_failed_timestamp("ClassA.test0") == aggregator.last_failed_timestamp(
+        "ClassA.test0"
+    )
+
+
+def test_merge_matches_sequential_fold(tmp_path):
+    runs_path = tmp_path / "runs"
+    for hour in range(1, 5):
+        write_run(runs_path, f"run_{hour:03d}", ["passed", "failed"][: hour % 2 + 1] + ["failed"], hour=hour)
+    runs = [test_run for _, test_run in discover_test_runs(runs_path)]
+
+    first = SuiteAggregator.from_suite(TestSuite(name="Suite", test_runs=runs[:2]))
+    second = SuiteAggregator.from_suite(TestSuite(name="Suite", test_runs=runs[2:]))
+    first.merge(second)
+    expected = SuiteAggregator.from_suite(TestSuite(name="Suite", test_runs=runs))
+
+    assert first.result() == expected.result()
+    for test_name in expected.test_stats:
+        assert first.last_test_status(test_name) == expected.last_test_status(test_name)
+        assert first.last_failed_timestamp(test_name) == expected.last_failed_timestamp(test_name)
+
+
+def test_incremental_window_matches_last_n(tmp_path):
+    runs_path = tmp_path / "runs"
+    state_path = tmp_path / "state.json"
+    for hour in range(1, 4):
+        write_run(runs_path, f"run_{hour:03d}", ["passed", "failed"][: hour % 2 + 1], hour=hour)
+    update_analytics_state(state_path, find_run_candidates(runs_path), window=2)
+
+    for hour in range(4, 7):
+        write_run(runs_path, f"run_{hour:03d}", ["failed", "passed", "passed"][: hour % 3 + 1], hour=hour)
+    aggregator, new_runs = update_analytics_state(state_path, find_run_candidates(runs_path), window=2)
+
+    runs = discover_test_runs(runs_path, last_n=2)
+    expected = SuiteAggregator.from_suite(TestSuite(name="Suite", test_runs=[test_run for _, test_run in runs]))
+
+    result = aggregator.result()
+    expected_result = expected.result()
+
+    assert [xml_path.parent.name for xml_path, _ in new_runs] == ["run_005", "run_006"]
+    assert result == expected_result
+    assert aggregator.last_seen_index() == expected.last_seen_index()
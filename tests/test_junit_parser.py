@@ -1,3 +1,7 @@
+import bz2
+import gc
+import gzip
+import lzma
 import tempfile
 from pathlib import Path
 from datetime import datetime
@@ -5,7 +9,13 @@ from datetime import datetime
 import pytest
 
 from testops_insight.domain.models import TestCase, TestRun, TestStatus
-from testops_insight.ingestion.junit_parser import parse_junit_xml
+from testops_insight.ingestion.junit_parser import (
+    LazyMessage,
+    iter_test_cases,
+    parse_junit_xml,
+    read_junit_counts,
+    read_junit_timestamp,
+)
 
 
 def test_parse_simple_testsuite():
@@ -157,3 +167,226 @@ def test_parse_single_test():
     finally:
         Path(temp_path).unlink()
 
+
+
+def test_streaming_matches_tree_parse():
+    xml_content = """<?xml version="1.0" encoding="UTF-8"?>
+    <testsuites timestamp="2024-01-01T10:00:00Z">
+        <testsuite name="Suite1" tests="3" time="1.5">
+            <properties><property name="env" value="ci"/></properties>
+            <testcase classname="Class1" name="test_pass" time="0.5">
+                <system-out>lots of output</system-out>
+            </testcase>
+            <testcase name="test_fail" time="1.0">
+                <failure type="AssertionError">Expected &lt;1&gt;<detail>ignored</detail>tail</failure>
+            </testcase>
+            <testcase classname="Class1" name="test_skip">
+                <skipped/>
+            </testcase>
+        </testsuite>
+        <testsuite name="Suite2" tests="1" time="0.3">
+            <testcase classname="Class2" name="test_error" time="0.3">
+                <error message="boom"><![CDATA[Traceback <most recent>]]></error>
+                <system-err>more output</system-err>
+            </testcase>
+        </testsuite>
+    </testsuites>
+    """
+
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".xml", delete=False) as f:
+        f.write(xml_content)
+        temp_path = f.name
+
+    try:
+        expected = parse_junit_xml(temp_path)
+        test_run = parse_junit_xml(temp_path, streaming=True)
+
+        assert test_run == expected
+        assert test_run.test_cases[1].classname == "Suite1"
+        assert test_run.test_cases[1].message == "Expected <1>"
+        assert test_run.test_cases[3].message == "Traceback <most recent>"
+    finally:
+        Path(temp_path).unlink()
+
+
+def test_streaming_skips_output_blocks():
+    xml_content = """<?xml version="1.0" encoding="UTF-8"?>
+    <testsuite name="TestSuite" tests="2" timestamp="2024-01-01T10:00:00">
+        <testcase classname="TestClass" name="test1" time="0.5">
+            <system-out>{output}</system-out>
+        </testcase>
+        <testcase classname="TestClass" name="test2" time="0.5">
+            <system-err>{output}</system-err>
+        </testcase>
+    </testsuite>
+    """.format(output="x" * 500_000)
+
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".xml", delete=False) as f:
+        f.write(xml_content)
+        temp_path = f.name
+
+    try:
+        test_cases = list(iter_test_cases(temp_path))
+
+        assert [tc.name for tc in test_cases] == ["test1", "test2"]
+        assert all(tc.message is None for tc in test_cases)
+    finally:
+        Path(temp_path).unlink()
+
+
+def test_streaming_rejects_unexpected_root():
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".xml", delete=False) as f:
+        f.write("<coverage><testcase name='x'/></coverage>")
+        temp_path = f.name
+
+    try:
+        with pytest.raises(ValueError):
+            parse_junit_xml(temp_path, streaming=True)
+    finally:
+        Path(temp_path).unlink()
+
+
+def test_read_timestamp_from_header():
+    xml_content = """<?xml version="1.0" encoding="UTF-8"?>
+    <testsuites timestamp="2024-03-01T08:30:00">
+        <testsuite name="Suite1"><testcase classname="Class1" name="test1" time="0.5"/>
+    """
+
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".xml", delete=False) as f:
+        f.write(xml_content)
+        temp_path = f.name
+
+    try:
+        assert read_junit_timestamp(temp_path) == datetime(2024, 3, 1, 8, 30)
+    finally:
+        Path(temp_path).unlink()
+
+
+def test_lazy_messages_match_eager_parse():
+    trace = "Traceback &lt;most recent call last&gt;\n" + "  at frame\n" * 40
+    xml_content = f"""<?xml version="1.0" encoding="ISO-8859-1"?>
+    <testsuite name="TestSuite" tests="3">
+        <testcase classname="TestClass" name="test_fail" time="0.5">
+            <failure type="AssertionError">caf\xe9 {trace}<detail>ignored</detail></failure>
+        </testcase>
+        <testcase classname="TestClass" name="test_error" time="0.5">
+            <error><![CDATA[{trace}]]></error>
+        </testcase>
+        <testcase classname="TestClass" name="test_short" time="0.5">
+            <failure>short</failure>
+        </testcase>
+    </testsuite>
+    """
+
+    with tempfile.NamedTemporaryFile(mode="wb", suffix=".xml", delete=False) as f:
+        f.write(xml_content.encode("iso-8859-1"))
+        temp_path = f.name
+
+    try:
+        expected = parse_junit_xml(temp_path)
+        for use_mmap in (False, True):
+            test_run = parse_junit_xml(temp_path, lazy_messages=True, use_mmap=use_mmap)
+
+            assert isinstance(test_run.test_cases[0].stored_message, LazyMessage)
+            assert isinstance(test_run.test_cases[1].stored_message, LazyMessage)
+            assert test_run.test_cases[2].stored_message == "short"
+            assert test_run.test_cases == expected.test_cases
+            assert test_run.test_cases[0].message.startswith("caf\xe9 Traceback <most recent")
+    finally:
+        Path(temp_path).unlink()
+
+
+def test_lazy_message_rejects_changed_file(tmp_path):
+    xml_file = tmp_path / "junit.xml"
+    xml_file.write_text(
+        '<testsuite name="S"><testcase name="t"><failure>' + "x" * 1000 + "</failure></testcase></testsuite>"
+    )
+    test_run = parse_junit_xml(xml_file, lazy_messages=True)
+
+    xml_file.write_text('<testsuite name="S"><testcase name="t"/></testsuite>')
+
+    with pytest.raises(ValueError):
+        test_run.test_cases[0].message
+
+
+def test_lazy_message_is_kept_once_loaded(tmp_path):
+    xml_file = tmp_path / "junit.xml"
+    xml_file.write_text(
+        '<testsuite name="S"><testcase name="t"><failure>' + "x" * 1000 + "</failure></testcase></testsuite>"
+    )
+    test_run = parse_junit_xml(xml_file, lazy_messages=True, use_mmap=True)
+    source = test_run.test_cases[0].stored_message.source
+
+    assert test_run.test_cases[0].message == "x" * 1000
+    mapped = source._mmap
+    xml_file.unlink()
+
+    assert test_run.test_cases[0].stored_message == "x" * 1000
+    assert test_run.test_cases[0].message == "x" * 1000
+    assert not mapped.closed
+
+    del test_run, source
+    gc.collect()
+
+    assert mapped.closed
+
+
+@pytest.mark.parametrize("suffix, opener", [(".gz", gzip.open), (".bz2", bz2.open), (".xz", lzma.open)])
+def test_parse_compressed_file(tmp_path, suffix, opener):
+    xml_content = """<?xml version="1.0" encoding="UTF-8"?>
+    <testsuite name="TestSuite" timestamp="2024-01-01T10:00:00">
+        <testcase classname="TestClass" name="test_pass" time="0.5"/>
+        <testcase classname="TestClass" name="test_fail" time="1.0">
+            <failure>""" + "x" * 1000 + """</failure>
+        </testcase>
+    </testsuite>
+    """
+    plain_file = tmp_path / "junit.xml"
+    plain_file.write_text(xml_content)
+    compressed_file = tmp_path / f"junit.xml{suffix}"
+    with opener(compressed_file, "wb") as f:
+        f.write(xml_content.encode("utf-8"))
+
+    expected = parse_junit_xml(plain_file)
+    test_run = parse_junit_xml(compressed_file, lazy_messages=True)
+
+    assert test_run == expected
+    assert test_run.test_cases[1].stored_message == "x" * 1000
+    assert read_junit_timestamp(compressed_file) == datetime(2024, 1, 1, 10, 0)
+
+
+def test_read_counts_from_header_attributes(tmp_path):
+    xml_file = tmp_path / "junit.xml"
+    xml_file.write_text(
+        '<testsuite name="S" tests="10" failures="2" errors="1" skipped="3">'
+        '<testcase name="only_one"/></testsuite>'
+    )
+
+    counts = read_junit_counts(xml_file)
+
+    assert (counts.total_tests, counts.passed, counts.failed, counts.errors, counts.skipped) == (10, 4, 2, 1, 3)
+    assert not counts.counted
+
+
+def test_read_counts_falls_back_to_counting(tmp_path):
+    xml_file = tmp_path / "junit.xml"
+    xml_file.write_text(
+        """<testsuites>
+            <testsuite name="WithHeader" tests="3" failures="1" errors="0"/>
+            <testsuite name="WithoutHeader">
+                <testcase name="a"/>
+                <testcase name="b"><failure/></testcase>
+                <testcase name="c"><failure/><error/></testcase>
+                <testcase name="d"><error/><skipped/></testcase>
+                <testcase name="e"><system-out>x</system-out></testcase>
+            </testsuite>
+        </testsuites>"""
+    )
+
+    counts = read_junit_counts(xml_file)
+    test_run = parse_junit_xml(xml_file)
+
+    assert counts.counted
+    assert counts.total_tests == 3 + test_run.total_tests
+    assert counts.passed == 2 + test_run.passed
+    assert (counts.failed, counts.errors, counts.skipped) == (1 + test_run.failed, test_run.errors, test_run.skipped)
@@ -0,0 +1,174 @@
+import pickle
+from dataclasses import asdict, fields, replace
+from datetime import datetime
+
+import pytest
+
+from testops_insight.domain.models import STATUS_CODES, HistoryEntry, TestCase, TestRun, TestStatus, TestSuite
+
+
+def test_test_case_fields():
+    test_case = TestCase(
+        name="test_login",
+        classname="auth.LoginTests",
+        status=TestStatus.FAILED,
+        duration=1.5,
+        message="boom",
+        failure_type="AssertionError",
+    )
+
+    assert test_case.name == "test_login"
+    assert test_case.classname == "auth.LoginTests"
+    assert test_case.full_name == "auth.LoginTests.test_login"
+    assert test_case.status == TestStatus.FAILED
+    assert test_case.duration == 1.5
+    assert test_case.message == "boom"
+    assert test_case.failure_type == "AssertionError"
+    assert not hasattr(test_case, "__dict__")
+
+
+def test_test_cases_share_identity_across_runs():
+    first = TestCase(name="".join(["test", "_a"]), classname="ClassA", status=TestStatus.PASSED, duration=1.0)
+    second = TestCase(name="".join(["test", "_a"]), classname="ClassA", status=TestStatus.FAILED, duration=2.0)
+
+    assert first.identity is second.identity
+    assert first.full_name is second.full_name
+
+
+def test_test_case_equality_and_repr():
+    first = TestCase(name="test1", classname="ClassA", status=TestStatus.PASSED, duration=1.0)
+    second = TestCase(name="test1", classname="ClassA", status=TestStatus.PASSED, duration=1.0)
+
+    assert first == second
+    assert first != TestCase(name="test1", classname="ClassA", status=TestStatus.SKIPPED, duration=1.0)
+    assert repr(first) == (
+        "TestCase(name='test1', classname='ClassA', status=<TestStatus.PASSED: 'passed'>, "
+        "duration=1.0, message=None, failure_type=None)"
+    )
+    with pytest.raises(TypeError):
+        hash(first)
+
+
+def test_test_case_setters():
+    test_case = TestCase(name="test1", classname="ClassA", status=TestStatus.PASSED, duration=1.0)
+
+    test_case.name = "test2"
+    test_case.classname = "ClassB"
+    test_case.status = TestStatus.ERROR
+
+    assert test_case.full_name == "ClassB.test2"
+    other = TestCase(name="test2", classname="ClassB", status=TestStatus.PASSED, duration=0.0)
+    assert test_case.identity is other.identity
+    assert test_case.status == TestStatus.ERROR
+    assert test_case.status_code == STATUS_CODES[TestStatus.ERROR]
+
+
+def test_test_case_is_a_dataclass():
+    test_case = TestCase(name="test1", classname="ClassA", status=TestStatus.FAILED, duration=1.0, message="m")
+
+    assert [f.name for f in fields(TestCase)] == ["name", "classname", "status", "duration", "message", "failure_type"]
+    assert asdict(test_case) == {
+        "name": "test1",
+        "classname": "ClassA",
+        "status": TestStatus.FAILED,
+        "duration": 1.0,
+        "message": "m",
+        "failure_type": None,
+    }
+
+    renamed = replace(test_case, name="test2", status=TestStatus.PASSED)
+
+    assert renamed.full_name == "ClassA.test2"
+    assert renamed.status_code == STATUS_CODES[TestStatus.PASSED]
+    assert renamed.message == "m"
+    assert test_case.full_name == "ClassA.test1"
+
+
+def test_test_case_pickle_round_trip():
+    test_run = TestRun.from_test_cases(
+        [TestCase(name="test1", classname="ClassA", status=TestStatus.FAILED, duration=1.0, message="m")],
+        timestamp=datetime(2024, 1, 1, 10, 0),
+    )
+
+    restored = pickle.loads(pickle.dumps(test_run))
+
+    assert restored == test_run
+    assert restored.test_cases[0].identity is test_run.test_cases[0].identity
+
+
+def test_suite_all_test_cases():
+    run = TestRun.from_test_cases(
+        [TestCase(name="test1", classname="ClassA", status=TestStatus.PASSED, duration=1.0)],
+        timestamp=datetime(2024, 1, 1, 10, 0),
+    )
+    suite = TestSuite(name="Suite", test_runs=[run, run])
+
+    assert suite.total_runs == 2
+    assert len(suite.all_test_cases) == 2
+
+
+def _run(*cases, day=1):
+    return TestRun.from_test_cases(
+        [TestCase(name=name, classname="ClassA", status=status, duration=duration) for name, status, duration in cases],
+        timestamp=datetime(2024, 1, day, 10, 0),
+    )
+
+
+def test_suite_history_and_tests():
+    suite = TestSuite(
+        name="Suite",
+        test_runs=[
+            _run(("test1", TestStatus.PASSED, 1.0), ("test2", TestStatus.FAILED, 2.0), day=1),
+            _run(("test1", TestStatus.FAILED, 1.5), day=2),
+        ],
+    )
+
+    assert list(suite.tests()) == ["ClassA.test1", "ClassA.test2"]
+    assert list(suite.history("ClassA.test1")) == [
+        HistoryEntry(0, TestStatus.PASSED, 1.0),
+        HistoryEntry(1, TestStatus.FAILED, 1.5),
+    ]
+    assert suite.history("ClassA.test1")[-1].status == TestStatus.FAILED
+    assert suite.history("ClassA.test2")[:] == [HistoryEntry(0, TestStatus.FAILED, 2.0)]
+    assert len(suite.history("ClassA.missing")) == 0
+    assert suite.history("ClassA.test1") is suite.history("ClassA.test1")
+
+
+def test_suite_history_follows_appended_runs():
+    suite = TestSuite(name="Suite", test_runs=[_run(("test1", TestStatus.PASSED, 1.0))])
+    assert len(suite.history("ClassA.test1")) == 1
+
+    suite.test_runs.append(_run(("test1", TestStatus.FAILED, 2.0), ("test3", TestStatus.PASSED, 1.0), day=2))
+
+    assert [entry.run_index for entry in suite.history("ClassA.test1")] == [0, 1]
+    assert list(suite.tests()) == ["ClassA.test1", "ClassA.test3"]
+
+    suite.test_runs = [_run(("test9", TestStatus.SKIPPED, 0.0))]
+
+    assert list(suite.tests()) == ["ClassA.test9"]
+    assert len(suite.history("ClassA.test1")) == 0
+
+
+def test_suite_pickle_drops_history_index():
+    suite = TestSuite(name="Suite", test_runs=[_run(("test1", TestStatus.PASSED, 1.0))])
+    suite.history("ClassA.test1")
+
+    restored = pickle.loads(pickle.dumps(suite))
+
+    assert restored == suite
+    assert restored._history_index is None
+    assert list(restored.history("ClassA.test1")) == list(suite.history("ClassA.test1"))
+
+
+def test_suite_history_index_is_not_a_field():
+    suite = TestSuite(name="Suite", test_runs=[_run(("test1", TestStatus.PASSED, 1.0))])
+    suite.history("ClassA.test1")
+
+    assert [f.name for f in fields(TestSuite)] == ["name", "test_runs"]
+    assert set(asdict(suite)) == {"name", "test_runs"}
+
+    copied = replace(suite, name="Copy")
+
+    assert copied.test_runs is suite.test_runs
+    assert copied._history_index is None
+    assert list(copied.history("ClassA.test1")) == list(suite.history("ClassA.test1"))
@@ -0,0 +1,196 @@
+import json
+import os
+import pickle
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+from testops_insight.cli import discovery
+from testops_insight.cli.discovery import discover_test_runs
+from testops_insight.ingestion import LazyMessage, ParseCache, parse_junit_xml
+
+
+def write_junit(xml_file: Path, statuses: list[str]) -> None:
+    cases = []
+    for idx, status in enumerate(statuses):
+        body = '<failure message="failed">trace</failure>' if status == "failed" else ""
+        cases.append(f'<testcase classname="ClassA" name="test{idx}" time="0.25">{body}</testcase>')
+    xml_file.parent.mkdir(parents=True, exist_ok=True)
+    xml_file.write_text(
+        f'<testsuite name="Suite" timestamp="2024-01-01T10:00:00">{"".join(cases)}</testsuite>',
+        encoding="utf-8",
+    )
+
+
+def test_cache_round_trip(tmp_path):
+    xml_file = tmp_path / "runs" / "run_001" / "junit.xml"
+    write_junit(xml_file, ["passed", "failed"])
+    cache = ParseCache(tmp_path / "cache")
+
+    assert cache.load(xml_file) == (False, None)
+
+    test_run = parse_junit_xml(xml_file)
+    cache.store(xml_file, test_run)
+    hit, cached_run = cache.load(xml_file)
+
+    assert hit
+    assert cached_run == test_run
+
+
+def test_cache_invalidated_when_file_changes(tmp_path):
+    xml_file = tmp_path / "run_001" / "junit.xml"
+    write_junit(xml_file, ["passed"])
+    cache = ParseCache(tmp_path / "cache")
+    cache.store(xml_file, parse_junit_xml(xml_file))
+
+    write_junit(xml_file, ["passed", "failed"])
+    stat = xml_file.stat()
+    os.utime(xml_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert cache.load(xml_file) == (False, None)
+
+
+def test_cache_verify_hash_detects_same_size_edit(tmp_path):
+    xml_file = tmp_path / "run_001" / "junit.xml"
+    write_junit(xml_file, ["passed"])
+    stat = xml_file.stat()
+    cache = ParseCache(tmp_path / "cache", verify_hash=True)
+    cache.store(xml_file, parse_junit_xml(xml_file))
+
+    xml_file.write_text(xml_file.read_text().replace("test0", "test9"), encoding="utf-8")
+    os.utime(xml_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert cache.load(xml_file) == (False, None)
+
+
+def test_manifest_caches_timestamps(tmp_path):
+    xml_file = tmp_path / "run_001" / "junit.xml"
+    write_junit(xml_file, ["passed"])
+    cache = ParseCache(tmp_path / "cache")
+
+    assert cache.load_timestamp(xml_file) == (False, None)
+    cache.store_timestamp(xml_file, datetime(2024, 1, 1, 10, 0))
+    cache.save_manifest()
+
+    reloaded = ParseCache(tmp_path / "cache")
+    assert reloaded.load_timestamp(xml_file) == (True, datetime(2024, 1, 1, 10, 0))
+
+    write_junit(xml_file, ["passed", "failed"])
+    assert reloaded.load_timestamp(xml_file) == (False, None)
+
+
+def test_cache_prune_evicts_least_recently_used(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache = ParseCache(cache_dir)
+    xml_files = []
+    for idx in range(3):
+        xml_file = tmp_path / f"run_{idx:03d}" / "junit.xml"
+        write_junit(xml_file, ["passed"] * 20)
+        cache.store(xml_file, parse_junit_xml(xml_file))
+        xml_files.append(xml_file)
+
+    entries = sorted(cache_dir.glob("*.run"))
+    for age, entry in enumerate(entries):
+        os.utime(entry, (1_000_000 + age, 1_000_000 + age))
+    entry_size = max(entry.stat().st_size for entry in entries)
+
+    ParseCache(cache_dir, max_size_bytes=entry_size).prune()
+
+    assert [entry.name for entry in cache_dir.glob("*.run")] == [entries[-1].name]
+
+
+def test_cache_keeps_lazy_messages_lazy(tmp_path):
+    xml_file = tmp_path / "run_001" / "junit.xml"
+    xml_file.parent.mkdir()
+    trace = "Traceback line\n" * 20
+    xml_file.write_text(
+        '<?xml version="1.0" encoding="utf-8"?><testsuite name="Suite">'
+        f'<testcase classname="ClassA" name="test0" time="0.5"><failure>{trace}</failure></testcase>'
+        "</testsuite>",
+        encoding="utf-8",
+    )
+    cache = ParseCache(tmp_path / "cache")
+    cache.store(xml_file, parse_junit_xml(xml_file, streaming=True, lazy_messages=True))
+
+    hit, cached_run = cache.load(xml_file)
+    assert hit
+    assert isinstance(cached_run.test_cases[0].stored_message, LazyMessage)
+    assert cached_run.test_cases[0].message == trace
+
+
+def test_cache_rejects_pickles_and_malformed_entries(tmp_path):
+    xml_file = tmp_path / "run_001" / "junit.xml"
+    write_junit(xml_file, ["passed", "failed"])
+    cache = ParseCache(tmp_path / "cache")
+    cache.store(xml_file, parse_junit_xml(xml_file))
+    entry_path = next((tmp_path / "cache").glob("*.run"))
+    entry = json.loads(zlib.decompress(entry_path.read_bytes()))
+
+    class Payload:
+        def __reduce__(self):
+            return (os.mkdir, (str(tmp_path / "pwned"),))
+
+    entry_path.write_bytes(zlib.compress(pickle.dumps(Payload())))
+    assert cache.load(xml_file) == (False, None)
+    assert not (tmp_path / "pwned").exists()
+
+    tampered = [("statuses", [0, 9]), ("names", ["test0", 1]), ("messages", [None, [0, 10, "script", None]])]
+    for column, values in tampered:
+        entry_path.write_bytes(zlib.compress(json.dumps({**entry, "run": {**entry["run"], column: values}}).encode()))
+        assert cache.load(xml_file) == (False, None)
+
+
+def test_flush_scans_entries_only_when_the_limit_could_be_passed(tmp_path, monkeypatch):
+    xml_file = tmp_path / "run_001" / "junit.xml"
+    write_junit(xml_file, ["passed"] * 20)
+    first = ParseCache(tmp_path / "cache")
+    first.store(xml_file, parse_junit_xml(xml_file))
+    first.flush()
+    scans = []
+    monkeypatch.setattr(ParseCache, "prune", lambda self: scans.append(self.max_size_bytes))
+
+    cache = ParseCache(tmp_path / "cache")
+    cache.store(xml_file, parse_junit_xml(xml_file))
+    cache.flush()
+    assert scans == []
+
+    small = ParseCache(tmp_path / "cache", max_size_bytes=10)
+    small.store(xml_file, parse_junit_xml(xml_file))
+    small.flush()
+    assert scans == [10]
+
+
+def test_unwritable_cache_dir_is_skipped(tmp_path):
+    xml_file = tmp_path / "run_001" / "junit.xml"
+    write_junit(xml_file, ["passed"])
+    # A file where the cache directory should be makes every write fail.
+    (tmp_path / "blocked").write_text("")
+    cache = ParseCache(tmp_path / "blocked" / "cache")
+
+    cache.store(xml_file, parse_junit_xml(xml_file))
+    cache.store_timestamp(xml_file, datetime(2024, 1, 1, 10, 0))
+    cache.flush()
+
+    assert cache.load(xml_file) == (False, None)
+    assert [run.total_tests for _, run in discover_test_runs(tmp_path, cache=cache)] == [1]
+
+
+def test_discover_uses_cache(tmp_path, monkeypatch):
+    runs_path = tmp_path / "runs"
+    write_junit(runs_path / "run_001" / "junit.xml", ["passed", "failed"])
+    write_junit(runs_path / "run_002" / "junit.xml", ["passed"])
+    (runs_path / "run_003").mkdir()
+    (runs_path / "run_003" / "junit.xml").write_text("not xml")
+    cache = ParseCache(tmp_path / "cache")
+
+    first = discover_test_runs(runs_path, cache=cache)
+    assert len(list((tmp_path / "cache").glob("*.run"))) == 3
+
+    def fail_parse(*args, **kwargs):
+        raise AssertionError("cached run was parsed again")
+
+    monkeypatch.setattr(discovery, "parse_junit_xml", fail_parse)
+    second = discover_test_runs(runs_path, cache=cache)
+
+    assert [path for path, _ in second] == [path for path, _ in first]
+    assert [run.test_cases for _, run in second] == [run.test_cases for _, run in first]
@@ -0,0 +1,97 @@
+import json
+from datetime import datetime
+
+from testops_insight.cli.discovery import discover_test_runs
+from testops_insight.domain.models import TestCase, TestRun, TestStatus, TestSuite
+from testops_insight.ingestion import ParseCache
+from testops_insight.profiling import Profiler, measure
+from testops_insight.reporting import generate_report
+
+
+def write_run(runs_path, run_name, filename="junit.xml"):
+    run_dir = runs_path / run_name
+    run_dir.mkdir(parents=True, exist_ok=True)
+    (run_dir / filename).write_text(
+        '<testsuite name="Suite" timestamp="2024-01-01T10:00:00">'
+        '<testcase classname="ClassA" name="test1" time="0.5"/></testsuite>'
+    )
+
+
+def test_profiler_records_stages_and_cprofile(tmp_path):
+    profiler = Profiler(cprofile_dir=tmp_path / "prof")
+
+    with profiler.stage("allocate"):
+        data = [bytearray(1024) for _ in range(1000)]
+    with profiler.stage("idle"):
+        pass
+
+    assert [name for name, _ in profiler.stages] == ["allocate", "idle"]
+    allocate = profiler.stages[0][1]
+    assert allocate.peak_bytes >= 1024 * 1000
+    assert allocate.wall_s >= 0 and allocate.cpu_s >= 0
+    assert profiler.stages[1][1].peak_bytes < allocate.peak_bytes
+    assert (tmp_path / "prof" / "allocate.prof").exists()
+    del data
+
+
+def test_nested_measure_keeps_outer_peak():
+    with measure() as outer:
+        with measure() as inner:
+            data = bytearray(2_000_000)
+            del data
+        small = bytearray(10)
+
+    assert inner[0].peak_bytes >= 2_000_000
+    assert outer[0].peak_bytes >= inner[0].peak_bytes
+    del small
+
+
+def test_discover_records_each_parsed_file(tmp_path):
+    write_run(tmp_path / "runs", "run_001", "junit-0.xml")
+    write_run(tmp_path / "runs", "run_001", "junit-1.xml")
+    write_run(tmp_path / "runs", "run_002")
+
+    for jobs in (1, 2):
+        cache = ParseCache(tmp_path / f"cache-{jobs}")
+        for expect_cached in (False, True):
+            profiler = Profiler()
+            discover_test_runs(tmp_path / "runs", jobs=jobs, cache=cache, profiler=profiler)
+
+            assert [name for name, _ in profiler.stages] == ["discover", "parse"]
+            assert [file.rsplit("/", 2)[-2:] for file, _, _ in profiler.files] == [
+                ["run_001", "junit-0.xml"],
+                ["run_001", "junit-1.xml"],
+                ["run_002", "junit.xml"],
+            ]
+            assert all(cached == expect_cached for _, _, cached in profiler.files)
+
+
+def test_report_writes_profile_to_metrics(tmp_path):
+    test_run = TestRun.from_test_cases(
+        [TestCase(name="test1", classname="ClassA", status=TestStatus.PASSED, duration=1.0)],
+        timestamp=datetime(2024, 1, 1, 10, 0),
+    )
+    profiler = Profiler()
+
+    generate_report(TestSuite(name="Suite", test_runs=[test_run]), tmp_path, profiler)
+    metrics = json.loads((tmp_path / "metrics.json").read_text())
+
+    assert [stage["name"] for stage in metrics["profile"]["stages"]] == [
+        "aggregate",
+        "analytics.health_score",
+        "analytics.flaky_tests",
+        "analytics.frequent_failures",
+        "analytics.slow_tests",
+        "analytics.trends",
+        "render_html",
+        "write_html",
+    ]
+    assert set(metrics["profile"]["stages"][0]) == {"name", "wall_s", "cpu_s", "peak_bytes"}
+
+
+def test_report_without_profiler_has_no_profile_key(tmp_path):
+    test_run = TestRun.from_test_cases([], timestamp=datetime(2024, 1, 1, 10, 0))
+
+    metrics = generate_report(TestSuite(name="Suite", test_runs=[test_run]), tmp_path)
+
+    assert "profile" not in metrics
@@ -1,7 +1,9 @@
-from datetime import datetime
+import math
+from datetime import datetime, timedelta
 
 import pytest
 
+from testops_insight.analytics import SuiteAggregator, WindowedAggregator
 from testops_insight.analytics.slow_tests import get_slowest_tests
 from testops_insight.domain.models import TestCase, TestRun, TestSuite, TestStatus
 
@@ -90,3 +92,54 @@ def test_single_test():
     assert slow_tests[0].max_duration == 2.5
     assert slow_tests[0].total_runs == 1
 
+
+def test_duration_percentiles():
+    durations = [float(duration) for duration in range(1, 101)]
+    test_runs = [
+        TestRun.from_test_cases(
+            [
+                create_test_case("test1", "ClassA", TestStatus.PASSED, duration=duration),
+                create_test_case("test2", "ClassA", TestStatus.SKIPPED, duration=0.0),
+            ],
+            timestamp=datetime(2024, 1, 1, 10, 0),
+        )
+        for duration in reversed(durations)
+    ]
+
+    suite = TestSuite(name="TestSuite", test_runs=test_runs)
+    slow, skipped = get_slowest_tests(suite)
+
+    assert slow.p50_duration == pytest.approx(50.0, rel=0.01)
+    assert slow.p95_duration == pytest.approx(95.0, rel=0.01)
+    assert slow.p99_duration == pytest.approx(99.0, rel=0.01)
+    assert slow.p99_duration <= slow.max_duration == 100.0
+    assert (skipped.p50_duration, skipped.p95_duration, skipped.p99_duration) == (0.0, 0.0, 0.0)
+
+
+def test_non_finite_durations():
+    test_runs = [
+        TestRun.from_test_cases(
+            [
+                create_test_case("test1", "ClassA", TestStatus.PASSED, duration=duration),
+                create_test_case("test2", "ClassA", TestStatus.PASSED, duration=math.nan if run_idx else 2.0),
+            ],
+            timestamp=datetime(2024, 1, 1, 10, 0) + timedelta(hours=run_idx),
+        )
+        for run_idx, duration in enumerate([1.0, 2.0, math.inf])
+    ]
+
+    suite = TestSuite(name="TestSuite", test_runs=test_runs)
+    slow_tests = {slow.test_name: slow for slow in get_slowest_tests(suite)}
+    infinite, not_a_number = slow_tests["ClassA.test1"], slow_tests["ClassA.test2"]
+
+    assert infinite.avg_duration == infinite.max_duration == math.inf
+    assert infinite.p50_duration == pytest.approx(2.0, rel=0.01)
+    assert infinite.p99_duration == math.inf
+    assert math.isnan(not_a_number.avg_duration)
+    assert not_a_number.p99_duration == not_a_number.max_duration == 2.0
+
+    windowed = WindowedAggregator(2)
+    for test_run in test_runs:
+        windowed.add_run(test_run)
+    expected = SuiteAggregator.from_suite(TestSuite(name="TestSuite", test_runs=test_runs[1:]))
+    assert repr(windowed.slowest_tests()) == repr(expected.slowest_tests())
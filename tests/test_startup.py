@@ -0,0 +1,63 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Budget for `import testops_insight.cli.main`, which every CLI call pays. It
+# is about 30 ms today and leaves room for slow CI machines; see
+# benchmarks/bench_startup.py for the per-command numbers.
+CLI_IMPORT_BUDGET_MS = 100
+
+HEAVY_MODULES = [
+    "yaml",
+    "numpy",
+    "xml.etree.ElementTree",
+    "testops_insight.analytics.engine",
+    "testops_insight.reporting.html_generator",
+    "testops_insight.ingestion.cache",
+    "testops_insight.cli.discovery",
+]
+
+
+def run_python(*args: str, cwd: Path = REPO_ROOT) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, cwd=cwd, check=True)
+
+
+def test_cli_import_time_within_budget():
+    result = run_python("-X", "importtime", "-c", "import testops_insight.cli.main")
+
+    cumulative_us = None
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and line.rstrip().endswith("| testops_insight.cli.main"):
+            cumulative_us = int(line.split("|")[1])
+
+    assert cumulative_us is not None
+    assert cumulative_us / 1000 < CLI_IMPORT_BUDGET_MS
+
+
+def test_version_and_help_import_no_heavy_modules(tmp_path):
+    (tmp_path / "testops.yaml").write_text("runs_path: ./runs\n")
+    code = (
+        "import sys\n"
+        "from testops_insight.cli.main import main\n"
+        "sys.argv = ['testops-insights'] + sys.argv[1:]\n"
+        "try:\n"
+        "    main()\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        f"print([name for name in {HEAVY_MODULES!r} if name in sys.modules])\n"
+    )
+
+    for cli_args in (["--version"], ["--help"], ["analyze", "--runs-path", "missing"]):
+        result = subprocess.run(
+            [sys.executable, "-c", code, *cli_args],
+            capture_output=True,
+            text=True,
+            cwd=tmp_path,
+            env={**os.environ, "PYTHONPATH": str(REPO_ROOT)},
+        )
+        loaded = result.stdout.strip().splitlines()[-1]
+        expected = "['yaml']" if cli_args[0] == "analyze" else "[]"
+        assert loaded == expected, cli_args
@@ -0,0 +1,75 @@
+from datetime import datetime
+
+import pytest
+
+from testops_insight.analytics.trends import (
+    build_last_seen_index,
+    get_last_failed_timestamp,
+    get_last_test_status,
+    get_pass_rate_trend,
+)
+from testops_insight.domain.models import TestCase, TestRun, TestSuite, TestStatus
+
+
+def create_test_case(name: str, classname: str, status: TestStatus, duration: float = 1.0) -> TestCase:
+    return TestCase(
+        name=name,
+        classname=classname,
+        status=status,
+        duration=duration,
+    )
+
+
+def build_suite() -> TestSuite:
+    return TestSuite(
+        name="TestSuite",
+        test_runs=[
+            TestRun.from_test_cases(
+                [
+                    create_test_case("test1", "ClassA", TestStatus.FAILED),
+                    create_test_case("test2", "ClassA", TestStatus.ERROR),
+                    create_test_case("test3", "ClassA", TestStatus.PASSED),
+                ],
+                timestamp=datetime(2024, 1, 1, 10, 0),
+            ),
+            TestRun.from_test_cases(
+                [
+                    create_test_case("test1", "ClassA", TestStatus.PASSED),
+                    create_test_case("test2", "ClassA", TestStatus.SKIPPED),
+                    create_test_case("test2", "ClassA", TestStatus.FAILED),
+                ],
+                timestamp=datetime(2024, 1, 1, 11, 0),
+            ),
+        ],
+    )
+
+
+def test_pass_rate_trend():
+    trends = get_pass_rate_trend(build_suite())
+
+    assert [t.run_index for t in trends] == [0, 1]
+    assert trends[0].pass_rate == pytest.approx(100.0 / 3)
+    assert trends[1].avg_duration == pytest.approx(1.0)
+
+
+def test_last_seen_index_matches_scans():
+    suite = build_suite()
+    index = build_last_seen_index(suite)
+
+    for test_name in ["ClassA.test1", "ClassA.test2", "ClassA.test3", "ClassA.missing"]:
+        assert get_last_test_status(suite, test_name, index) == get_last_test_status(suite, test_name)
+        assert get_last_failed_timestamp(suite, test_name, index) == get_last_failed_timestamp(suite, test_name)
+
+    assert index["ClassA.test2"].status == "SKIPPED"
+    assert index["ClassA.test2"].run_index == 1
+    assert index["ClassA.test2"].last_failed == datetime(2024, 1, 1, 11, 0)
+    assert index["ClassA.test1"].last_failed == datetime(2024, 1, 1, 10, 0)
+    assert index["ClassA.test3"].run_index == 0
+
+
+def test_last_status_empty_suite():
+    suite = TestSuite(name="TestSuite", test_runs=[])
+
+    assert get_last_test_status(suite, "ClassA.test1") == "UNKNOWN"
+    assert get_last_test_status(suite, "ClassA.test1", build_last_seen_index(suite)) == "UNKNOWN"
+    assert get_last_failed_timestamp(suite, "ClassA.test1", {}) is None
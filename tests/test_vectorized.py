@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from testops_insight.analytics import (
+    calculate_health_score,
+    detect_flaky_tests,
+    get_frequent_failures,
+    get_pass_rate_trend,
+    get_slowest_tests,
+    vectorized,
+)
+from testops_insight.domain import columnar
+from testops_insight.domain.columnar import ColumnarSuite
+from testops_insight.domain.models import TestSuite
+from tests.helpers import make_run
+
+
+def build_random_suite(seed: int) -> TestSuite:
+    rng = random.Random(seed)
+    test_runs = [make_run(run_idx, tests=30, rng=rng, presence=0.9) for run_idx in range(12)]
+    return TestSuite(name="Random", test_runs=test_runs)
+
+
+def sorted_by_name(items):
+    return sorted(items, key=lambda item: item.test_name)
+
+
+@pytest.fixture(params=["numpy", "pure-python"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        if columnar.np is None:
+            pytest.skip("numpy is not installed")
+    else:
+        monkeypatch.setattr(columnar, "np", None)
+        monkeypatch.setattr(vectorized, "np", None)
+    return request.param
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_vectorized_matches_reference(seed, backend):
+    suite = build_random_suite(seed)
+    col = ColumnarSuite.from_test_suite(suite)
+
+    assert sorted_by_name(vectorized.detect_flaky_tests(col)) == pytest.approx(
+        sorted_by_name(detect_flaky_tests(suite))
+    )
+    assert sorted_by_name(vectorized.get_frequent_failures(col)) == pytest.approx(
+        sorted_by_name(get_frequent_failures(suite))
+    )
+    assert vectorized.get_slowest_tests(col, limit=10) == pytest.approx(get_slowest_tests(suite, limit=10))
+    assert vectorized.get_pass_rate_trend(col) == get_pass_rate_trend(suite)
+    assert vectorized.calculate_health_score(col) == calculate_health_score(suite)
+
+
+def test_vectorized_rankings_are_sorted(backend):
+    col = ColumnarSuite.from_test_suite(build_random_suite(42))
+
+    flaky_rates = [t.flakiness_rate for t in vectorized.detect_flaky_tests(col)]
+    failure_keys = [(f.failure_rate, f.failure_count) for f in vectorized.get_frequent_failures(col)]
+
+    assert flaky_rates == sorted(flaky_rates, reverse=True)
+    assert failure_keys == sorted(failure_keys, reverse=True)
+
+
+def test_vectorized_empty_suite(backend):
+    col = ColumnarSuite.from_test_suite(TestSuite(name="Empty", test_runs=[]))
+
+    assert col.total_runs == 0
+    assert vectorized.detect_flaky_tests(col) == []
+    assert vectorized.get_frequent_failures(col) == []
+    assert vectorized.get_slowest_tests(col) == []
+    assert vectorized.get_pass_rate_trend(col) == []
+    assert vectorized.calculate_health_score(col) == 0.0
@@ -0,0 +1,96 @@
+import math
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from testops_insight.analytics import SuiteAggregator, WindowedAggregator
+from testops_insight.domain.models import TestCase, TestRun, TestSuite, TestStatus
+from tests.helpers import make_run
+
+
+def build_runs(seed: int) -> list[TestRun]:
+    rng = random.Random(seed)
+    return [make_run(run_idx, tests=12, rng=rng, presence=0.7) for run_idx in range(25)]
+
+
+def assert_same_window(windowed: WindowedAggregator, expected: SuiteAggregator) -> None:
+    # Exact, including float sums and the order of ties, as if the window were aggregated from scratch.
+    assert windowed.result(slow_limit=100) == expected.result(slow_limit=100)
+    assert windowed.last_seen_index() == expected.last_seen_index()
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("window", [1, 3, 10])
+def test_windowed_matches_recompute_after_every_run(seed, window):
+    test_runs = build_runs(seed)
+    windowed = WindowedAggregator(window)
+
+    for run_idx, test_run in enumerate(test_runs):
+        windowed.add_run(test_run)
+        recent = test_runs[max(0, run_idx + 1 - window) : run_idx + 1]
+        assert_same_window(windowed, SuiteAggregator.from_suite(TestSuite(name="Suite", test_runs=recent)))
+
+
+def test_windowed_round_trip():
+    test_runs = build_runs(7)
+    windowed = WindowedAggregator(5)
+    for test_run in test_runs[:15]:
+        windowed.add_run(test_run)
+
+    reloaded = WindowedAggregator.from_dict(windowed.to_dict())
+    for test_run in test_runs[15:]:
+        windowed.add_run(test_run)
+        reloaded.add_run(test_run)
+
+    assert reloaded.result() == windowed.result()
+    assert_same_window(reloaded, SuiteAggregator.from_suite(TestSuite(name="Suite", test_runs=test_runs[-5:])))
+
+
+def test_windowed_sums_and_ties_match_recompute():
+    durations = [0.1, 0.2, 0.3, 0.7, 0.05]
+    test_runs = [
+        TestRun.from_test_cases(
+            [
+                TestCase(name=f"test{(run_idx + idx) % 3}", classname="ClassA", status=TestStatus.PASSED, duration=0.3)
+                for idx in range(3)
+            ]
+            + [TestCase(name="drift", classname="ClassA", status=TestStatus.PASSED, duration=duration)],
+            timestamp=datetime(2024, 1, 1) + timedelta(hours=run_idx),
+        )
+        for run_idx, duration in enumerate(durations)
+    ]
+    windowed = WindowedAggregator(3)
+    for test_run in test_runs:
+        windowed.add_run(test_run)
+
+    expected = SuiteAggregator.from_suite(TestSuite(name="Suite", test_runs=test_runs[-3:]))
+    # Equal averages are listed in the order the tests first appear within the window.
+    assert [t.test_name for t in windowed.slowest_tests()] == [t.test_name for t in expected.slowest_tests()]
+    assert windowed.slowest_tests() == expected.slowest_tests()
+
+
+def test_windowed_non_finite_durations_match_recompute():
+    # A NaN duration is the maximum only while it is the first one in the window.
+    durations = [[1.0], [math.nan, math.inf], [2.0, math.nan], [math.nan], [0.5]]
+    test_runs = [
+        TestRun.from_test_cases(
+            [
+                TestCase(name="test0", classname="ClassA", status=TestStatus.PASSED, duration=duration)
+                for duration in run_durations
+            ],
+            timestamp=datetime(2024, 1, 1) + timedelta(hours=run_idx),
+        )
+        for run_idx, run_durations in enumerate(durations)
+    ]
+    windowed = WindowedAggregator(2)
+    for run_idx, test_run in enumerate(test_runs):
+        windowed.add_run(test_run)
+        recent = test_runs[max(0, run_idx - 1) : run_idx + 1]
+        expected = SuiteAggregator.from_suite(TestSuite(name="Suite", test_runs=recent))
+        assert repr(windowed.slowest_tests()) == repr(expected.slowest_tests())
+
+
+def test_windowed_rejects_empty_window():
+    with pytest.raises(ValueError):
+        WindowedAggregator(0)